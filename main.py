@@ -27,6 +27,10 @@ def parse_args():
         "--profile", type=str, default=None,
         help="Apply a named profile to filter tools (defined in servers.yaml profiles section)"
     )
+    start.add_argument(
+        "--call-timeout", type=float, default=None,
+        help="Seconds a single tool call may run (overrides YAML call_timeout_s; 0 = no limit)"
+    )
 
     # refresh
     refresh = sub.add_parser("refresh", help="Re-discover tools and update YAML")
@@ -55,6 +59,7 @@ if __name__ == "__main__":
             log_level=args.log_level,
             api_key=args.api_key,
             profile=args.profile,
+            call_timeout_s=args.call_timeout,
         )
         asyncio.run(server.run())
 
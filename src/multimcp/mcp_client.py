@@ -29,12 +29,15 @@ Improvements over the original mcp_client.py:
 
 from contextlib import AsyncExitStack
 from typing import Any, Awaitable, Callable, Dict, Optional, Set
+import functools
 import ipaddress
 import os
 import asyncio
 import random
+import re
 import time
 import socket
+import stat
 import urllib.parse
 
 from mcp.client.stdio import StdioServerParameters, stdio_client
@@ -46,11 +49,12 @@ from src.utils.logger import get_logger
 
 # ── Security: command and URL validation ───────────────────────────────
 
-DEFAULT_ALLOWED_COMMANDS = {
+DEFAULT_ALLOWED_COMMANDS: frozenset[str] = frozenset({
     "node", "npx", "uvx", "python", "python3", "uv", "docker", "bash", "sh",
-}
+})
 
-PROTECTED_ENV_VARS = {
+# Matched case-sensitively (POSIX semantics); proxy vars list both spellings.
+PROTECTED_ENV_VARS: frozenset[str] = frozenset({
     # Linux/macOS loader injection
     "PATH", "LD_PRELOAD", "LD_LIBRARY_PATH",
     "DYLD_INSERT_LIBRARIES", "DYLD_LIBRARY_PATH", "DYLD_FRAMEWORK_PATH",
@@ -65,26 +69,22 @@ PROTECTED_ENV_VARS = {
     "ALL_PROXY", "all_proxy",
     # Identity / system
     "HOME", "USER",
-}
+})
 
 _BACKOFF_BASE = 1.0   # seconds, initial retry delay
 _BACKOFF_CAP = 60.0   # seconds, maximum retry delay
 
-# Dangerous IP ranges for SSRF protection.
-# NOTE: IPv4 loopback (127.0.0.0/8) and IPv6 loopback (::1/128) are intentionally
-# excluded so that localhost-based MCP servers remain accessible.
-_PRIVATE_RANGES: list[ipaddress.IPv4Network | ipaddress.IPv6Network] = [
-    ipaddress.ip_network("169.254.0.0/16"),  # IPv4 link-local (APIPA)
-    ipaddress.ip_network("fe80::/10"),        # IPv6 link-local — DNS-rebinding risk
-]
+@functools.lru_cache(maxsize=4)
+def _parse_allowlist(raw: str) -> frozenset[str]:
+    """Parse a comma-separated allowlist; cached by the raw env-var value."""
+    if raw.strip():
+        return frozenset(cmd.strip() for cmd in raw.split(",") if cmd.strip())
+    return DEFAULT_ALLOWED_COMMANDS
 
 
-def _get_allowed_commands() -> set:
+def _get_allowed_commands() -> frozenset[str]:
     """Return the set of allowed commands, from env var or default."""
-    env_val = os.environ.get("MULTI_MCP_ALLOWED_COMMANDS", "")
-    if env_val.strip():
-        return {cmd.strip() for cmd in env_val.split(",") if cmd.strip()}
-    return DEFAULT_ALLOWED_COMMANDS
+    return _parse_allowlist(os.environ.get("MULTI_MCP_ALLOWED_COMMANDS", ""))
 
 
 def _validate_command(command: str) -> None:
@@ -94,39 +94,80 @@ def _validate_command(command: str) -> None:
     Full paths: basename is checked first, then the path must point to an
     existing executable file. Full paths come from user-controlled configs.
     """
-    cmd_name = os.path.basename(command)
     allowed = _get_allowed_commands()
 
-    if cmd_name in allowed:
+    # Common case: a bare allowlisted name — no path handling, no filesystem access.
+    if command in allowed:
         return
 
-    if (os.sep in command or "/" in command) and os.path.isfile(command) and os.access(command, os.X_OK):
-        return
-
-    if os.sep in command or "/" in command:
+    if os.sep not in command and "/" not in command:
         raise ValueError(
-            f"Command '{command}' (basename '{cmd_name}') is not in allowed commands "
-            f"{allowed} and is not an executable file on disk. "
+            f"Command '{command}' is not in allowed commands: {sorted(allowed)}. "
             f"Set MULTI_MCP_ALLOWED_COMMANDS env var to extend the allowlist."
         )
+
+    cmd_name = os.path.basename(command)
+    if cmd_name in allowed:
+        return
+
+    # Regular file that this process may execute (access() honours owner/group/other)
+    try:
+        st = os.stat(command)
+    except OSError:
+        st = None
+    if st is not None and stat.S_ISREG(st.st_mode) and os.access(command, os.X_OK):
+        return
     raise ValueError(
-        f"Command '{cmd_name}' is not in allowed commands: {allowed}. "
+        f"Command '{command}' (basename '{cmd_name}') is not in allowed commands "
+        f"{sorted(allowed)} and is not an executable file on disk. "
         f"Set MULTI_MCP_ALLOWED_COMMANDS env var to extend the allowlist."
     )
 
 
-async def _validate_url(url: str) -> None:
-    """Validate URL: check scheme, hostname presence, DNS resolvability, and SSRF safety."""
-    parsed = urllib.parse.urlparse(url)
-    if parsed.scheme not in ("http", "https"):
-        raise ValueError(f"URL scheme '{parsed.scheme}' is not allowed. Only http/https permitted.")
-    hostname = parsed.hostname
+# Fast path for plain http(s)://host[:port] URLs whose host is ASCII
+# unreserved/sub-delim characters only, where urlparse would return the same
+# lowercased hostname. Anything else — userinfo, IPv6 literals, backslashes,
+# whitespace, non-ASCII — falls back to urllib.parse.
+_HTTP_URL_RE = re.compile(
+    r"^(https?)://([A-Za-z0-9._~%!$&'()*+,;=-]*)(?::[0-9]*)?(?=[/?#]|\Z)", re.IGNORECASE
+)
+
+
+async def _default_resolver(hostname: str) -> list:
+    """Resolve *hostname* on the running loop's executor-backed getaddrinfo.
+
+    Restricted to TCP stream entries, so each address comes back once rather
+    than once per socket type.
+    """
+    return await asyncio.get_running_loop().getaddrinfo(
+        hostname, None, type=socket.SOCK_STREAM, proto=socket.IPPROTO_TCP,
+    )
+
+
+async def _validate_url(
+    url: str,
+    *,
+    resolver: Callable[[str], Awaitable[list]] = _default_resolver,
+) -> None:
+    """Validate URL: check scheme, hostname presence, DNS resolvability, and SSRF safety.
+
+    ``resolver`` maps a hostname to getaddrinfo-style tuples; tests inject one.
+    """
+    match = _HTTP_URL_RE.match(url)
+    if match is not None:
+        hostname = match.group(2).lower()
+    else:
+        parsed = urllib.parse.urlparse(url)
+        if parsed.scheme not in ("http", "https"):
+            raise ValueError(f"URL scheme '{parsed.scheme}' is not allowed. Only http/https permitted.")
+        hostname = parsed.hostname
     if not hostname:
         raise ValueError("URL has no hostname.")
 
-    loop = asyncio.get_running_loop()
+    # Resolve on every call: a cached answer would let a host re-pointed at a
+    # link-local address slip through until the entry expired.
     try:
-        addrs = await loop.getaddrinfo(hostname, None)
+        addrs = await resolver(hostname)
     except socket.gaierror as e:
         raise ValueError(f"Could not resolve hostname '{hostname}': {e}")
 
@@ -136,12 +177,14 @@ async def _validate_url(url: str) -> None:
             ip = ipaddress.ip_address(ip_str)
         except ValueError:
             continue
-        for private_net in _PRIVATE_RANGES:
-            if ip in private_net:
-                raise ValueError(
-                    f"URL resolves to a private/internal address '{ip_str}' "
-                    f"({private_net}) — SSRF protection rejected this request."
-                )
+        # Link-local only: 169.254.0.0/16 (APIPA, cloud metadata) and fe80::/10
+        # (DNS-rebinding risk). NOTE: loopback (127.0.0.0/8, ::1) and RFC 1918
+        # ranges are intentionally allowed so localhost/LAN MCP servers work.
+        if ip.is_link_local:
+            raise ValueError(
+                f"URL resolves to a private/internal address '{ip_str}' "
+                f"(link-local) — SSRF protection rejected this request."
+            )
 
 
 def _filter_env(env: dict) -> dict:
@@ -195,6 +238,9 @@ class MCPClientManager:
         self._shutdown_events: Dict[str, asyncio.Event] = {}
         # Per-server backoff state for watchdog reconnects
         self._reconnect_backoff: Dict[str, float] = {}
+        # URLs whose auto-detect landed on SSE; reconnects skip the doomed
+        # Streamable HTTP probe until an SSE attempt fails again
+        self._sse_only_urls: Set[str] = set()
 
     def _get_creation_lock(self, name: str) -> asyncio.Lock:
         """Get or create a per-server creation lock (lazily initialized)."""
@@ -232,7 +278,9 @@ class MCPClientManager:
         - transport_type=None or other: Auto-detect (try Streamable HTTP → SSE fallback)
 
         Uses a nested stack for the Streamable HTTP attempt so that a failed
-        attempt is cleaned up safely before falling through to SSE.
+        attempt is cleaned up safely before falling through to SSE. A URL that
+        needed the SSE fallback is remembered and connects via SSE directly
+        next time (lazy connect, watchdog reconnect).
 
         Returns:
             Connected ClientSession.
@@ -256,6 +304,21 @@ class MCPClientManager:
             self.logger.info(f"🌐 Connected to '{name}' via SSE")
             return client
 
+        # Known SSE-only server: go straight to SSE, re-probing if that fails
+        if url in self._sse_only_urls:
+            sse_stack = AsyncExitStack()
+            try:
+                await sse_stack.__aenter__()
+                read, write = await sse_stack.enter_async_context(sse_client(url=url))
+                client = await sse_stack.enter_async_context(ClientSession(read, write))
+                await server_stack.enter_async_context(sse_stack)
+                self.logger.info(f"🌐 Connected to '{name}' via SSE (remembered)")
+                return client
+            except Exception as e:
+                await sse_stack.aclose()
+                self._sse_only_urls.discard(url)
+                self.logger.debug(f"Remembered SSE failed for '{name}', re-probing: {e}")
+
         # Auto-detect: try Streamable HTTP first, fall back to SSE
         fallback_stack = AsyncExitStack()
         try:
@@ -275,6 +338,7 @@ class MCPClientManager:
         # Fall back to legacy SSE
         read, write = await server_stack.enter_async_context(sse_client(url=url))
         client = await server_stack.enter_async_context(ClientSession(read, write))
+        self._sse_only_urls.add(url)
         self.logger.info(f"🌐 Connected to '{name}' via SSE (fallback)")
         return client
 
@@ -368,9 +432,7 @@ class MCPClientManager:
                 _validate_command(command)
             args = server_dict.get("args", [])
             env = server_dict.get("env", {})
-            safe_env = _filter_env(env)
-            merged_env = os.environ.copy()
-            merged_env.update(safe_env)
+            merged_env = {**os.environ, **_filter_env(env)}
 
             params = StdioServerParameters(command=command, args=args, env=merged_env)
             read, write = await server_stack.enter_async_context(stdio_client(params))
@@ -491,9 +553,7 @@ class MCPClientManager:
 
                 if command:
                     _validate_command(command)
-                    safe_env = _filter_env(env)
-                    merged_env = os.environ.copy()
-                    merged_env.update(safe_env)
+                    merged_env = {**os.environ, **_filter_env(env)}
                     self.logger.info(f"🔌 Creating stdio client for {name}")
                     params = StdioServerParameters(
                         command=command, args=args, env=merged_env,
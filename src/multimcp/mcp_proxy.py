@@ -2,12 +2,16 @@ from typing import TYPE_CHECKING, Any, Optional
 import asyncio
 import hashlib
 import json
+import sys
+import time
 import uuid
 from mcp import server, types
 from mcp.client.session import ClientSession
 from mcp.server.session import ServerSession
 from mcp.shared.exceptions import McpError
 from mcp.types import ErrorData, INVALID_PARAMS, INTERNAL_ERROR
+# Bound directly for the tools/call path, which builds these on every call
+from mcp.types import CallToolResult, ServerResult, TextContent
 from src.utils.logger import get_logger
 from src.multimcp.mcp_client import MCPClientManager
 from src.multimcp.utils.audit import AuditLogger
@@ -44,6 +48,60 @@ def _hash_tool_list(tools: list) -> str:
     return hashlib.sha256(combined.encode("utf-8")).hexdigest()[:16]
 
 
+class _DeadlineExceeded(asyncio.TimeoutError):
+    """Raised by _await_with_timeout when its own deadline passes.
+
+    Subclasses TimeoutError so existing handlers still catch it, while letting
+    callers tell our deadline apart from a TimeoutError raised by the awaitable.
+    """
+
+    def __init__(self, timeout: float):
+        super().__init__(f"timed out after {timeout}s")
+        self.timeout = timeout
+
+
+async def _await_with_timeout(aw: Any, timeout: Optional[float]) -> Any:
+    """Await *aw* with a deadline; None means wait indefinitely.
+
+    Raises _DeadlineExceeded when the deadline passes. A TimeoutError raised
+    by *aw* itself propagates unchanged. Uses asyncio.timeout() on 3.11+
+    (no wrapper Task), wait_for on 3.10.
+    """
+    if timeout is None:
+        return await aw
+    if sys.version_info >= (3, 11):
+        cm = asyncio.timeout(timeout)
+        try:
+            async with cm:
+                return await aw
+        except TimeoutError:
+            if cm.expired():
+                raise _DeadlineExceeded(timeout) from None
+            raise
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    try:
+        return await asyncio.wait_for(aw, timeout=timeout)
+    except asyncio.TimeoutError:
+        if loop.time() - started >= timeout:
+            raise _DeadlineExceeded(timeout) from None
+        raise
+
+
+def _tool_error(text: str) -> ServerResult:
+    """Build an isError tool result for proxy-side failures.
+
+    The message is our own string, so pydantic validation is skipped via
+    model_construct (defaults for the optional fields are still filled in).
+    """
+    return ServerResult.model_construct(
+        root=CallToolResult.model_construct(
+            content=[TextContent.model_construct(type="text", text=text)],
+            isError=True,
+        )
+    )
+
+
 @dataclass
 class ToolMapping:
     server_name: str
@@ -76,7 +134,9 @@ class MCPProxyServer(server.Server):
         ] = {}  # Support same tool name in different mcp server
         self.prompt_to_server: dict[str, PromptMapping] = {}
         self.resource_to_server: dict[str, ResourceMapping] = {}
-        self._register_lock = asyncio.Lock()  # Lock for concurrent register/unregister
+        # Per-server locks for concurrent register/unregister; unrelated servers
+        # don't serialize behind each other
+        self._register_locks: dict[str, asyncio.Lock] = {}
         self._register_request_handlers()
         self.logger = get_logger("multi_mcp.ProxyServer")
         self.client_manager: Optional[MCPClientManager] = client_manager
@@ -95,8 +155,19 @@ class MCPProxyServer(server.Server):
         # Circuit breaker: consecutive transport-failure counts per tool key
         # (counts exceptions from call_tool, NOT isError=True tool responses)
         self._tool_failure_counts: dict[str, int] = {}
+        # time.monotonic() of each tool's most recent counted failure
+        self._tool_last_failure: dict[str, float] = {}
         # After this many consecutive transport failures, auto-quarantine the tool
         self.quarantine_threshold: int = 3
+        # Failures further apart than this (seconds) start a fresh count, so rare
+        # sporadic errors never add up to a quarantine
+        self.failure_window_s: float = 300.0
+        # Upper bound (seconds) on a single backend call_tool; a hung call fails
+        # and counts toward the circuit breaker like a transport error.
+        # None disables the deadline (set from config call_timeout_s)
+        self.call_timeout_s: Optional[float] = 300.0
+        # Strong references to fire-and-forget tasks (see _spawn_background)
+        self._background_tasks: set[asyncio.Task] = set()
         # Register roots/list_changed notification handler
         self.notification_handlers[types.RootsListChangedNotification] = (
             self._handle_roots_list_changed
@@ -109,6 +180,20 @@ class MCPProxyServer(server.Server):
         await proxy.initialize_remote_clients()
         return proxy
 
+    def _spawn_background(self, coro) -> asyncio.Task:
+        """Run a fire-and-forget coroutine, holding a reference until it finishes."""
+        tasks = getattr(self, "_background_tasks", None)
+        if tasks is None:
+            tasks = self._background_tasks = set()
+        task = asyncio.create_task(coro)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        return task
+
+    def _get_register_lock(self, server_name: str) -> asyncio.Lock:
+        """Get or create a per-server register/unregister lock (lazily initialized)."""
+        return self._register_locks.setdefault(server_name, asyncio.Lock())
+
     def load_tools_from_yaml(self, yaml_config: "MultiMCPConfig") -> None:
         """Pre-populate tool_to_server from YAML cache with client=None placeholders.
 
@@ -174,7 +259,7 @@ class MCPProxyServer(server.Server):
             if self.client_manager
             else 30.0
         )
-        result = await asyncio.wait_for(client.initialize(), timeout=timeout)
+        result = await _await_with_timeout(client.initialize(), timeout)
         self.capabilities[name] = result.capabilities
 
         if result.capabilities.tools:
@@ -209,7 +294,7 @@ class MCPProxyServer(server.Server):
 
     async def register_client(self, name: str, client: ClientSession) -> None:
         """Add a new client and register its capabilities."""
-        async with self._register_lock:
+        async with self._get_register_lock(name):
             self.client_manager.clients[name] = client
             # Re-fetch capabilities (like on startup)
             await self.initialize_single_client(name, client)
@@ -226,7 +311,7 @@ class MCPProxyServer(server.Server):
 
     async def unregister_client(self, name: str) -> None:
         """Remove a client and clean up all its associated mappings."""
-        async with self._register_lock:
+        async with self._get_register_lock(name):
             client = self.client_manager.clients.get(name)
             if not client:
                 self.logger.warning(f"⚠️ Tried to unregister unknown client: {name}")
@@ -244,15 +329,11 @@ class MCPProxyServer(server.Server):
             # Fix: filter by server_name, not client identity.
             # After disconnect, client is set to None, so v.client != client
             # would be True (None != original_client), keeping ghost entries.
-            self.tool_to_server = {
-                k: v for k, v in self.tool_to_server.items() if v.server_name != name
-            }
-            self.prompt_to_server = {
-                k: v for k, v in self.prompt_to_server.items() if v.server_name != name
-            }
-            self.resource_to_server = {
-                k: v for k, v in self.resource_to_server.items() if v.server_name != name
-            }
+            # Delete in place: the retrieval pipeline holds tool_to_server by
+            # reference, so rebinding it would leave the pipeline a stale registry.
+            for mapping in (self.tool_to_server, self.prompt_to_server, self.resource_to_server):
+                for k in [k for k, v in mapping.items() if v.server_name == name]:
+                    del mapping[k]
 
             self.logger.info(f"✅ Client '{name}' fully unregistered.")
 
@@ -276,7 +357,9 @@ class MCPProxyServer(server.Server):
             had_resources = caps and caps.resources if caps else False
             if had_resources:
                 await self._send_resources_list_changed()
-    async def toggle_tool(self, server_name: str, tool_name: str, enabled: bool) -> dict:
+    async def toggle_tool(
+        self, server_name: str, tool_name: str, enabled: bool, *, notify: bool = True
+    ) -> dict:
         """Enable or disable a single tool at runtime without restarting the server.
 
         Disabling: removes the tool from tool_to_server (invisible to new clients)
@@ -289,12 +372,13 @@ class MCPProxyServer(server.Server):
         In both cases _send_tools_list_changed() is called so active MCP clients
         refresh their tool list. Sessions that already received a tool retain it
         (MCP protocol: clients cache tool lists; toggling is a hint, not a revoke).
+        Pass notify=False to skip it when the caller sends the notification itself.
 
         Returns a dict suitable for the /mcp_control JSON response.
         """
         key = self._make_key(server_name, tool_name)
 
-        async with self._register_lock:
+        async with self._get_register_lock(server_name):
             if not enabled:
                 # ── DISABLE ──────────────────────────────────────────────
                 if key not in self.tool_to_server:
@@ -367,7 +451,8 @@ class MCPProxyServer(server.Server):
                     tool=cached_tool,
                 )
 
-        await self._send_tools_list_changed()
+        if notify:
+            await self._send_tools_list_changed()
         visible = sum(1 for m in self.tool_to_server.values()
                       if m.server_name == server_name and m.client is not None)
         return {
@@ -568,24 +653,20 @@ class MCPProxyServer(server.Server):
                     await self._send_tools_list_changed()
                     tool_item = self.tool_to_server.get(tool_name)
                 except Exception as e:
-                    return types.ServerResult(
-                        content=[types.TextContent(type="text", text=f"Failed to connect server '{tool_item.server_name}': {e}")],
-                        isError=True,
-                    )
+                    return _tool_error(f"Failed to connect server '{tool_item.server_name}': {e}")
 
             if tool_item is None or tool_item.client is None:
-                return types.ServerResult(
-                    content=[types.TextContent(type="text", text=f"Tool '{tool_name}' server failed to connect.")],
-                    isError=True,
-                )
+                return _tool_error(f"Tool '{tool_name}' server failed to connect.")
 
             try:
                 self.logger.info(
                     f"✅ Calling tool '{tool_name}' on its associated server"
                 )
                 _, original_name = self._split_key(tool_name)
-                result = await tool_item.client.call_tool(
-                    original_name, arguments
+                call_timeout = getattr(self, 'call_timeout_s', 300.0)
+                result = await _await_with_timeout(
+                    tool_item.client.call_tool(original_name, arguments),
+                    call_timeout,
                 )
 
                 # Log successful tool invocation (use original name for cross-referencing)
@@ -599,8 +680,12 @@ class MCPProxyServer(server.Server):
                 if self.client_manager:
                     self.client_manager.record_usage(tool_item.server_name)
 
-                # Success: reset circuit breaker for this tool
-                getattr(self, '_tool_failure_counts', {}).pop(tool_name, None)
+                # Success: reset circuit breaker for this tool. Usually no tool has
+                # outstanding failures, so the empty-dict check skips the hash probe.
+                failure_counts = getattr(self, '_tool_failure_counts', None)
+                if failure_counts:
+                    failure_counts.pop(tool_name, None)
+                    getattr(self, '_tool_last_failure', {}).pop(tool_name, None)
 
                 # Notify retrieval pipeline of tool usage (turn-boundary based).
                 # Suppressed when _skip_pipeline_record=True (routing-tool proxy inner call)
@@ -614,10 +699,10 @@ class MCPProxyServer(server.Server):
                     except Exception as e:
                         self.logger.warning(f"⚠️ Retrieval pipeline error on tool call: {e}")
 
-                return types.ServerResult(result)
+                return ServerResult(result)
             except Exception as e:
-                error_msg = str(e)
-                self.logger.error(f"❌ Failed to call tool '{tool_name}': {e}")
+                error_msg = str(e) or type(e).__name__
+                self.logger.error(f"❌ Failed to call tool '{tool_name}': {error_msg}")
 
                 # Log tool failure (use original name for cross-referencing)
                 self.audit_logger.log_tool_failure(
@@ -631,8 +716,16 @@ class MCPProxyServer(server.Server):
                 # NOTE: We only count exceptions from call_tool (transport-level failures),
                 # NOT result.isError=True (those are tool responses — could be valid arg errors).
                 failure_counts = getattr(self, '_tool_failure_counts', {})
-                count = failure_counts.get(tool_name, 0) + 1
+                last_failure = getattr(self, '_tool_last_failure', {})
+                now = time.monotonic()
+                count = failure_counts.get(tool_name, 0)
+                if count and now - last_failure.get(tool_name, now) > getattr(
+                    self, 'failure_window_s', 300.0
+                ):
+                    count = 0  # previous failures are stale — start a new window
+                count += 1
                 failure_counts[tool_name] = count
+                last_failure[tool_name] = now
                 if count >= getattr(self, 'quarantine_threshold', 3):
                     self.logger.error(
                         f"🚫 Tool '{tool_name}' has failed {count} consecutive times "
@@ -640,21 +733,21 @@ class MCPProxyServer(server.Server):
                         f"Call POST /mcp_control {{action: 'toggle_tool', tool: '{original_name}', "
                         f"server: '{tool_item.server_name}', enabled: true}} to re-enable."
                     )
-                    self._tool_failure_counts.pop(tool_name, None)
+                    failure_counts.pop(tool_name, None)
+                    last_failure.pop(tool_name, None)
                     try:
-                        await self.toggle_tool(tool_item.server_name, original_name, enabled=False)
+                        await self.toggle_tool(
+                            tool_item.server_name, original_name, enabled=False, notify=False
+                        )
                     except Exception as quarantine_err:
                         self.logger.warning(f"⚠️ Auto-quarantine failed for '{tool_name}': {quarantine_err}")
+                    else:
+                        # The tool is already gone from tool_to_server; the
+                        # list_changed round-trip need not delay this error reply
+                        self._spawn_background(self._send_tools_list_changed())
 
                 # Return error to client
-                return types.ServerResult(
-                    content=[
-                        types.TextContent(
-                            type="text", text=f"Tool '{tool_name}' failed: {error_msg}"
-                        )
-                    ],
-                    isError=True,
-                )
+                return _tool_error(f"Tool '{tool_name}' failed: {error_msg}")
         else:
             self.logger.error(f"⚠️ Tool '{tool_name}' not found in any server.")
 
@@ -666,12 +759,7 @@ class MCPProxyServer(server.Server):
                 error=f"Tool '{tool_name}' not found in any server",
             )
 
-        return types.ServerResult(
-            content=[
-                types.TextContent(type="text", text=f"Tool '{tool_name}' not found!")
-            ],
-            isError=True,
-        )
+        return _tool_error(f"Tool '{tool_name}' not found!")
 
     ## Prompts capabilities
     async def _list_prompts(self, _: Any) -> types.ServerResult:
@@ -827,6 +915,13 @@ class MCPProxyServer(server.Server):
             if self.client_manager
             else None
         )
+        if tool_filter is not None:
+            # Freeze the stored lists once so each per-tool check is a set probe;
+            # the stored filter stays a mutable list dict for toggle_tool.
+            tool_filter = {
+                "allow": frozenset(tool_filter.get("allow", ["*"])),
+                "deny": frozenset(tool_filter.get("deny", [])),
+            }
 
         tools_result = await client.list_tools()
         for tool in tools_result.tools:
@@ -866,8 +961,12 @@ class MCPProxyServer(server.Server):
 
     @staticmethod
     def _make_key(server_name: str, item_name: str) -> str:
-        """Returns a namespaced key like 'server__item' to uniquely identify items per server."""
-        return f"{server_name}__{item_name}"
+        """Returns a namespaced key like 'server__item' to uniquely identify items per server.
+
+        Keys are interned: the registries, session sets and retrieval index all
+        hold the same str object per tool, and its hash is computed once.
+        """
+        return sys.intern(f"{server_name}__{item_name}")
 
     @staticmethod
     def _split_key(key: str) -> tuple[str, str]:
@@ -879,7 +978,7 @@ class MCPProxyServer(server.Server):
 
     async def _on_server_disconnected(self, server_name: str) -> None:
         """Reset tool, prompt, and resource mappings for a disconnected server and notify client."""
-        async with self._register_lock:
+        async with self._get_register_lock(server_name):
             for key, mapping in self.tool_to_server.items():
                 if mapping.server_name == server_name:
                     mapping.client = None
@@ -39,6 +39,9 @@ class MCPSettings(BaseSettings):
     config: Optional[str] = None
     api_key: Optional[str] = None  # API key for authentication (env: MULTI_MCP_API_KEY)
     profile: Optional[str] = None  # Named profile for tool filtering (env: MULTI_MCP_PROFILE)
+    # Per tool-call deadline in seconds, overriding the YAML call_timeout_s;
+    # 0 disables it (env: MULTI_MCP_CALL_TIMEOUT_S)
+    call_timeout_s: Optional[float] = Field(default=None, ge=0)
 
     model_config = SettingsConfigDict(env_prefix="MULTI_MCP_")
 
@@ -104,24 +107,38 @@ class MultiMCP:
                 self.logger.info(f"🔍 Found {len(new_servers)} new server(s) in JSON config: {', '.join(new_servers)}")
                 config = await self._discover_new_servers(config, new_servers, yaml_path)
 
-        # Apply tool filters, idle timeouts, and always_on settings
-        for server_name, server_config in config.servers.items():
-            enabled = get_enabled_tools(config, server_name)
-            if enabled:
-                self.client_manager.tool_filters[server_name] = {
-                    "allow": list(enabled), "deny": []
-                }
-            else:
-                # All tools disabled — explicit deny-all filter
-                self.client_manager.tool_filters[server_name] = {"allow": [], "deny": ["*"]}
-            self.client_manager.idle_timeouts[server_name] = (
-                server_config.idle_timeout_minutes * 60
-            )
-            if server_config.always_on:
-                self.client_manager.always_on_servers.add(server_name)
+        return self._bootstrap_from_config(config)
+
+    def _bootstrap_from_config(self, config: MultiMCPConfig) -> MultiMCPConfig:
+        """Apply tool filters, idle timeouts, and always_on settings to client_manager."""
+        servers = config.servers
+        enabled_by_server = {
+            server_name: list(get_enabled_tools(config, server_name))
+            for server_name in servers
+        }
+        self.client_manager.tool_filters.update({
+            # No enabled tools — explicit deny-all filter
+            server_name: {"allow": enabled, "deny": []} if enabled else {"allow": [], "deny": ["*"]}
+            for server_name, enabled in enabled_by_server.items()
+        })
+        self.client_manager.idle_timeouts.update({
+            server_name: server_config.idle_timeout_minutes * 60
+            for server_name, server_config in servers.items()
+        })
+        self.client_manager.always_on_servers.update(
+            server_name for server_name, server_config in servers.items()
+            if server_config.always_on
+        )
 
         return config
 
+    def _resolve_call_timeout(self, yaml_config: MultiMCPConfig) -> Optional[float]:
+        """Per tool-call deadline: CLI/env setting if given, else YAML. None = no deadline."""
+        timeout = self.settings.call_timeout_s
+        if timeout is None:
+            return yaml_config.call_timeout_s
+        return timeout or None
+
     def _resolve_profile(self, profile_name: str, yaml_config: MultiMCPConfig) -> dict[str, dict]:
         """Convert a profile name into per-server tool filters (allow-list)."""
         profile = yaml_config.profiles.get(profile_name)
@@ -547,6 +564,7 @@ class MultiMCP:
         try:
             self.proxy = await MCPProxyServer.create(self.client_manager)
             self.client_manager._on_server_disconnected = self.proxy._on_server_disconnected
+            self.proxy.call_timeout_s = self._resolve_call_timeout(yaml_config)
 
             # Initialize retrieval pipeline — pre-Phase-9 coherent shadow state.
             # enabled=True: pipeline runs scoring and logging (data collection active).
@@ -866,17 +884,24 @@ class MultiMCP:
             # Static config servers (from --config or YAML) bypass this check since
             # the user explicitly authored those URLs.
             servers = payload.get("mcpServers", {})
+            # All URLs resolve concurrently; nothing is added if any one fails.
+            url_servers = [
+                (name, config["url"]) for name, config in servers.items() if config.get("url")
+            ]
+            checks = await asyncio.gather(
+                *(_validate_url(url) for _name, url in url_servers),
+                return_exceptions=True,
+            )
+            for (name, _url), outcome in zip(url_servers, checks):
+                if isinstance(outcome, ValueError):
+                    self.logger.warning(
+                        f"⚠️ Rejected /mcp_servers POST — SSRF check failed for '{name}': {outcome}"
+                    )
+                    return JSONResponse({"error": str(outcome)}, status_code=403)
+                if isinstance(outcome, BaseException):
+                    raise outcome
             added = []
             for name, config in servers.items():
-                url = config.get("url")
-                if url:
-                    try:
-                        await _validate_url(url)
-                    except ValueError as ssrf_err:
-                        self.logger.warning(
-                            f"⚠️ Rejected /mcp_servers POST — SSRF check failed for '{name}': {ssrf_err}"
-                        )
-                        return JSONResponse({"error": str(ssrf_err)}, status_code=403)
                 self.proxy.client_manager.add_pending_server(name, config)
                 added.append(name)
 
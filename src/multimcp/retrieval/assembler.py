@@ -7,7 +7,6 @@ Summary tier: truncated description + simplified schema (remaining tools).
 
 from __future__ import annotations
 
-import copy
 import re
 from typing import Any, Optional
 
@@ -15,49 +14,133 @@ from mcp import types
 
 from .models import RetrievalConfig, ScoredTool
 
-_MAX_SUMMARY_CHARS = 80
-_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+# Summary budget in UTF-8 bytes, which track tokens better than code points
+# for non-ASCII text (equal to the character count for ASCII)
+_MAX_SUMMARY_BYTES = 80
+
+# Max summary-tier Tools memoized per assembler (oldest evicted first)
+_SUMMARY_CACHE_SIZE = 1024
+_SCALARS = (str, int, float, bool, type(None))
+# First sentence: shortest prefix ending in .!? that is followed by whitespace
+_FIRST_SENTENCE = re.compile(r".*?[.!?](?=\s)", re.DOTALL)
 
 
 def _truncate_description(desc: str) -> str:
-    """Truncate to first sentence or max chars, whichever is shorter."""
-    if not desc or len(desc) <= _MAX_SUMMARY_CHARS:
+    """Truncate to first sentence or max bytes, whichever is shorter."""
+    if not desc:
+        return desc
+    # ASCII (the common case) needs no encode: its length is its byte count
+    encoded = None if desc.isascii() else desc.encode("utf-8")
+    if len(encoded if encoded is not None else desc) <= _MAX_SUMMARY_BYTES:
         return desc
 
-    # Try first sentence
-    sentences = _SENTENCE_BOUNDARY.split(desc, maxsplit=1)
-    if len(sentences) > 1 and len(sentences[0]) <= _MAX_SUMMARY_CHARS:
-        return sentences[0]
+    # Try first sentence; a sentence that fits has at most as many characters
+    # as bytes, so the match never looks past that (+1 for the whitespace)
+    m = _FIRST_SENTENCE.match(desc, 0, _MAX_SUMMARY_BYTES + 1)
+    if m and (encoded is None or len(m.group().encode("utf-8")) <= _MAX_SUMMARY_BYTES):
+        return m.group()
+
+    # Fall back to byte limit, dropping any character cut in half
+    if encoded is None:
+        return desc[:_MAX_SUMMARY_BYTES].rstrip() + "…"
+    return encoded[:_MAX_SUMMARY_BYTES].decode("utf-8", "ignore").rstrip() + "…"
+
+
+def _clone_schema(schema: Any) -> Any:
+    """Copy the dicts and lists of a JSON schema; scalar leaves are shared.
+
+    Stands in for copy.deepcopy on plain JSON data: no memo table and no
+    per-node dispatch, and an explicit stack instead of recursion.
+    """
+    if isinstance(schema, dict):
+        root: Any = dict(schema)
+    elif isinstance(schema, list):
+        root = list(schema)
+    else:
+        return schema
 
-    # Fall back to char limit
-    return desc[:_MAX_SUMMARY_CHARS].rstrip() + "…"
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        # Replacing values of existing keys/indices is safe while iterating
+        for key, value in (node.items() if isinstance(node, dict) else enumerate(node)):
+            if isinstance(value, dict):
+                node[key] = child = dict(value)
+                stack.append(child)
+            elif isinstance(value, list):
+                node[key] = child = list(value)
+                stack.append(child)
+    return root
 
 
 def _strip_descriptions(schema: Any) -> Any:
-    """Recursively strip 'description' fields from schema properties."""
+    """Return a copy of schema with 'description' fields stripped at every level.
+
+    The input is never mutated and every dict and list in the result is new.
+
+    Walks the nested dicts with an explicit stack rather than recursion, so
+    deep schemas cost no Python frames. Keys inside 'properties' are property
+    names, so a property that happens to be called 'description' is kept.
+    """
     if not isinstance(schema, dict):
         return schema
 
-    result = {}
-    for key, value in schema.items():
-        if key == "description":
-            continue  # Strip description at this level
-        elif key == "properties" and isinstance(value, dict):
-            result[key] = {
-                prop_name: _strip_descriptions(prop_val)
-                for prop_name, prop_val in value.items()
-            }
-        elif key == "items" and isinstance(value, dict):
-            result[key] = _strip_descriptions(value)
-        elif isinstance(value, dict):
-            result[key] = _strip_descriptions(value)
-        else:
-            result[key] = value
+    result: dict = {}
+    stack = [(schema, result)]
+    while stack:
+        src, dst = stack.pop()
+        for key, value in src.items():
+            if key == "description":
+                continue  # Strip description at this level
+            if key == "properties" and isinstance(value, dict):
+                props = dst[key] = {}
+                for prop_name, prop_val in value.items():
+                    if isinstance(prop_val, dict):
+                        # Flat schemas such as {"type": "string"} need no stack entry
+                        if all(isinstance(v, _SCALARS) for v in prop_val.values()):
+                            props[prop_name] = {
+                                k: v for k, v in prop_val.items() if k != "description"
+                            }
+                            continue
+                        props[prop_name] = child = {}
+                        stack.append((prop_val, child))
+                    else:
+                        props[prop_name] = _clone_schema(prop_val)
+            elif isinstance(value, dict):
+                dst[key] = child = {}
+                stack.append((value, child))
+            else:
+                dst[key] = _clone_schema(value)
     return result
 
 
 class TieredAssembler:
-    """Assembles ranked tools into full/summary tier Tool objects."""
+    """Assembles ranked tools into full/summary tier Tool objects.
+
+    Summarizing is pure, so each summary-tier Tool is memoized per tool_key
+    together with the registry Tool it was built from; a re-registered tool
+    is a new object and misses. Summary Tools are therefore shared across
+    assemble() calls and must be treated as read-only.
+    """
+
+    def __init__(self) -> None:
+        self._summary_cache: dict[str, tuple[types.Tool, types.Tool]] = {}
+
+    def _summarize(self, tool_key: str, original: types.Tool) -> types.Tool:
+        """Return the summary-tier Tool for original, building it on a cache miss."""
+        cached = self._summary_cache.get(tool_key)
+        if cached is not None and cached[0] is original:
+            return cached[1]
+        summary = types.Tool(
+            name=original.name,
+            description=_truncate_description(original.description or ""),
+            # Builds fresh containers itself; no prior copy needed
+            inputSchema=_strip_descriptions(original.inputSchema),
+        )
+        if cached is None and len(self._summary_cache) >= _SUMMARY_CACHE_SIZE:
+            self._summary_cache.pop(next(iter(self._summary_cache)))
+        self._summary_cache[tool_key] = (original, summary)
+        return summary
 
     def assemble(
         self,
@@ -87,21 +170,13 @@ class TieredAssembler:
                     types.Tool(
                         name=original.name,
                         description=original.description,
-                        inputSchema=copy.deepcopy(original.inputSchema),
+                        inputSchema=_clone_schema(original.inputSchema),
                     )
                 )
             else:
                 scored.tier = "summary"
                 # Summary tier: truncate + simplify
-                result.append(
-                    types.Tool(
-                        name=original.name,
-                        description=_truncate_description(original.description or ""),
-                        inputSchema=_strip_descriptions(
-                            copy.deepcopy(original.inputSchema)
-                        ),
-                    )
-                )
+                result.append(self._summarize(scored.tool_key, original))
         if routing_tool_schema is not None:
             result.append(routing_tool_schema)
         return result
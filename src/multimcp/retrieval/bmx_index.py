@@ -83,6 +83,7 @@ USAGE
 Drop-in replacement for BM25Index — identical public API.
 """
 
+import heapq
 import logging
 import math
 import re
@@ -460,8 +461,8 @@ class BMXIndex:
             if score_max > 0:
                 scores = {cid: s / score_max for cid, s in scores.items()}
 
-        sorted_results = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        return sorted_results[:top_k]
+        # Equivalent to a stable descending sort + [:top_k], in O(n log k)
+        return heapq.nlargest(top_k, scores.items(), key=lambda x: x[1])
 
     def _score_document(
         self,
@@ -787,5 +788,4 @@ class BMXIndex:
             results = field_idx.search(query, top_k=top_k * 2)
             for chunk_id, score in results:
                 combined[chunk_id] = combined.get(chunk_id, 0.0) + weight * score
-        sorted_results = sorted(combined.items(), key=lambda x: x[1], reverse=True)
-        return sorted_results[:top_k]
+        return heapq.nlargest(top_k, combined.items(), key=lambda x: x[1])
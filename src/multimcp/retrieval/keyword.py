@@ -45,6 +45,7 @@ rebuild_index(registry) pattern, same retrieve() signature.
 
 from __future__ import annotations
 
+import heapq
 import math
 import re
 from collections import Counter
@@ -187,6 +188,14 @@ class KeywordRetriever(ToolRetriever):
         candidates: list["ToolMapping"],
     ) -> list[ScoredTool]:
         """Score candidates against the context query using improved TF-IDF."""
+        return self._retrieve_impl(context, candidates)
+
+    def _retrieve_impl(
+        self,
+        context: RetrievalContext,
+        candidates: list["ToolMapping"],
+    ) -> list[ScoredTool]:
+        """Synchronous body of retrieve(); scoring is pure CPU and never awaits."""
         query_tokens = _tokenize(context.query)
 
         # Build candidate key lookup
@@ -215,7 +224,7 @@ class KeywordRetriever(ToolRetriever):
                 for key in candidate_keys
                 if key in self._tool_tokens
             ]
-            scored.sort(key=lambda s: s.score, reverse=True)
+            # Uniform scores: the stable sort would keep this order anyway
             return scored[:self._config.top_k]
 
         # ── Identify candidate tools via posting lists ──
@@ -271,9 +280,9 @@ class KeywordRetriever(ToolRetriever):
                     tier="full",
                 ))
 
-        # Sort by score descending, take top-k
-        scored.sort(key=lambda s: s.score, reverse=True)
-        return scored[:self._config.top_k]
+        # Top-k by score descending; same result and tie order as a full
+        # stable sort + slice, but O(n log k)
+        return heapq.nlargest(self._config.top_k, scored, key=lambda s: s.score)
 
     # ── Token scoring (public utility) ─────────────────────────────────
 
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import sys
 import time
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, Literal, Optional
+from typing import TYPE_CHECKING, Any, Literal, Optional, Sequence
 
 if TYPE_CHECKING:
     from src.multimcp.mcp_proxy import ToolMapping
@@ -29,19 +30,22 @@ class ScoredTool:
     tier: Literal["full", "summary"] = "full"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RetrievalConfig:
     """Pipeline configuration with sensible defaults.
 
     Phase 2 fields (shadow_mode, scorer, max_k, enable_routing_tool,
     enable_telemetry, telemetry_poll_interval) all default to safe values
     so existing configs (enabled=False) remain fully backward compatible.
+
+    Immutable and hashable: anchor_tools accepts any sequence of keys but is
+    always stored as a tuple, so one config can be shared and used as a cache key.
     """
     # Existing fields — unchanged
     enabled: bool = False
     top_k: int = 15
     full_description_count: int = 3
-    anchor_tools: list[str] = field(default_factory=list)
+    anchor_tools: Sequence[str] = ()  # normalized to tuple[str, ...] in __post_init__
     # Phase 2 additions
     shadow_mode: bool = False
     scorer: str = "bmxf"
@@ -53,6 +57,13 @@ class RetrievalConfig:
     canary_percentage: float = 0.0        # 0.0-100.0; % of sessions routed to BMXF filtering
     rollout_stage: str = "shadow"         # "shadow" | "canary" | "ga"
 
+    def __post_init__(self) -> None:
+        # Anchor keys seed every session; interning lets all sessions share one
+        # str object per key and gives set lookups the identity fast path.
+        object.__setattr__(
+            self, "anchor_tools", tuple(sys.intern(t) for t in self.anchor_tools)
+        )
+
 
 # === Phase 2: Tool catalog types ===
 
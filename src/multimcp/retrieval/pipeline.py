@@ -670,8 +670,7 @@ class RetrievalPipeline:
         scored_tools.sort(key=lambda s: s.score, reverse=True)
 
         # Step 8: Promote evaluation at turn boundary
-        current_active = self.session_manager.get_active_tools(session_id)
-        active_key_set = set(current_active)
+        active_key_set = self.session_manager.get_active_tools(session_id)
 
         k_minus_2 = max(1, dynamic_k - 2)
         promote_candidates: list[str] = []
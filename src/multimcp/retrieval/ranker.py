@@ -11,6 +11,9 @@ from .models import ScoredTool
 # Scores within this tolerance are considered tied
 _SCORE_TOLERANCE = 0.05
 
+# Max distinct inputs whose ordering is memoized (oldest evicted first)
+_RANK_CACHE_SIZE = 256
+
 
 def _get_specificity(scored: ScoredTool) -> int:
     """Count input properties as a specificity proxy."""
@@ -23,26 +26,44 @@ def _get_specificity(scored: ScoredTool) -> int:
 
 
 class RelevanceRanker:
-    """Ranks scored tools by relevance with specificity tiebreaking."""
+    """Ranks scored tools by relevance with specificity tiebreaking.
+
+    Ranking is pure, so the resulting order is memoized per input
+    (tool_key, score, specificity) sequence; repeat turns over the same
+    candidate set skip the sort.
+    """
+
+    def __init__(self) -> None:
+        self._cache: dict[tuple, tuple[int, ...]] = {}
 
     def rank(self, tools: list[ScoredTool]) -> list[ScoredTool]:
         """Rank tools by score descending, tiebreak by specificity descending.
 
         Two tools are "tied" if their scores differ by less than SCORE_TOLERANCE.
         Among tied tools, the one with more inputSchema properties ranks first.
+        Always returns a new list.
         """
         if not tools:
             return []
 
-        return sorted(
-            tools,
-            key=lambda t: (
-                # Bucket scores into tolerance bands for tiebreaking
-                round(t.score / _SCORE_TOLERANCE) * _SCORE_TOLERANCE,
-                # Within a band, more specific tools rank first
-                _get_specificity(t),
-                # Final tiebreak: tool_key for determinism
-                t.tool_key,
-            ),
-            reverse=True,
-        )
+        key = tuple((t.tool_key, t.score, _get_specificity(t)) for t in tools)
+        order = self._cache.get(key)
+        if order is None:
+            order = tuple(
+                sorted(
+                    range(len(key)),
+                    key=lambda i: (
+                        # Bucket scores into tolerance bands for tiebreaking
+                        round(key[i][1] / _SCORE_TOLERANCE) * _SCORE_TOLERANCE,
+                        # Within a band, more specific tools rank first
+                        key[i][2],
+                        # Final tiebreak: tool_key for determinism
+                        key[i][0],
+                    ),
+                    reverse=True,
+                )
+            )
+            if len(self._cache) >= _RANK_CACHE_SIZE:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = order
+        return [tools[i] for i in order]
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import sys
+
 from .models import RetrievalConfig
 
 
@@ -19,26 +21,29 @@ class SessionStateManager:
 
     def __init__(self, config: RetrievalConfig) -> None:
         self._config = config
-        self._sessions: dict[str, set[str]] = {}
+        # RetrievalConfig is frozen, so the anchor seed set is built once.
+        self._anchors: frozenset[str] = frozenset(config.anchor_tools)
+        # Active sets are frozen snapshots, replaced (never mutated) on change,
+        # so they can be handed to callers without a defensive copy.
+        self._sessions: dict[str, frozenset[str]] = {}
 
-    def get_or_create_session(self, session_id: str) -> set[str]:
+    def get_or_create_session(self, session_id: str) -> frozenset[str]:
         """Initialize a new session with anchor tools, or return existing.
 
-        Returns a copy of the active tool set (callers cannot mutate internal state).
+        Returns an immutable snapshot of the active tool set.
         """
-        if session_id not in self._sessions:
-            self._sessions[session_id] = set(self._config.anchor_tools)
-        return self._sessions[session_id].copy()
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._anchors
+            self._sessions[session_id] = session
+        return session
 
-    def get_active_tools(self, session_id: str) -> set[str]:
+    def get_active_tools(self, session_id: str) -> frozenset[str]:
         """Return the set of active tool keys for this session.
 
-        Returns empty set for unknown sessions (safe default).
+        Returns an immutable snapshot; empty for unknown sessions (safe default).
         """
-        session = self._sessions.get(session_id)
-        if session is None:
-            return set()
-        return session.copy()
+        return self._sessions.get(session_id, frozenset())
 
     def add_tools(self, session_id: str, tool_keys: list[str]) -> list[str]:
         """Add tools to session's active set (monotonic expansion).
@@ -46,12 +51,7 @@ class SessionStateManager:
         Returns list of newly added keys (empty if all were already present).
         Does nothing for unknown sessions.
         """
-        session = self._sessions.get(session_id)
-        if session is None:
-            return []
-        new_keys = [k for k in tool_keys if k not in session]
-        session.update(new_keys)
-        return new_keys
+        return self._extend(session_id, tool_keys)
 
     def promote(self, session_id: str, tool_keys: list[str]) -> list[str]:
         """Add tools to active set at turn boundary. Returns newly promoted keys.
@@ -60,12 +60,23 @@ class SessionStateManager:
         Callers should use this instead of add_tools() when promoting based on
         ranking signals (SESSION-02).
         """
+        return self._extend(session_id, tool_keys)
+
+    def _extend(self, session_id: str, tool_keys: list[str]) -> list[str]:
+        """Union tool_keys into the session's snapshot; return the keys that were new.
+
+        One set difference against the current snapshot instead of a
+        per-key membership loop. Keys are interned so sessions holding the
+        same tool share one str object. Order of the returned keys is unspecified.
+        """
         session = self._sessions.get(session_id)
         if session is None:
             return []
-        new_keys = [k for k in tool_keys if k not in session]
-        session.update(new_keys)
-        return new_keys
+        new_keys = frozenset(sys.intern(k) for k in tool_keys) - session
+        if not new_keys:
+            return []
+        self._sessions[session_id] = session | new_keys
+        return list(new_keys)
 
     def demote(
         self,
@@ -88,7 +99,8 @@ class SessionStateManager:
             k for k in tool_keys if k in session and k not in used_this_turn
         ]
         demoted = safe_to_demote[:max_per_turn]
-        session -= set(demoted)
+        if demoted:
+            self._sessions[session_id] = session.difference(demoted)
         return demoted
 
     def cleanup_session(self, session_id: str) -> None:
@@ -1,4 +1,8 @@
 from __future__ import annotations
+import copy
+import os
+import stat
+import tempfile
 from pathlib import Path
 from typing import Literal, Optional
 import yaml
@@ -7,6 +11,19 @@ from src.utils.logger import get_logger
 
 logger = get_logger("multi_mcp.config")
 
+# libyaml's C loader/dumper when PyYAML was built with it; same results, much faster
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# path -> ((mtime_ns, size, inode), parsed YAML). Only the parse is reused, and
+# each load validates a deep copy of it: pydantic keeps nested values of dict
+# fields (e.g. ToolEntry.input_schema) by reference, so sharing the cached parse
+# would let one load's edits leak into the next.
+_PARSE_CACHE: dict[str, tuple[tuple[int, int, int], object]] = {}
+
+# Parent directories save_config has already created (or found existing)
+_CREATED_DIRS: set[str] = set()
+
 
 class ToolEntry(BaseModel):
     enabled: bool = True
@@ -50,6 +67,9 @@ class MultiMCPConfig(BaseModel):
     exclude_servers: list[str] = Field(default_factory=list)
     """Server names to never auto-import, even if found in editor configs."""
     retrieval: RetrievalSettings = Field(default_factory=RetrievalSettings)
+    call_timeout_s: Optional[float] = Field(default=300.0, gt=0)
+    """Seconds a single backend tool call may run before it fails and counts toward
+    auto-quarantine. Set to null for no deadline (e.g. long-running tools)."""
     backup_dir: Optional[str] = None
     """Directory in which to store .bak files created before writing any tool config.
 
@@ -63,12 +83,21 @@ class MultiMCPConfig(BaseModel):
 
 def load_config(path: Path) -> MultiMCPConfig:
     """Load YAML config from path. Returns empty config if file doesn't exist or is invalid."""
-    if not path.exists():
+    try:
+        st = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return MultiMCPConfig()
+    if st.st_size == 0:
         return MultiMCPConfig()
     try:
-        with open(path) as f:
-            raw = yaml.safe_load(f) or {}
-        return MultiMCPConfig.model_validate(raw)
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached = _PARSE_CACHE.get(str(path))
+        if cached is not None and cached[0] == stamp:
+            raw = cached[1]
+        else:
+            raw = yaml.load(path.read_bytes(), Loader=_SafeLoader) or {}
+            _PARSE_CACHE[str(path)] = (stamp, raw)
+        return MultiMCPConfig.model_validate(copy.deepcopy(raw))
     except yaml.YAMLError as e:
         logger.error(f"❌ Invalid YAML in {path}: {e}")
         return MultiMCPConfig()
@@ -80,25 +109,88 @@ def load_config(path: Path) -> MultiMCPConfig:
         return MultiMCPConfig()
 
 
-def save_config(config: MultiMCPConfig, path: Path) -> None:
-    """Save config to YAML file, creating parent dirs as needed.
-
-    Logs and re-raises on write error so callers can decide how to handle it.
-    """
+def _ensure_parent_dir(path: Path) -> None:
+    """Create path's parent directory unless an earlier save already did."""
+    parent = str(path.parent)
+    if parent in _CREATED_DIRS:
+        return
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
     except OSError as e:
         logger.error(f"❌ Failed to create config directory {path.parent}: {e}")
         raise
+    _CREATED_DIRS.add(parent)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write data to a unique temp file beside the real target, then rename it over.
+
+    Symlinks are resolved first, so the file they point to is updated and the
+    link itself is kept. Readers see either the old file or the new one, never
+    a partial write. An existing file's mode and (where permitted) owner carry
+    over; a new file is created 0600. A file with other hard links is
+    rewritten in place instead, since a rename would detach it from them.
+    """
+    target = Path(os.path.realpath(path))
+    try:
+        st = os.stat(target)
+    except FileNotFoundError:
+        st = None
+    if st is not None and st.st_nlink > 1:
+        with open(target, "wb") as f:
+            f.write(data)
+        return
+
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        try:
+            f = open(fd, "wb")
+        except BaseException:
+            os.close(fd)
+            raise
+        with f:
+            f.write(data)
+        if st is not None:
+            os.chmod(tmp, stat.S_IMODE(st.st_mode))
+            if hasattr(os, "chown"):
+                try:
+                    os.chown(tmp, st.st_uid, st.st_gid)
+                except PermissionError:
+                    pass  # not ours to give away; keep the writer's ownership
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def save_config(config: MultiMCPConfig, path: Path) -> None:
+    """Save config to YAML file, creating parent dirs as needed.
+
+    Logs and re-raises on write error so callers can decide how to handle it.
+    """
+    _PARSE_CACHE.pop(str(path), None)
+    _ensure_parent_dir(path)
+    text = yaml.dump(
+        config.model_dump(exclude_none=False),
+        Dumper=_SafeDumper,
+        default_flow_style=False,
+        sort_keys=False,
+        allow_unicode=True,
+    )
+    data = text.encode("utf-8")
     try:
-        with open(path, "w") as f:
-            yaml.dump(
-                config.model_dump(exclude_none=False),
-                f,
-                default_flow_style=False,
-                sort_keys=False,
-                allow_unicode=True,
-            )
+        try:
+            _write_atomic(path, data)
+        except FileNotFoundError:
+            # Parent dir was removed after we cached it; recreate once and retry
+            if str(path.parent) not in _CREATED_DIRS:
+                raise
+            _CREATED_DIRS.discard(str(path.parent))
+            _ensure_parent_dir(path)
+            _write_atomic(path, data)
     except OSError as e:
         logger.error(f"❌ Failed to write config to {path}: {e}")
         raise
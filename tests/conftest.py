@@ -0,0 +1,95 @@
+"""Shared fixtures for the tests/ suite."""
+
+import copy
+
+import pytest
+from unittest.mock import Mock
+
+from src.multimcp.mcp_proxy import MCPProxyServer
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-slow",
+        action="store_true",
+        default=False,
+        help="also run tests marked slow (full retrieval pipeline runs)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+async def _no_triggers(*args, **kwargs) -> list:
+    """Stand-in for MCPTriggerManager.check_and_enable: nothing auto-enables."""
+    return []
+
+
+def _make_bare_proxy() -> MCPProxyServer:
+    """Create a minimal MCPProxyServer bypassing __init__ for unit testing.
+
+    Skips handler registration, AuditLogger and MCPTriggerManager setup;
+    only the registries and collaborators the request handlers touch are set.
+    """
+    proxy = MCPProxyServer.__new__(MCPProxyServer)
+    proxy.retrieval_pipeline = None
+    proxy._server_session = None
+    _reset_proxy_state(proxy)
+    return proxy
+
+
+def _reset_proxy_state(proxy: MCPProxyServer) -> None:
+    """Give *proxy* its own mock collaborators, empty registries, locks and session bookkeeping."""
+    proxy.client_manager = Mock()
+    proxy.trigger_manager = Mock()
+    proxy.trigger_manager.check_and_enable = _no_triggers
+    proxy.audit_logger = Mock()
+    proxy.logger = Mock()
+    proxy.tool_to_server = {}
+    proxy.prompt_to_server = {}
+    proxy.resource_to_server = {}
+    proxy._resource_objects = {}
+    proxy._register_locks = {}
+    proxy._session_ids = {}
+    proxy._last_tool_list_hash = {}
+    proxy.capabilities = {}
+
+
+@pytest.fixture(scope="session")
+def _proxy_template() -> MCPProxyServer:
+    """One bare proxy that proxy_factory copies for each test."""
+    return _make_bare_proxy()
+
+
+@pytest.fixture
+def proxy_factory(_proxy_template):
+    """Return a callable that builds a fresh bare MCPProxyServer.
+
+    Each proxy is a shallow copy of the session template with its own
+    registries and its own logger/audit/client-manager/trigger mocks, so call
+    records never carry over between tests.
+    """
+    def _build() -> MCPProxyServer:
+        proxy = copy.copy(_proxy_template)
+        _reset_proxy_state(proxy)
+        return proxy
+
+    return _build
+
+
+def _seed_session(pipeline, session_id: str, tool_keys) -> None:
+    """Create *session_id* on the pipeline's session manager and disclose *tool_keys*."""
+    pipeline.session_manager.get_or_create_session(session_id)
+    pipeline.session_manager.add_tools(session_id, list(tool_keys))
+
+
+@pytest.fixture
+def seed_session():
+    """Return a helper that pre-discloses tools in a pipeline session."""
+    return _seed_session
@@ -246,7 +246,7 @@ class TestConcurrentRegisterUnregister:
                 description="test",
                 inputSchema={"type": "object", "properties": {}},
             )
-            async with proxy._register_lock:
+            async with proxy._get_register_lock(name):
                 mock_client = _make_mock_client()
                 manager.clients[name] = mock_client
                 proxy.tool_to_server[f"{name}__tool"] = ToolMapping(
@@ -263,6 +263,32 @@ class TestConcurrentRegisterUnregister:
         for i in range(10):
             assert f"srv{i}__tool" in proxy.tool_to_server
 
+    @pytest.mark.asyncio
+    async def test_register_lock_is_per_server(self):
+        """_get_register_lock returns different lock objects for different servers."""
+        proxy = MCPProxyServer(MCPClientManager())
+
+        lock_github = proxy._get_register_lock("github")
+        lock_slack = proxy._get_register_lock("slack")
+
+        # Unrelated servers must not share (and serialize on) one lock
+        assert lock_github is not lock_slack
+
+        # Same server name always returns the same lock
+        assert proxy._get_register_lock("github") is lock_github
+
+    @pytest.mark.asyncio
+    async def test_register_lock_does_not_block_other_servers(self):
+        """Holding one server's register lock doesn't stall another server's unregister."""
+        manager = MCPClientManager()
+        proxy = MCPProxyServer(manager)
+        manager.clients["slack"] = _make_mock_client()
+
+        async with proxy._get_register_lock("github"):
+            await asyncio.wait_for(proxy.unregister_client("slack"), timeout=1.0)
+
+        assert "slack" not in manager.clients
+
     @pytest.mark.asyncio
     async def test_creation_lock_is_per_server(self):
         """_get_creation_lock returns different lock objects for different servers."""
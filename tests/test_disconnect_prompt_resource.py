@@ -213,3 +213,16 @@ class TestUnregisterAfterDisconnectRemovesGhosts:
         await proxy._on_server_disconnected("srvA")
         await proxy.unregister_client("srvA")
         assert "srvA__r1" not in proxy.resource_to_server
+
+    @pytest.mark.asyncio
+    async def test_unregister_keeps_shared_tool_registry(self):
+        """The pipeline holds tool_to_server by reference; unregister must not rebind it."""
+        proxy = _make_proxy()
+        c1 = _make_mock_client()
+        _add_tool(proxy, "srvA", "srvA__tool1", c1)
+        proxy.client_manager.clients["srvA"] = c1
+        registry = proxy.tool_to_server
+
+        await proxy.unregister_client("srvA")
+        assert proxy.tool_to_server is registry
+        assert "srvA__tool1" not in registry
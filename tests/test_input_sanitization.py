@@ -6,7 +6,7 @@ environment variable filtering, and API error response behavior.
 import json
 import pytest
 import pytest_asyncio
-from unittest.mock import patch, AsyncMock
+from unittest.mock import AsyncMock
 from starlette.testclient import TestClient
 
 from src.multimcp.mcp_client import (
@@ -99,35 +99,26 @@ class TestUrlValidation:
     @pytest.mark.asyncio
     async def test_public_url_accepted(self):
         """A URL resolving to a public IP must pass validation."""
-        with patch("asyncio.get_running_loop") as mock_loop:
-            mock_loop.return_value.getaddrinfo = AsyncMock(
-                return_value=[(None, None, None, None, ("8.8.8.8", 0))]
-            )
-            # Should not raise
-            await _validate_url("http://example.com/api")
-            mock_loop.return_value.getaddrinfo.assert_awaited_once()
+        resolver = AsyncMock(return_value=[(None, None, None, None, ("8.8.8.8", 0))])
+        # Should not raise
+        await _validate_url("http://example.com/api", resolver=resolver)
+        resolver.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_private_ip_127_accepted(self):
         """127.0.0.1 must be accepted — private-IP blocking removed."""
-        with patch("asyncio.get_running_loop") as mock_loop:
-            mock_loop.return_value.getaddrinfo = AsyncMock(
-                return_value=[(None, None, None, None, ("127.0.0.1", 0))]
-            )
-            # Should not raise
-            await _validate_url("http://127.0.0.1:9080/sse")
-            mock_loop.return_value.getaddrinfo.assert_awaited_once()
+        resolver = AsyncMock(return_value=[(None, None, None, None, ("127.0.0.1", 0))])
+        # Should not raise
+        await _validate_url("http://127.0.0.1:9080/sse", resolver=resolver)
+        resolver.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_localhost_accepted(self):
         """localhost must be accepted — private-IP blocking removed."""
-        with patch("asyncio.get_running_loop") as mock_loop:
-            mock_loop.return_value.getaddrinfo = AsyncMock(
-                return_value=[(None, None, None, None, ("127.0.0.1", 0))]
-            )
-            # Should not raise
-            await _validate_url("http://localhost:8080/mcp")
-            mock_loop.return_value.getaddrinfo.assert_awaited_once()
+        resolver = AsyncMock(return_value=[(None, None, None, None, ("127.0.0.1", 0))])
+        # Should not raise
+        await _validate_url("http://localhost:8080/mcp", resolver=resolver)
+        resolver.assert_awaited_once()
 
 
 # ---------------------------------------------------------------------------
@@ -249,3 +240,22 @@ class TestApiErrorResponses:
 
         # Restore
         app_debug.proxy.unregister_client = AsyncMock()
+
+    @pytest.mark.asyncio
+    async def test_ssrf_rejection_adds_no_servers(self, app_no_debug, monkeypatch):
+        """One bad URL in a POST rejects the whole batch; no server becomes pending."""
+        async def _fake_validate(url):
+            if "metadata" in url:
+                raise ValueError("URL resolves to a private/internal address")
+
+        monkeypatch.setattr("src.multimcp.multi_mcp._validate_url", _fake_validate)
+        tc = TestClient(app_no_debug.create_starlette_app())
+        response = tc.post(
+            "/mcp_servers",
+            json={"mcpServers": {
+                "good": {"url": "http://example.com/mcp"},
+                "bad": {"url": "http://metadata.internal/mcp"},
+            }},
+        )
+        assert response.status_code == 403
+        assert app_no_debug.proxy.client_manager.pending_configs == {}
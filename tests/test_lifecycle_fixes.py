@@ -1,11 +1,30 @@
 """Tests for lifecycle fixes: stack leak, creation lock, cleanup state."""
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
-from contextlib import AsyncExitStack
+from unittest.mock import AsyncMock, MagicMock
+from contextlib import AsyncExitStack, asynccontextmanager
 from src.multimcp.mcp_client import MCPClientManager
 
 
+@asynccontextmanager
+async def _stdio_ctx(*args, **kwargs):
+    """stdio_client stand-in yielding a (read, write) pair."""
+    yield None, None
+
+
+class _StubSession:
+    """ClientSession stand-in; the lifecycle only enters it and stores the result."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
 def _make_mgr(**overrides):
     """Create an MCPClientManager with all required attributes set."""
     mgr = MCPClientManager.__new__(MCPClientManager)
@@ -27,13 +46,14 @@ def _make_mgr(**overrides):
     mgr._lifecycle_tasks = {}
     mgr._shutdown_events = {}
     mgr._reconnect_backoff = {}
+    mgr._sse_only_urls = set()
     for k, v in overrides.items():
         setattr(mgr, k, v)
     return mgr
 
 
 @pytest.mark.asyncio
-async def test_reconnect_closes_old_stack():
+async def test_reconnect_closes_old_stack(monkeypatch):
     """_create_single_client must stop an existing lifecycle before creating a new one."""
     mgr = _make_mgr()
 
@@ -45,21 +65,12 @@ async def test_reconnect_closes_old_stack():
     await old_task
     mgr._lifecycle_tasks["test_server"] = old_task
 
-    # Mock the transport and session so _create_single_client can complete
+    # Stub the transport and session so _create_single_client can complete
     server_config = {"command": "node", "args": [], "env": {}}
-    mock_session = AsyncMock()
-    mock_session.initialize = AsyncMock(return_value=MagicMock())
-
-    with patch("src.multimcp.mcp_client.stdio_client") as mock_stdio, \
-         patch("src.multimcp.mcp_client.ClientSession") as mock_cs:
-        mock_read, mock_write = AsyncMock(), AsyncMock()
-        mock_stdio.return_value.__aenter__ = AsyncMock(return_value=(mock_read, mock_write))
-        mock_stdio.return_value.__aexit__ = AsyncMock(return_value=False)
+    monkeypatch.setattr("src.multimcp.mcp_client.stdio_client", _stdio_ctx)
+    monkeypatch.setattr("src.multimcp.mcp_client.ClientSession", _StubSession)
 
-        mock_cs.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_cs.return_value.__aexit__ = AsyncMock(return_value=False)
-
-        await mgr._create_single_client("test_server", server_config)
+    await mgr._create_single_client("test_server", server_config)
 
     # A new client must have been registered
     assert "test_server" in mgr.clients
@@ -150,23 +161,16 @@ async def test_supervision_cancelled_on_shutdown():
 
 
 @pytest.mark.asyncio
-async def test_lifecycle_task_catches_backend_crash():
+async def test_lifecycle_task_catches_backend_crash(monkeypatch):
     """When backend dies, the lifecycle task catches the exception
     instead of crashing the event loop."""
     mgr = _make_mgr(_on_server_disconnected=AsyncMock())
 
     server_config = {"command": "node", "args": [], "env": {}}
-    mock_session = AsyncMock()
-
-    with patch("src.multimcp.mcp_client.stdio_client") as mock_stdio, \
-         patch("src.multimcp.mcp_client.ClientSession") as mock_cs:
-        mock_read, mock_write = AsyncMock(), AsyncMock()
-        mock_stdio.return_value.__aenter__ = AsyncMock(return_value=(mock_read, mock_write))
-        mock_stdio.return_value.__aexit__ = AsyncMock(return_value=False)
-        mock_cs.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_cs.return_value.__aexit__ = AsyncMock(return_value=False)
+    monkeypatch.setattr("src.multimcp.mcp_client.stdio_client", _stdio_ctx)
+    monkeypatch.setattr("src.multimcp.mcp_client.ClientSession", _StubSession)
 
-        await mgr._create_single_client("crashing", server_config)
+    await mgr._create_single_client("crashing", server_config)
 
     assert "crashing" in mgr.clients
     assert "crashing" in mgr._lifecycle_tasks
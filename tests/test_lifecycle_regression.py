@@ -528,6 +528,21 @@ class TestMessagesAuth:
         )
 
 
+class TestCallTimeoutResolution:
+    """The per tool-call deadline comes from CLI/env first, then YAML."""
+
+    @pytest.mark.parametrize("setting,yaml_value,expected", [
+        (None, 300.0, 300.0),   # unset setting defers to YAML default
+        (None, None, None),     # YAML null disables the deadline
+        (45.0, 300.0, 45.0),    # explicit setting wins
+        (0, 300.0, None),       # setting 0 disables the deadline
+    ])
+    def test_resolve_call_timeout(self, setting, yaml_value, expected):
+        app = MultiMCP(call_timeout_s=setting)
+        yaml_config = MultiMCPConfig(call_timeout_s=yaml_value)
+        assert app._resolve_call_timeout(yaml_config) == expected
+
+
 # ─── Fixtures ────────────────────────────────────────────────────────────────
 
 @pytest_asyncio.fixture
@@ -111,14 +111,13 @@ class TestOnToolCalledPromote:
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_returns_false_when_tool_already_active(self):
+    async def test_returns_false_when_tool_already_active(self, seed_session):
         """Tool already in active set: promote returns empty, return False."""
         tool = _make_tool("existing_tool")
         registry = {"github__existing_tool": _make_mapping("github", tool)}
         p = _make_pipeline(registry=registry)
         # Create session with the tool already active
-        p.session_manager.get_or_create_session("s1")
-        p.session_manager.add_tools("s1", ["github__existing_tool"])
+        seed_session(p, "s1", ["github__existing_tool"])
         result = await p.on_tool_called("s1", "github__existing_tool", {})
         assert result is False
 
@@ -33,7 +33,7 @@ class TestPipelineWithRankerAndAssembler:
     """End-to-end pipeline with ranker and assembler wired in."""
 
     @pytest.mark.asyncio
-    async def test_disclosed_tools_are_ranked_and_tiered(self):
+    async def test_disclosed_tools_are_ranked_and_tiered(self, seed_session):
         config = RetrievalConfig(
             enabled=True,
             full_description_count=2,
@@ -59,8 +59,7 @@ class TestPipelineWithRankerAndAssembler:
             assembler=TieredAssembler(),
         )
         # Disclose all tools
-        pipeline.session_manager.get_or_create_session("s1")
-        pipeline.session_manager.add_tools("s1", list(registry.keys()))
+        seed_session(pipeline, "s1", registry)
 
         tools = await pipeline.get_tools_for_list("s1")
         assert len(tools) == 4
@@ -5,72 +5,70 @@ Covers: _list_prompts, _get_prompt, _list_resources, _read_resource,
 """
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from functools import lru_cache
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 from mcp import types
 from mcp.shared.exceptions import McpError
 
-from src.multimcp.mcp_proxy import MCPProxyServer, PromptMapping, ResourceMapping
-
-
-def _make_proxy():
-    """Create a minimal MCPProxyServer bypassing __init__ for unit testing."""
-    proxy = MCPProxyServer.__new__(MCPProxyServer)
-    proxy.tool_to_server = {}
-    proxy.prompt_to_server = {}
-    proxy.resource_to_server = {}
-    proxy._resource_objects = {}
-    proxy.client_manager = MagicMock()
-    proxy.trigger_manager = MagicMock()
-    proxy.audit_logger = MagicMock()
-    proxy.logger = MagicMock()
-    proxy._register_lock = MagicMock()
-    proxy._register_lock.__aenter__ = AsyncMock()
-    proxy._register_lock.__aexit__ = AsyncMock()
-    proxy.retrieval_pipeline = None
-    proxy._server_session = None
-    proxy.capabilities = {}
-    return proxy
+from src.multimcp.mcp_proxy import PromptMapping, ResourceMapping
 
+# Share one event loop across the module instead of one per test.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
 
+
+def _req(**params) -> SimpleNamespace:
+    """Build a request stand-in; handlers only read ``req.params.<field>``."""
+    return SimpleNamespace(params=SimpleNamespace(**params))
+
+
+# Prompts/resources are read-only here (the proxy namespaces a model_copy),
+# so each distinct one is validated once and shared across tests.
+@lru_cache(maxsize=None)
 def _make_prompt(name: str, description: str = "test prompt") -> types.Prompt:
     return types.Prompt(name=name, description=description)
 
 
+@lru_cache(maxsize=None)
 def _make_resource(name: str, uri: str) -> types.Resource:
     return types.Resource(name=name, uri=uri)
 
 
+class TestProxyFactory:
+    async def test_collaborator_mocks_not_shared_between_proxies(self, proxy_factory):
+        first, second = proxy_factory(), proxy_factory()
+        first.logger.warning("boom")
+        for attr in ("client_manager", "trigger_manager", "audit_logger", "logger"):
+            assert getattr(first, attr) is not getattr(second, attr)
+        second.logger.warning.assert_not_called()
+
+
 # ── Prompt tests ──────────────────────────────────────────────────────
 
 
 class TestListPrompts:
-    @pytest.mark.asyncio
-    async def test_returns_all_prompts_namespaced(self):
-        proxy = _make_proxy()
+    @pytest.mark.parametrize("entries", [
+        [],
+        [("github", "summarize")],
+        [("github", "summarize"), ("slack", "notify")],
+        [(f"srv{i}", f"p{i}") for i in range(20)],
+    ])
+    async def test_returns_all_prompts_namespaced(self, proxy_factory, entries):
+        proxy = proxy_factory()
         client = AsyncMock()
-        proxy.prompt_to_server["github__summarize"] = PromptMapping(
-            server_name="github", client=client,
-            prompt=_make_prompt("summarize"),
-        )
-        proxy.prompt_to_server["slack__notify"] = PromptMapping(
-            server_name="slack", client=client,
-            prompt=_make_prompt("notify"),
-        )
-        result = await proxy._list_prompts(None)
-        names = [p.name for p in result.root.prompts]
-        assert sorted(names) == ["github__summarize", "slack__notify"]
-
-    @pytest.mark.asyncio
-    async def test_empty_when_no_prompts(self):
-        proxy = _make_proxy()
+        for server, name in entries:
+            proxy.prompt_to_server[f"{server}__{name}"] = PromptMapping(
+                server_name=server, client=client,
+                prompt=_make_prompt(name),
+            )
         result = await proxy._list_prompts(None)
-        assert result.root.prompts == []
+        names = sorted(p.name for p in result.root.prompts)
+        assert names == sorted(f"{s}__{n}" for s, n in entries)
 
 
 class TestGetPrompt:
-    @pytest.mark.asyncio
-    async def test_routes_to_correct_backend(self):
-        proxy = _make_proxy()
+    async def test_routes_to_correct_backend(self, proxy_factory):
+        proxy = proxy_factory()
         client = AsyncMock()
         expected_result = types.GetPromptResult(
             messages=[
@@ -85,57 +83,19 @@ class TestGetPrompt:
             server_name="github", client=client,
             prompt=_make_prompt("summarize"),
         )
-        req = MagicMock()
-        req.params.name = "github__summarize"
-        req.params.arguments = {"repo": "test"}
+        req = _req(name="github__summarize", arguments={"repo": "test"})
         result = await proxy._get_prompt(req)
         # Verify backend was called with original (un-namespaced) name
         client.get_prompt.assert_called_once_with("summarize", {"repo": "test"})
-
-    @pytest.mark.asyncio
-    async def test_unknown_prompt_returns_error(self):
-        proxy = _make_proxy()
-        req = MagicMock()
-        req.params.name = "nonexistent__prompt"
-        with pytest.raises(McpError):
-            await proxy._get_prompt(req)
-
-    @pytest.mark.asyncio
-    async def test_backend_failure_returns_error(self):
-        proxy = _make_proxy()
-        client = AsyncMock()
-        client.get_prompt = AsyncMock(side_effect=RuntimeError("connection lost"))
-        proxy.prompt_to_server["github__summarize"] = PromptMapping(
-            server_name="github", client=client,
-            prompt=_make_prompt("summarize"),
-        )
-        req = MagicMock()
-        req.params.name = "github__summarize"
-        req.params.arguments = {}
-        with pytest.raises(McpError):
-            await proxy._get_prompt(req)
-
-    @pytest.mark.asyncio
-    async def test_prompt_with_none_client_returns_error(self):
-        proxy = _make_proxy()
-        proxy.prompt_to_server["github__summarize"] = PromptMapping(
-            server_name="github", client=None,
-            prompt=_make_prompt("summarize"),
-        )
-        req = MagicMock()
-        req.params.name = "github__summarize"
-        req.params.arguments = {}
-        with pytest.raises(McpError):
-            await proxy._get_prompt(req)
+        assert result.root == expected_result
 
 
 # ── Resource tests ────────────────────────────────────────────────────
 
 
 class TestListResources:
-    @pytest.mark.asyncio
-    async def test_returns_resources_with_namespaced_name_raw_uri(self):
-        proxy = _make_proxy()
+    async def test_returns_resources_with_namespaced_name_raw_uri(self, proxy_factory):
+        proxy = proxy_factory()
         client = AsyncMock()
         proxy.resource_to_server["file:///data.csv"] = ResourceMapping(
             server_name="filesystem", client=client,
@@ -148,34 +108,31 @@ class TestListResources:
         assert resources[0].name == "filesystem__data.csv"
         # URI must remain raw (not namespaced)
         assert str(resources[0].uri) == "file:///data.csv"
-
-    @pytest.mark.asyncio
-    async def test_empty_when_no_resources(self):
-        proxy = _make_proxy()
-        result = await proxy._list_resources(None)
-        assert result.root.resources == []
-
-    @pytest.mark.asyncio
-    async def test_multiple_servers_resources(self):
-        proxy = _make_proxy()
+        # The shared cached resource itself is left untouched
+        assert _make_resource("data.csv", "file:///data.csv").name == "data.csv"
+
+    @pytest.mark.parametrize("entries", [
+        [],
+        [("fs1", "a.txt", "file:///a.txt")],
+        [("fs1", "a.txt", "file:///a.txt"), ("api", "data", "https://api.example.com/data")],
+        [(f"srv{i}", f"r{i}", f"file:///r{i}.txt") for i in range(20)],
+    ])
+    async def test_multiple_servers_resources(self, proxy_factory, entries):
+        proxy = proxy_factory()
         client = AsyncMock()
-        proxy.resource_to_server["file:///a.txt"] = ResourceMapping(
-            server_name="fs1", client=client,
-            resource=_make_resource("a.txt", "file:///a.txt"),
-        )
-        proxy.resource_to_server["https://api.example.com/data"] = ResourceMapping(
-            server_name="api", client=client,
-            resource=_make_resource("data", "https://api.example.com/data"),
-        )
+        for server, name, uri in entries:
+            proxy.resource_to_server[uri] = ResourceMapping(
+                server_name=server, client=client,
+                resource=_make_resource(name, uri),
+            )
         result = await proxy._list_resources(None)
-        names = sorted([r.name for r in result.root.resources])
-        assert names == ["api__data", "fs1__a.txt"]
+        names = sorted(r.name for r in result.root.resources)
+        assert names == sorted(f"{s}__{n}" for s, n, _ in entries)
 
 
 class TestReadResource:
-    @pytest.mark.asyncio
-    async def test_routes_with_raw_uri(self):
-        proxy = _make_proxy()
+    async def test_routes_with_raw_uri(self, proxy_factory):
+        proxy = proxy_factory()
         client = AsyncMock()
         read_result = types.ReadResourceResult(
             contents=[types.TextResourceContents(uri="file:///data.csv", text="data", mimeType="text/plain")]
@@ -185,112 +142,86 @@ class TestReadResource:
             server_name="fs", client=client,
             resource=_make_resource("data.csv", "file:///data.csv"),
         )
-        req = MagicMock()
-        req.params.uri = "file:///data.csv"
+        req = _req(uri="file:///data.csv")
         await proxy._read_resource(req)
         # Backend receives the raw URI, not a namespaced one
         client.read_resource.assert_called_once_with("file:///data.csv")
 
-    @pytest.mark.asyncio
-    async def test_unknown_resource_returns_error(self):
-        proxy = _make_proxy()
-        req = MagicMock()
-        req.params.uri = "file:///nonexistent"
-        with pytest.raises(McpError):
-            await proxy._read_resource(req)
-
-    @pytest.mark.asyncio
-    async def test_backend_failure_returns_error(self):
-        proxy = _make_proxy()
-        client = AsyncMock()
-        client.read_resource = AsyncMock(side_effect=RuntimeError("timeout"))
-        proxy.resource_to_server["file:///data.csv"] = ResourceMapping(
-            server_name="fs", client=client,
-            resource=_make_resource("data.csv", "file:///data.csv"),
-        )
-        req = MagicMock()
-        req.params.uri = "file:///data.csv"
-        with pytest.raises(McpError):
-            await proxy._read_resource(req)
-
 
 # ── Subscribe / Unsubscribe tests ────────────────────────────────────
 
 
 class TestSubscribeResource:
-    @pytest.mark.asyncio
-    async def test_passes_raw_uri_to_backend(self):
-        proxy = _make_proxy()
+    async def test_passes_raw_uri_to_backend(self, proxy_factory):
+        proxy = proxy_factory()
         client = AsyncMock()
         client.subscribe_resource = AsyncMock()
         proxy.resource_to_server["file:///watch.log"] = ResourceMapping(
             server_name="fs", client=client,
             resource=_make_resource("watch.log", "file:///watch.log"),
         )
-        req = MagicMock()
-        req.params.uri = "file:///watch.log"
+        req = _req(uri="file:///watch.log")
         result = await proxy._subscribe_resource(req)
         # Raw URI passed to backend — NOT namespaced
         client.subscribe_resource.assert_called_once_with("file:///watch.log")
         assert not hasattr(result.root, "isError") or result.root.isError is not True
 
-    @pytest.mark.asyncio
-    async def test_unknown_resource_returns_error(self):
-        proxy = _make_proxy()
-        req = MagicMock()
-        req.params.uri = "file:///nonexistent"
-        with pytest.raises(McpError):
-            await proxy._subscribe_resource(req)
-
-    @pytest.mark.asyncio
-    async def test_backend_failure_returns_error(self):
-        proxy = _make_proxy()
-        client = AsyncMock()
-        client.subscribe_resource = AsyncMock(
-            side_effect=RuntimeError("subscribe failed")
-        )
-        proxy.resource_to_server["file:///watch.log"] = ResourceMapping(
-            server_name="fs", client=client,
-            resource=_make_resource("watch.log", "file:///watch.log"),
-        )
-        req = MagicMock()
-        req.params.uri = "file:///watch.log"
-        with pytest.raises(McpError):
-            await proxy._subscribe_resource(req)
-
 
 class TestUnsubscribeResource:
-    @pytest.mark.asyncio
-    async def test_passes_raw_uri_to_backend(self):
-        proxy = _make_proxy()
+    async def test_passes_raw_uri_to_backend(self, proxy_factory):
+        proxy = proxy_factory()
         client = AsyncMock()
         client.unsubscribe_resource = AsyncMock()
         proxy.resource_to_server["file:///watch.log"] = ResourceMapping(
             server_name="fs", client=client,
             resource=_make_resource("watch.log", "file:///watch.log"),
         )
-        req = MagicMock()
-        req.params.uri = "file:///watch.log"
+        req = _req(uri="file:///watch.log")
         result = await proxy._unsubscribe_resource(req)
         client.unsubscribe_resource.assert_called_once_with("file:///watch.log")
         assert not hasattr(result.root, "isError") or result.root.isError is not True
 
-    @pytest.mark.asyncio
-    async def test_unknown_resource_returns_error(self):
-        proxy = _make_proxy()
-        req = MagicMock()
-        req.params.uri = "file:///nonexistent"
-        with pytest.raises(McpError):
-            await proxy._unsubscribe_resource(req)
 
-    @pytest.mark.asyncio
-    async def test_none_client_returns_error(self):
-        proxy = _make_proxy()
-        proxy.resource_to_server["file:///watch.log"] = ResourceMapping(
-            server_name="fs", client=None,
-            resource=_make_resource("watch.log", "file:///watch.log"),
-        )
-        req = MagicMock()
-        req.params.uri = "file:///watch.log"
+# ── Error paths ───────────────────────────────────────────────────────
+
+# (handler, backend method, registry attribute, registered key)
+_ERROR_PATH_OPS = [
+    ("_get_prompt", "get_prompt", "prompt_to_server", "github__summarize"),
+    ("_read_resource", "read_resource", "resource_to_server", "file:///data.csv"),
+    ("_subscribe_resource", "subscribe_resource", "resource_to_server", "file:///watch.log"),
+    ("_unsubscribe_resource", "unsubscribe_resource", "resource_to_server", "file:///watch.log"),
+]
+
+
+def _error_path_request(registry: str, key: str) -> SimpleNamespace:
+    if registry == "prompt_to_server":
+        return _req(name=key, arguments={})
+    return _req(uri=key)
+
+
+class TestErrorPaths:
+    """Unknown key, backend failure and disconnected client all raise McpError."""
+
+    @pytest.mark.parametrize("scenario", ["unknown", "backend_raises", "none_client"])
+    @pytest.mark.parametrize("op,backend_method,registry,key", _ERROR_PATH_OPS)
+    async def test_error_paths(self, proxy_factory, op, backend_method, registry, key, scenario):
+        proxy = proxy_factory()
+        if scenario != "unknown":
+            client = None
+            if scenario == "backend_raises":
+                client = AsyncMock()
+                setattr(client, backend_method, AsyncMock(side_effect=RuntimeError("backend failure")))
+            if registry == "prompt_to_server":
+                mapping = PromptMapping(
+                    server_name="github", client=client,
+                    prompt=_make_prompt("summarize"),
+                )
+            else:
+                mapping = ResourceMapping(
+                    server_name="fs", client=client,
+                    resource=_make_resource(key.rsplit("/", 1)[-1], key),
+                )
+            getattr(proxy, registry)[key] = mapping
+
         with pytest.raises(McpError):
-            await proxy._unsubscribe_resource(req)
+            await getattr(proxy, op)(_error_path_request(registry, key))
@@ -1,39 +1,52 @@
 import pytest
-import time
+from types import SimpleNamespace
 from unittest.mock import AsyncMock
+from src.multimcp import mcp_client
 from src.multimcp.mcp_client import MCPClientManager
 
-@pytest.mark.asyncio
-async def test_get_or_create_records_usage_on_existing_client():
+# Share one event loop across the module instead of one per test.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+_FROZEN_NOW = 1000.0
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    """Pin mcp_client's monotonic clock so usage timestamps are exact."""
+    monkeypatch.setattr(mcp_client, "time", SimpleNamespace(monotonic=lambda: _FROZEN_NOW))
+
+
+@pytest.fixture
+def manager_with_pending(monkeypatch):
+    """MCPClientManager with a pending 'tavily' config whose creation is stubbed."""
+    manager = MCPClientManager()
+    manager.pending_configs["tavily"] = {"command": "/fake/run-tavily.sh"}
+    mock_session = AsyncMock()
+
+    async def fake_create(name, config):
+        manager.clients[name] = mock_session
+
+    monkeypatch.setattr(manager, "_create_single_client", fake_create)
+    return manager, mock_session
+
+
+async def test_get_or_create_records_usage_on_existing_client(frozen_clock):
     """get_or_create_client records last_used timestamp when returning existing client."""
     manager = MCPClientManager()
     mock_session = AsyncMock()
     manager.clients["exa"] = mock_session
 
-    before = time.monotonic()
     client = await manager.get_or_create_client("exa")
-    after = time.monotonic()
 
-    assert before <= manager.last_used["exa"] <= after
+    assert manager.last_used["exa"] == _FROZEN_NOW
     assert client is mock_session
 
-@pytest.mark.asyncio
-async def test_get_or_create_records_usage_on_new_client():
-    """get_or_create_client records last_used timestamp when creating from pending config."""
-    manager = MCPClientManager()
-    mock_session = AsyncMock()
 
-    # Add a pending config
-    manager.pending_configs["tavily"] = {"command": "/fake/run-tavily.sh"}
-
-    # Mock _create_single_client to just add the client
-    async def fake_create(name, config):
-        manager.clients[name] = mock_session
-    manager._create_single_client = fake_create
+async def test_get_or_create_records_usage_on_new_client(frozen_clock, manager_with_pending):
+    """get_or_create_client records last_used timestamp when creating from pending config."""
+    manager, mock_session = manager_with_pending
 
-    before = time.monotonic()
     client = await manager.get_or_create_client("tavily")
-    after = time.monotonic()
 
-    assert before <= manager.last_used["tavily"] <= after
+    assert manager.last_used["tavily"] == _FROZEN_NOW
     assert client is mock_session
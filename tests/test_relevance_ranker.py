@@ -1,76 +1,116 @@
 """Tests for RelevanceRanker with specificity tiebreaking."""
 import pytest
+from functools import lru_cache
 from unittest.mock import MagicMock
 from mcp import types
 from src.multimcp.retrieval.ranker import RelevanceRanker
 from src.multimcp.retrieval.models import ScoredTool
 
+# inputSchema per property count, built once and shared by every test tool.
+_SCHEMA_CACHE = {
+    n: {
+        "type": "object",
+        "properties": {f"prop{i}": {"type": "string"} for i in range(n)},
+    }
+    for n in (0, 1, 2, 5, 10)
+}
 
-def _make_scored(name: str, score: float, num_properties: int = 0) -> ScoredTool:
-    tool = types.Tool(
+
+@lru_cache(maxsize=None)
+def _make_tool(name: str, num_properties: int) -> types.Tool:
+    """Build (once) a read-only Tool; the ranker never mutates it."""
+    return types.Tool(
         name=name,
         description="test",
-        inputSchema={
-            "type": "object",
-            "properties": {f"prop{i}": {"type": "string"} for i in range(num_properties)},
-        },
+        inputSchema=_SCHEMA_CACHE[num_properties],
     )
+
+
+def _make_scored(name: str, score: float, num_properties: int = 0) -> ScoredTool:
     m = MagicMock()
-    m.tool = tool
+    m.tool = _make_tool(name, num_properties)
     return ScoredTool(tool_key=f"test__{name}", tool_mapping=m, score=score)
 
 
-class TestRelevanceRanker:
-    def setup_method(self):
-        self.ranker = RelevanceRanker()
+def _make_scored_batch(names: list[str], score: float, num_properties: int) -> list[ScoredTool]:
+    """Equal-score ScoredTools that differ only by tool_key and share one Tool.
+
+    The ranker only reads ``tool_mapping.tool.inputSchema``, so one mapping
+    can back every entry.
+    """
+    m = MagicMock()
+    m.tool = _make_tool("shared", num_properties)
+    return [ScoredTool(tool_key=f"test__{n}", tool_mapping=m, score=score) for n in names]
+
 
-    def test_sorts_by_score_descending(self):
+@pytest.fixture(scope="class")
+def ranker():
+    # RelevanceRanker holds no per-call state, so one instance serves the class.
+    return RelevanceRanker()
+
+
+class TestRelevanceRanker:
+    def test_sorts_by_score_descending(self, ranker):
         tools = [
             _make_scored("low", 0.3),
             _make_scored("high", 0.9),
             _make_scored("mid", 0.6),
         ]
-        ranked = self.ranker.rank(tools)
+        ranked = ranker.rank(tools)
         scores = [t.score for t in ranked]
         assert scores == sorted(scores, reverse=True)
 
-    def test_tiebreak_by_specificity(self):
+    def test_tiebreak_by_specificity(self, ranker):
         """Equal scores: tool with more properties ranks first."""
         simple = _make_scored("simple", 0.8, num_properties=1)
         complex_ = _make_scored("complex", 0.8, num_properties=5)
-        ranked = self.ranker.rank([simple, complex_])
+        ranked = ranker.rank([simple, complex_])
         assert ranked[0].tool_key == "test__complex"
 
-    def test_score_tolerance_for_tiebreak(self):
+    def test_score_tolerance_for_tiebreak(self, ranker):
         """Scores within 0.05 are considered tied."""
         a = _make_scored("a", 0.81, num_properties=2)
         b = _make_scored("b", 0.79, num_properties=5)  # Lower score but more specific
-        ranked = self.ranker.rank([a, b])
+        ranked = ranker.rank([a, b])
         # Within tolerance, so specificity tiebreak applies
         assert ranked[0].tool_key == "test__b"
 
-    def test_score_beyond_tolerance_no_tiebreak(self):
+    def test_score_beyond_tolerance_no_tiebreak(self, ranker):
         """Scores more than 0.05 apart: score wins, not specificity."""
         a = _make_scored("a", 0.9, num_properties=1)
         b = _make_scored("b", 0.7, num_properties=10)
-        ranked = self.ranker.rank([a, b])
+        ranked = ranker.rank([a, b])
         assert ranked[0].tool_key == "test__a"
 
-    def test_single_element(self):
+    def test_single_element(self, ranker):
         tools = [_make_scored("only", 0.5)]
-        ranked = self.ranker.rank(tools)
+        ranked = ranker.rank(tools)
         assert len(ranked) == 1
         assert ranked[0].tool_key == "test__only"
 
-    def test_empty_list(self):
-        assert self.ranker.rank([]) == []
+    def test_empty_list(self, ranker):
+        assert ranker.rank([]) == []
 
-    def test_deterministic(self):
-        tools = [
-            _make_scored("a", 0.5, 2),
-            _make_scored("b", 0.5, 2),
-            _make_scored("c", 0.5, 2),
-        ]
-        r1 = [t.tool_key for t in self.ranker.rank(tools)]
-        r2 = [t.tool_key for t in self.ranker.rank(tools)]
-        assert r1 == r2
+    def test_deterministic(self, ranker):
+        tools = _make_scored_batch(["a", "b", "c"], 0.5, 2)
+        r1 = ranker.rank(tools)
+        r2 = ranker.rank(tools)
+        # Fresh list each call, same order
+        assert r2 is not r1
+        assert [t.tool_key for t in r1] == [t.tool_key for t in r2]
+
+    def test_cache_hit(self):
+        ranker = RelevanceRanker()
+        tools = _make_scored_batch(["a", "b", "c"], 0.5, 2)
+        first = ranker.rank(tools)
+        second = ranker.rank(tools)
+        assert len(ranker._cache) == 1
+        assert [t.tool_key for t in second] == [t.tool_key for t in first]
+
+    def test_cache_distinguishes_scores(self):
+        """Same tool keys with different scores must not reuse a stale order."""
+        ranker = RelevanceRanker()
+        ranked = ranker.rank([_make_scored("a", 0.9), _make_scored("b", 0.1)])
+        assert ranked[0].tool_key == "test__a"
+        ranked = ranker.rank([_make_scored("a", 0.1), _make_scored("b", 0.9)])
+        assert ranked[0].tool_key == "test__b"
@@ -6,18 +6,29 @@ backends without _split_key() — unlike tools/prompts which are namespaced.
 """
 
 import pytest
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 from mcp import types
 from mcp.shared.exceptions import McpError
 
-from src.multimcp.mcp_client import MCPClientManager
-from src.multimcp.mcp_proxy import MCPProxyServer, ResourceMapping
+from src.multimcp.mcp_proxy import ResourceMapping
 
+# Share one event loop across the module instead of one per test.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
 
-def _make_proxy_with_resource():
+# Shared client for mappings whose backend is never called; read-only sentinel.
+_UNUSED_CLIENT = AsyncMock()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _unused_client_untouched():
+    yield
+    assert _UNUSED_CLIENT.method_calls == []
+
+
+def _make_proxy_with_resource(proxy_factory):
     """Create a proxy with a resource stored using raw URI key (matches real behavior)."""
-    manager = MCPClientManager()
-    proxy = MCPProxyServer(manager)
+    proxy = proxy_factory()
     mock_client = AsyncMock()
     mock_resource = MagicMock(spec=types.Resource)
     mock_resource.uri = "resource://weather/data"
@@ -34,17 +45,19 @@ def _make_proxy_with_resource():
     return proxy, mock_client
 
 
+def _req(**params) -> SimpleNamespace:
+    """Build a request stand-in; handlers only read ``req.params.<field>``."""
+    return SimpleNamespace(params=SimpleNamespace(**params))
+
+
 class TestSubscribeResource:
     """Subscribe passes raw URI directly to backend (no namespace stripping needed)."""
 
-    @pytest.mark.asyncio
-    async def test_subscribe_forwards_raw_uri(self):
-        proxy, mock_client = _make_proxy_with_resource()
+    async def test_subscribe_forwards_raw_uri(self, proxy_factory):
+        proxy, mock_client = _make_proxy_with_resource(proxy_factory)
         mock_client.subscribe_resource = AsyncMock()
 
-        req = MagicMock()
-        req.params = MagicMock()
-        req.params.uri = "resource://weather/data"
+        req = _req(uri="resource://weather/data")
 
         await proxy._subscribe_resource(req)
 
@@ -52,40 +65,15 @@ class TestSubscribeResource:
         call_arg = mock_client.subscribe_resource.call_args[0][0]
         assert str(call_arg) == "resource://weather/data"
 
-    @pytest.mark.asyncio
-    async def test_subscribe_unknown_resource_returns_error(self):
-        proxy, _ = _make_proxy_with_resource()
-        req = MagicMock()
-        req.params = MagicMock()
-        req.params.uri = "resource://nonexistent/foo"
-
-        with pytest.raises(McpError):
-            await proxy._subscribe_resource(req)
-
-    @pytest.mark.asyncio
-    async def test_subscribe_disconnected_client_returns_error(self):
-        proxy, _ = _make_proxy_with_resource()
-        proxy.resource_to_server["resource://weather/data"].client = None
-
-        req = MagicMock()
-        req.params = MagicMock()
-        req.params.uri = "resource://weather/data"
-
-        with pytest.raises(McpError):
-            await proxy._subscribe_resource(req)
-
 
 class TestUnsubscribeResource:
     """Unsubscribe passes raw URI directly to backend."""
 
-    @pytest.mark.asyncio
-    async def test_unsubscribe_forwards_raw_uri(self):
-        proxy, mock_client = _make_proxy_with_resource()
+    async def test_unsubscribe_forwards_raw_uri(self, proxy_factory):
+        proxy, mock_client = _make_proxy_with_resource(proxy_factory)
         mock_client.unsubscribe_resource = AsyncMock()
 
-        req = MagicMock()
-        req.params = MagicMock()
-        req.params.uri = "resource://weather/data"
+        req = _req(uri="resource://weather/data")
 
         await proxy._unsubscribe_resource(req)
 
@@ -93,30 +81,17 @@ class TestUnsubscribeResource:
         call_arg = mock_client.unsubscribe_resource.call_args[0][0]
         assert str(call_arg) == "resource://weather/data"
 
-    @pytest.mark.asyncio
-    async def test_unsubscribe_unknown_resource_returns_error(self):
-        proxy, _ = _make_proxy_with_resource()
-        req = MagicMock()
-        req.params = MagicMock()
-        req.params.uri = "resource://nonexistent/foo"
-
-        with pytest.raises(McpError):
-            await proxy._unsubscribe_resource(req)
-
 
 class TestReadResource:
     """Read resource forwards raw URI to backend."""
 
-    @pytest.mark.asyncio
-    async def test_read_forwards_raw_uri(self):
-        proxy, mock_client = _make_proxy_with_resource()
+    async def test_read_forwards_raw_uri(self, proxy_factory):
+        proxy, mock_client = _make_proxy_with_resource(proxy_factory)
         mock_client.read_resource = AsyncMock(return_value=types.ReadResourceResult(
             contents=[types.TextResourceContents(uri="resource://weather/data", text="sunny", mimeType="text/plain")]
         ))
 
-        req = MagicMock()
-        req.params = MagicMock()
-        req.params.uri = "resource://weather/data"
+        req = _req(uri="resource://weather/data")
 
         await proxy._read_resource(req)
 
@@ -124,79 +99,73 @@ class TestReadResource:
         call_arg = mock_client.read_resource.call_args[0][0]
         assert str(call_arg) == "resource://weather/data"
 
-    @pytest.mark.asyncio
-    async def test_read_disconnected_client_returns_error(self):
-        proxy, _ = _make_proxy_with_resource()
-        proxy.resource_to_server["resource://weather/data"].client = None
 
-        req = MagicMock()
-        req.params = MagicMock()
-        req.params.uri = "resource://weather/data"
-
-        with pytest.raises(McpError):
-            await proxy._read_resource(req)
-
-    @pytest.mark.asyncio
-    async def test_read_unknown_resource_returns_error(self):
-        proxy, _ = _make_proxy_with_resource()
-        req = MagicMock()
-        req.params = MagicMock()
-        req.params.uri = "resource://nonexistent/foo"
-
-        with pytest.raises(McpError):
-            await proxy._read_resource(req)
+class TestResourceErrorPaths:
+    """Unknown URI, backend failure and disconnected client all raise McpError."""
 
-    @pytest.mark.asyncio
-    async def test_read_client_exception_returns_error(self):
-        proxy, mock_client = _make_proxy_with_resource()
-        mock_client.read_resource = AsyncMock(side_effect=Exception("connection lost"))
+    @pytest.mark.parametrize("scenario", ["unknown", "backend_raises", "none_client"])
+    @pytest.mark.parametrize("op,backend_method", [
+        ("_subscribe_resource", "subscribe_resource"),
+        ("_unsubscribe_resource", "unsubscribe_resource"),
+        ("_read_resource", "read_resource"),
+    ])
+    async def test_error_paths(self, proxy_factory, op, backend_method, scenario):
+        proxy, mock_client = _make_proxy_with_resource(proxy_factory)
+        uri = "resource://weather/data"
+        if scenario == "unknown":
+            uri = "resource://nonexistent/foo"
+        elif scenario == "backend_raises":
+            setattr(mock_client, backend_method, AsyncMock(side_effect=Exception("connection lost")))
+        else:
+            proxy.resource_to_server[uri].client = None
 
-        req = MagicMock()
-        req.params = MagicMock()
-        req.params.uri = "resource://weather/data"
+        req = _req(uri=uri)
 
         with pytest.raises(McpError):
-            await proxy._read_resource(req)
+            await getattr(proxy, op)(req)
 
 
 class TestListResources:
     """List resources returns entries with namespaced name but raw URI."""
 
-    @pytest.mark.asyncio
-    async def test_list_returns_namespaced_name(self):
-        proxy, _ = _make_proxy_with_resource()
-        result = await proxy._list_resources(MagicMock())
+    async def test_list_returns_namespaced_name(self, proxy_factory):
+        proxy, _ = _make_proxy_with_resource(proxy_factory)
+        result = await proxy._list_resources(None)
         resources = result.root.resources
         assert len(resources) == 1
         # Name should be namespaced for disambiguation
         assert resources[0].name == "weather__Weather Data"
 
-    @pytest.mark.asyncio
-    async def test_list_preserves_original_uri(self):
-        proxy, _ = _make_proxy_with_resource()
-        result = await proxy._list_resources(MagicMock())
+    async def test_list_preserves_original_uri(self, proxy_factory):
+        proxy, _ = _make_proxy_with_resource(proxy_factory)
+        result = await proxy._list_resources(None)
         resources = result.root.resources
         # URI stays raw — client uses it for read/subscribe calls
         assert str(resources[0].uri) == "resource://weather/data"
 
-    @pytest.mark.asyncio
-    async def test_resource_mapping_type_consistency(self):
-        proxy, _ = _make_proxy_with_resource()
+    async def test_list_uses_unvalidated_shallow_copy(self, proxy_factory):
+        """Listing copies the cached resource via model_copy() (no re-validation)."""
+        proxy, _ = _make_proxy_with_resource(proxy_factory)
+        cached = proxy.resource_to_server["resource://weather/data"].resource
+        await proxy._list_resources(None)
+        cached.model_copy.assert_called_once_with()
+        # The namespaced name lands on the copy, never on the cached original
+        assert cached.name == "Weather Data"
+
+    async def test_resource_mapping_type_consistency(self, proxy_factory):
+        proxy, _ = _make_proxy_with_resource(proxy_factory)
         for key, value in proxy.resource_to_server.items():
             assert isinstance(value, ResourceMapping), (
                 f"resource_to_server[{key}] is {type(value).__name__}, expected ResourceMapping"
             )
 
-    @pytest.mark.asyncio
-    async def test_empty_resource_list(self):
-        manager = MCPClientManager()
-        proxy = MCPProxyServer(manager)
-        result = await proxy._list_resources(MagicMock())
+    async def test_empty_resource_list(self, proxy_factory):
+        proxy = proxy_factory()
+        result = await proxy._list_resources(None)
         assert result.root.resources == []
 
-    @pytest.mark.asyncio
-    async def test_multiple_servers_resources_listed(self):
-        proxy, mock_client = _make_proxy_with_resource()
+    async def test_multiple_servers_resources_listed(self, proxy_factory):
+        proxy, mock_client = _make_proxy_with_resource(proxy_factory)
         mock_resource2 = MagicMock(spec=types.Resource)
         mock_resource2.uri = "resource://news/headlines"
         mock_resource2.name = "Headlines"
@@ -205,7 +174,7 @@ class TestListResources:
         copied2.name = "Headlines"
         mock_resource2.model_copy = MagicMock(return_value=copied2)
         proxy.resource_to_server["resource://news/headlines"] = ResourceMapping(
-            server_name="news", client=AsyncMock(), resource=mock_resource2
+            server_name="news", client=_UNUSED_CLIENT, resource=mock_resource2
         )
-        result = await proxy._list_resources(MagicMock())
+        result = await proxy._list_resources(None)
         assert len(result.root.resources) == 2
@@ -1,57 +1,61 @@
 """Tests for retrieval configuration in YAML config."""
 
 import pytest
-import yaml
-from io import StringIO
+from pydantic import ValidationError
 from src.multimcp.yaml_config import MultiMCPConfig, RetrievalSettings
 
+# Every test here is synchronous and pure-config (make test-fast).
+pytestmark = pytest.mark.fast
 
-class TestRetrievalSettings:
-    def test_defaults_disabled(self):
-        settings = RetrievalSettings()
-        assert settings.enabled is False
-        assert settings.top_k == 10
-        assert settings.full_description_count == 3
-        assert settings.anchor_tools == []
-
-    def test_custom_values(self):
-        settings = RetrievalSettings(
+@pytest.fixture(scope="module")
+def dumped_retrieval_config():
+    """model_dump() of a retrieval-enabled config, serialized once per module."""
+    config = MultiMCPConfig(
+        retrieval=RetrievalSettings(
             enabled=True,
-            top_k=5,
-            full_description_count=2,
-            anchor_tools=["github__get_me"],
+            top_k=15,
+            anchor_tools=["github__get_me", "exa__search"],
         )
-        assert settings.enabled is True
-        assert settings.top_k == 5
+    )
+    return config.model_dump()
 
 
-class TestMultiMCPConfigRetrieval:
-    def test_config_without_retrieval_key(self):
-        """Existing configs without retrieval section should work."""
-        config = MultiMCPConfig()
-        assert config.retrieval.enabled is False
+class TestRetrievalSettings:
+    @pytest.mark.parametrize("kwargs,expected", [
+        ({}, {"enabled": False, "top_k": 10, "full_description_count": 3, "anchor_tools": []}),
+        (
+            {"enabled": True, "top_k": 5, "full_description_count": 2, "anchor_tools": ["github__get_me"]},
+            {"enabled": True, "top_k": 5},
+        ),
+    ], ids=["defaults_disabled", "custom_values"])
+    def test_retrieval_settings(self, kwargs, expected):
+        settings = RetrievalSettings(**kwargs)
+        for field, value in expected.items():
+            assert getattr(settings, field) == value
+
+    def test_negative_top_k_rejected(self):
+        with pytest.raises(ValidationError):
+            RetrievalSettings(top_k=-1)
 
-    def test_config_with_retrieval_section(self):
-        config = MultiMCPConfig(retrieval=RetrievalSettings(enabled=True, top_k=7))
-        assert config.retrieval.enabled is True
-        assert config.retrieval.top_k == 7
 
-    def test_yaml_roundtrip(self):
+class TestMultiMCPConfigRetrieval:
+    @pytest.mark.parametrize("kwargs,expected", [
+        # Existing configs without retrieval section should work
+        pytest.param({}, {"enabled": False}, id="without_retrieval_key"),
+        pytest.param(
+            {"retrieval": RetrievalSettings(enabled=True, top_k=7)},
+            {"enabled": True, "top_k": 7},
+            id="with_retrieval_section",
+        ),
+    ])
+    def test_config_retrieval(self, kwargs, expected):
+        config = MultiMCPConfig(**kwargs)
+        for field, value in expected.items():
+            assert getattr(config.retrieval, field) == value
+
+    def test_yaml_roundtrip(self, dumped_retrieval_config):
         """Config should survive YAML serialization/deserialization."""
-        config = MultiMCPConfig(
-            retrieval=RetrievalSettings(
-                enabled=True,
-                top_k=15,
-                anchor_tools=["github__get_me", "exa__search"],
-            )
-        )
-        dumped = config.model_dump()
-        restored = MultiMCPConfig(**dumped)
+        restored = MultiMCPConfig(**dumped_retrieval_config)
         assert restored.retrieval.enabled is True
         assert restored.retrieval.top_k == 15
         assert len(restored.retrieval.anchor_tools) == 2
-
-    def test_invalid_top_k_negative(self):
-        """Negative top_k should raise validation error."""
-        with pytest.raises(Exception):  # Pydantic ValidationError
-            RetrievalSettings(top_k=-1)
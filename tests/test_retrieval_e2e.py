@@ -1,8 +1,6 @@
 """End-to-end integration tests for the complete retrieval pipeline."""
 
-import json
 import pytest
-from unittest.mock import MagicMock
 from mcp import types
 from src.multimcp.retrieval.pipeline import RetrievalPipeline
 from src.multimcp.retrieval.keyword import KeywordRetriever
@@ -12,6 +10,9 @@ from src.multimcp.retrieval.logging import NullLogger
 from src.multimcp.retrieval.session import SessionStateManager
 from src.multimcp.retrieval.models import RetrievalConfig
 
+# Share one event loop across the module instead of one per test.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
 
 def _make_tool(name: str, desc: str, props: dict = None) -> types.Tool:
     if props is None:
@@ -21,12 +22,24 @@ def _make_tool(name: str, desc: str, props: dict = None) -> types.Tool:
     )
 
 
-def _make_mapping(server: str, tool: types.Tool):
-    m = MagicMock()
-    m.server_name = server
-    m.tool = tool
-    m.client = MagicMock()
-    return m
+class _FakeMapping:
+    """Plain stand-in for ToolMapping; retrieval only reads these attributes."""
+
+    __slots__ = ("server_name", "tool", "client")
+
+    def __init__(self, server_name: str, tool: types.Tool) -> None:
+        self.server_name = server_name
+        self.tool = tool
+        self.client = None
+
+
+def _make_mapping(server: str, tool: types.Tool) -> _FakeMapping:
+    return _FakeMapping(server, tool)
+
+
+def _approx_size(tool: types.Tool) -> int:
+    """Cheap size proxy over the fields tiering can shrink (no model_dump/JSON)."""
+    return len(tool.name) + len(tool.description or "") + len(str(tool.inputSchema))
 
 
 def _build_large_registry():
@@ -98,45 +111,96 @@ def _build_large_registry():
     return tools
 
 
-class TestEndToEndRetrieval:
-    """Full pipeline: keyword retrieval → ranking → tiered assembly."""
+@pytest.fixture(scope="module")
+def large_registry_template():
+    """The 18-tool registry, built once per module.
 
-    @pytest.mark.asyncio
-    async def test_fresh_session_bounded_output(self):
-        """Phase 2: fresh session returns bounded tool set via fallback ladder.
+    Tools and mappings are only read by the pipeline; tests take a shallow
+    ``dict(...)`` copy so per-test registry mutations stay local.
+    """
+    return _build_large_registry()
 
-        Active set is computed by scoring/fallback, not session_manager seeding.
-        Result must be <= 20 direct tools (core invariant).
-        """
-        config = RetrievalConfig(
-            enabled=True,
-            top_k=15,
-            full_description_count=3,
-            anchor_tools=["github__get_me"],
-            rollout_stage="ga",
-        )
-        registry = _build_large_registry()
+
+@pytest.fixture(scope="module")
+def retriever_for(large_registry_template):
+    """Return a factory of KeywordRetrievers indexed over the template registry.
+
+    Each call builds and indexes its own retriever, so no test can see another
+    test's index state.
+    """
+    def _for(config: RetrievalConfig) -> KeywordRetriever:
         retriever = KeywordRetriever(config)
-        retriever.rebuild_index(registry)
+        retriever.rebuild_index(large_registry_template)
+        return retriever
 
-        pipeline = RetrievalPipeline(
+    return _for
+
+
+@pytest.fixture(scope="module")
+def make_pipeline():
+    """Build a RetrievalPipeline around a shared stateless ranker/assembler/logger.
+
+    Only the session manager (which holds per-session state) is created per call.
+    """
+    ranker = RelevanceRanker()
+    assembler = TieredAssembler()
+    logger = NullLogger()
+
+    def _make(config: RetrievalConfig, registry: dict, retriever) -> RetrievalPipeline:
+        return RetrievalPipeline(
             retriever=retriever,
             session_manager=SessionStateManager(config),
-            logger=NullLogger(),
+            logger=logger,
             config=config,
             tool_registry=registry,
-            ranker=RelevanceRanker(),
-            assembler=TieredAssembler(),
+            ranker=ranker,
+            assembler=assembler,
         )
 
+    return _make
+
+
+@pytest.fixture(scope="module")
+def ga_config():
+    """GA-stage config anchored on github__get_me; shared since no test mutates it."""
+    return RetrievalConfig(
+        enabled=True,
+        top_k=15,
+        full_description_count=3,
+        anchor_tools=["github__get_me"],
+        rollout_stage="ga",
+    )
+
+
+@pytest.fixture(scope="module")
+def top5_config():
+    return RetrievalConfig(enabled=True, top_k=5)
+
+
+class TestEndToEndRetrieval:
+    """Full pipeline: keyword retrieval → ranking → tiered assembly."""
+
+    async def test_fresh_session_bounded_output(
+        self, large_registry_template, retriever_for, make_pipeline, ga_config
+    ):
+        """Phase 2: fresh session returns bounded tool set via fallback ladder.
+
+        Active set is computed by scoring/fallback, not session_manager seeding.
+        Result must be <= 20 direct tools (core invariant).
+        """
+        config = ga_config
+        registry = dict(large_registry_template)
+        retriever = retriever_for(config)
+
+        pipeline = make_pipeline(config, registry, retriever)
+
         tools = await pipeline.get_tools_for_list("new-session")
         # Phase 2: bounded output, at most 20 direct tools
         non_routing = [t for t in tools if t.name != "request_tool"]
         assert len(non_routing) <= 20
         assert len(non_routing) >= 1  # at least one tool
 
-    @pytest.mark.asyncio
-    async def test_disclosed_tools_ranked_and_tiered(self):
+    async def test_disclosed_tools_ranked_and_tiered(self, large_registry_template, retriever_for, make_pipeline):
         config = RetrievalConfig(
             enabled=True,
             top_k=10,
@@ -144,19 +208,10 @@ class TestEndToEndRetrieval:
             anchor_tools=["github__get_me"],
             rollout_stage="ga",
         )
-        registry = _build_large_registry()
-        retriever = KeywordRetriever(config)
-        retriever.rebuild_index(registry)
+        registry = dict(large_registry_template)
+        retriever = retriever_for(config)
 
-        pipeline = RetrievalPipeline(
-            retriever=retriever,
-            session_manager=SessionStateManager(config),
-            logger=NullLogger(),
-            config=config,
-            tool_registry=registry,
-            ranker=RelevanceRanker(),
-            assembler=TieredAssembler(),
-        )
+        pipeline = make_pipeline(config, registry, retriever)
 
         # Phase 2: active set computed by fallback ladder, not session_manager seeding
         tools = await pipeline.get_tools_for_list("s1")
@@ -168,40 +223,29 @@ class TestEndToEndRetrieval:
         for t in non_routing[:3]:
             assert t.description is not None
 
-    @pytest.mark.asyncio
-    async def test_repeated_calls_bounded(self):
+    @pytest.mark.slow
+    async def test_repeated_calls_bounded(
+        self, large_registry_template, retriever_for, make_pipeline, ga_config
+    ):
         """Phase 2: repeated calls to get_tools_for_list remain bounded.
 
         The active set is re-computed each turn via the fallback ladder.
         """
-        config = RetrievalConfig(
-            enabled=True,
-            top_k=15,
-            anchor_tools=["github__get_me"],
-            rollout_stage="ga",
-        )
-        registry = _build_large_registry()
-        retriever = KeywordRetriever(config)
-        retriever.rebuild_index(registry)
+        config = ga_config
+        registry = dict(large_registry_template)
+        retriever = retriever_for(config)
 
-        pipeline = RetrievalPipeline(
-            retriever=retriever,
-            session_manager=SessionStateManager(config),
-            logger=NullLogger(),
-            config=config,
-            tool_registry=registry,
-            ranker=RelevanceRanker(),
-            assembler=TieredAssembler(),
-        )
+        pipeline = make_pipeline(config, registry, retriever)
 
-        # Multiple calls: each should return bounded output
-        for i in range(3):
+        # First call opens the turn; the second crosses a turn boundary and
+        # re-computes the active set. Further calls take the same path.
+        for i in range(2):
             tools = await pipeline.get_tools_for_list("s1")
             non_routing = [t for t in tools if t.name != "request_tool"]
             assert len(non_routing) <= 20, f"Call {i}: too many direct tools"
 
-    @pytest.mark.asyncio
-    async def test_token_reduction_with_tiering(self):
+    @pytest.mark.slow
+    async def test_token_reduction_with_tiering(self, large_registry_template, retriever_for, make_pipeline):
         """Tiered output should be measurably smaller than full output for 10+ tools."""
         config = RetrievalConfig(
             enabled=True,
@@ -209,33 +253,27 @@ class TestEndToEndRetrieval:
             full_description_count=3,
             anchor_tools=["github__get_me"],
         )
-        registry = _build_large_registry()  # 18 tools
-        retriever = KeywordRetriever(config)
-        retriever.rebuild_index(registry)
+        registry = dict(large_registry_template)  # 18 tools
+        retriever = retriever_for(config)
 
-        pipeline = RetrievalPipeline(
-            retriever=retriever,
-            session_manager=SessionStateManager(config),
-            logger=NullLogger(),
-            config=config,
-            tool_registry=registry,
-            ranker=RelevanceRanker(),
-            assembler=TieredAssembler(),
-        )
+        pipeline = make_pipeline(config, registry, retriever)
 
         tiered_tools = await pipeline.get_tools_for_list("s1")
-        tiered_size = sum(len(json.dumps(t.model_dump())) for t in tiered_tools)
+        tiered_size = sum(_approx_size(t) for t in tiered_tools)
 
         # Compare with full-description versions
-        full_size = sum(len(json.dumps(m.tool.model_dump())) for m in registry.values())
+        full_size = sum(_approx_size(m.tool) for m in registry.values())
 
         # Tiered should be smaller (at least some reduction from summary tier)
         assert tiered_size <= full_size
 
-    @pytest.mark.asyncio
-    async def test_disabled_returns_all(self):
+    async def test_disabled_returns_all(self, large_registry_template):
         config = RetrievalConfig(enabled=False)
-        registry = _build_large_registry()
+        # Passthrough doesn't depend on registry size; two tools across servers suffice
+        registry = {
+            key: large_registry_template[key]
+            for key in ("github__get_me", "exa__search")
+        }
 
         pipeline = RetrievalPipeline(
             retriever=KeywordRetriever(config),
@@ -252,12 +290,10 @@ class TestEndToEndRetrieval:
 class TestKeywordRetrieverIsolation:
     """Verify KeywordRetriever alone scores correctly."""
 
-    @pytest.mark.asyncio
-    async def test_github_query_scores_github_higher(self):
-        config = RetrievalConfig(enabled=True, top_k=5)
-        registry = _build_large_registry()
-        retriever = KeywordRetriever(config)
-        retriever.rebuild_index(registry)
+    async def test_github_query_scores_github_higher(self, large_registry_template, retriever_for, top5_config):
+        config = top5_config
+        registry = dict(large_registry_template)
+        retriever = retriever_for(config)
 
         from src.multimcp.retrieval.models import RetrievalContext
 
@@ -267,12 +303,10 @@ class TestKeywordRetrieverIsolation:
         top_names = [r.tool_mapping.tool.name for r in results[:3]]
         assert "search_repositories" in top_names
 
-    @pytest.mark.asyncio
-    async def test_obsidian_query_scores_obsidian_higher(self):
-        config = RetrievalConfig(enabled=True, top_k=5)
-        registry = _build_large_registry()
-        retriever = KeywordRetriever(config)
-        retriever.rebuild_index(registry)
+    async def test_obsidian_query_scores_obsidian_higher(self, large_registry_template, retriever_for, top5_config):
+        config = top5_config
+        registry = dict(large_registry_template)
+        retriever = retriever_for(config)
 
         from src.multimcp.retrieval.models import RetrievalContext
 
@@ -14,7 +14,7 @@ Covers code paths not exercised by the existing test suite:
 """
 
 import pytest
-from unittest.mock import MagicMock
+from types import SimpleNamespace
 from mcp import types
 
 from src.multimcp.retrieval.keyword import KeywordRetriever, _tokenize
@@ -47,12 +47,9 @@ def _make_tool(name: str, desc: str = "A tool", props: dict = None) -> types.Too
     )
 
 
-def _make_mapping(server: str, tool: types.Tool):
-    m = MagicMock()
-    m.server_name = server
-    m.tool = tool
-    m.client = MagicMock()
-    return m
+def _make_mapping(server: str, tool: types.Tool) -> SimpleNamespace:
+    """ToolMapping stand-in; retrieval only reads server_name and tool."""
+    return SimpleNamespace(server_name=server, tool=tool, client=None)
 
 
 def _make_scored(
@@ -73,26 +70,19 @@ def _make_scored(
 
 
 class TestTokenizeEdgeCases:
-    def test_empty_string(self):
-        assert _tokenize("") == []
-
-    def test_only_stopwords(self):
-        assert _tokenize("the a an and or but in on at to for") == []
-
-    def test_single_char_words_filtered(self):
-        """Words of length 1 should be filtered out."""
-        assert _tokenize("I a x") == []
-
-    def test_underscore_splitting(self):
-        tokens = _tokenize("get_file_contents")
-        assert "get" in tokens
-        assert "file" in tokens
-        assert "contents" in tokens
-
-    def test_mixed_case(self):
-        tokens = _tokenize("GitHub_Search")
-        assert "github" in tokens
-        assert "search" in tokens
+    @pytest.mark.parametrize("text,expected", [
+        ("", []),
+        ("the a an and or but in on at to for", []),
+        ("I a x", []),  # Words of length 1 are filtered out
+        ("get_file_contents", ["get", "file", "contents"]),
+        ("GitHub_Search", ["github", "search"]),
+    ], ids=["empty", "only_stopwords", "single_chars", "underscore_split", "mixed_case"])
+    def test_tokenize(self, text, expected):
+        tokens = _tokenize(text)
+        if not expected:
+            assert tokens == []
+        for token in expected:
+            assert token in tokens
 
 
 # ---------------------------------------------------------------------------
@@ -109,8 +99,7 @@ class TestKeywordRetrieverEdgeCases:
         assert retriever._tool_tokens == {}
         assert retriever._idf == {}
 
-    @pytest.mark.asyncio
-    async def test_retrieve_candidates_not_in_index(self):
+    def test_retrieve_candidates_not_in_index(self):
         """Candidates whose key isn't in the index should be skipped."""
         config = RetrievalConfig(enabled=True, top_k=5)
         retriever = KeywordRetriever(config)
@@ -119,12 +108,11 @@ class TestKeywordRetrieverEdgeCases:
 
         ctx = RetrievalContext(session_id="s1", query="search")
         mapping = _make_mapping("unknown", _make_tool("search"))
-        results = await retriever.retrieve(ctx, [mapping])
+        results = retriever._retrieve_impl(ctx, [mapping])
         # Candidate not in index → skipped
         assert results == []
 
-    @pytest.mark.asyncio
-    async def test_retrieve_empty_query(self):
+    def test_retrieve_empty_query(self):
         """Empty query should give all candidates score 0.5."""
         config = RetrievalConfig(enabled=True, top_k=5)
         retriever = KeywordRetriever(config)
@@ -133,12 +121,11 @@ class TestKeywordRetrieverEdgeCases:
         retriever.rebuild_index(registry)
 
         ctx = RetrievalContext(session_id="s1", query="")
-        results = await retriever.retrieve(ctx, list(registry.values()))
+        results = retriever._retrieve_impl(ctx, list(registry.values()))
         assert len(results) == 1
         assert results[0].score == 0.5
 
-    @pytest.mark.asyncio
-    async def test_retrieve_tool_with_none_description(self):
+    def test_retrieve_tool_with_none_description(self):
         """Tools with None description should still be indexed and scored."""
         config = RetrievalConfig(enabled=True, top_k=5)
         retriever = KeywordRetriever(config)
@@ -153,7 +140,7 @@ class TestKeywordRetrieverEdgeCases:
         retriever.rebuild_index(registry)
 
         ctx = RetrievalContext(session_id="s1", query="search")
-        results = await retriever.retrieve(ctx, list(registry.values()))
+        results = retriever._retrieve_impl(ctx, list(registry.values()))
         assert len(results) == 1
         assert results[0].score > 0  # Name match should score > 0
 
@@ -181,28 +168,15 @@ class TestKeywordRetrieverEdgeCases:
 
 
 class TestGetSpecificityEdgeCases:
-    def test_non_dict_schema(self):
-        """inputSchema that isn't a dict should return 0."""
+    @pytest.mark.parametrize("schema", [
+        "not-a-dict",
+        None,
+        {"properties": "not-a-dict"},
+        {"type": "object"},
+    ], ids=["non_dict_schema", "none_schema", "properties_not_dict", "missing_properties_key"])
+    def test_malformed_schema_returns_zero(self, schema):
         scored = _make_scored("s", "t", 1.0)
-        scored.tool_mapping.tool.inputSchema = "not-a-dict"
-        assert _get_specificity(scored) == 0
-
-    def test_none_schema(self):
-        """inputSchema that is None should return 0."""
-        scored = _make_scored("s", "t", 1.0)
-        scored.tool_mapping.tool.inputSchema = None
-        assert _get_specificity(scored) == 0
-
-    def test_properties_not_dict(self):
-        """properties field that isn't a dict should return 0."""
-        scored = _make_scored("s", "t", 1.0)
-        scored.tool_mapping.tool.inputSchema = {"properties": "not-a-dict"}
-        assert _get_specificity(scored) == 0
-
-    def test_missing_properties_key(self):
-        """Schema without 'properties' key should return 0."""
-        scored = _make_scored("s", "t", 1.0)
-        scored.tool_mapping.tool.inputSchema = {"type": "object"}
+        scored.tool_mapping.tool.inputSchema = schema
         assert _get_specificity(scored) == 0
 
     def test_schema_with_properties(self):
@@ -217,21 +191,17 @@ class TestGetSpecificityEdgeCases:
 
 
 class TestTruncateDescriptionEdgeCases:
-    def test_empty_string(self):
-        assert _truncate_description("") == ""
-
-    def test_short_string(self):
-        assert _truncate_description("Short desc.") == "Short desc."
-
-    def test_exactly_at_max(self):
-        """String at exactly _MAX_SUMMARY_CHARS should not be truncated."""
-        desc = "x" * 80
-        assert _truncate_description(desc) == desc
-
-    def test_first_sentence_within_limit(self):
-        desc = "First sentence. This is a much longer second sentence that pushes us well beyond the 80 char limit."
-        result = _truncate_description(desc)
-        assert result == "First sentence."
+    @pytest.mark.parametrize("desc,expected", [
+        ("", ""),
+        ("Short desc.", "Short desc."),
+        ("x" * 80, "x" * 80),  # Exactly _MAX_SUMMARY_BYTES is not truncated
+        (
+            "First sentence. This is a much longer second sentence that pushes us well beyond the 80 char limit.",
+            "First sentence.",
+        ),
+    ], ids=["empty", "short", "exactly_at_max", "first_sentence_within_limit"])
+    def test_truncate(self, desc, expected):
+        assert _truncate_description(desc) == expected
 
     def test_long_first_sentence(self):
         """If first sentence is longer than limit, fall back to char truncation."""
@@ -240,6 +210,17 @@ class TestTruncateDescriptionEdgeCases:
         assert len(result) <= 81  # 80 chars + ellipsis
         assert result.endswith("…")
 
+    @pytest.mark.parametrize("desc", [
+        "é" * 60,  # 60 chars, 120 bytes
+        "搜索" * 20 + "。更多说明。",  # no ASCII sentence boundary
+        "Ünïcödé sentence. " * 5,
+    ], ids=["latin", "cjk", "sentence"])
+    def test_non_ascii_truncated_by_bytes(self, desc):
+        """The budget counts UTF-8 bytes, so multibyte text is cut shorter, never mid-character."""
+        result = _truncate_description(desc)
+        assert len(result.removesuffix("…").encode("utf-8")) <= 80
+        assert desc.startswith(result.removesuffix("…"))
+
 
 # ---------------------------------------------------------------------------
 # _strip_descriptions edge cases
@@ -254,9 +235,7 @@ class TestStripDescriptionsEdgeCases:
 
     def test_strips_top_level_description(self):
         schema = {"type": "string", "description": "A string value"}
-        result = _strip_descriptions(schema)
-        assert "description" not in result
-        assert result["type"] == "string"
+        assert _strip_descriptions(schema) == {"type": "string"}
 
     def test_strips_nested_properties(self):
         schema = {
@@ -266,9 +245,14 @@ class TestStripDescriptionsEdgeCases:
                 "age": {"type": "integer", "description": "The age"},
             },
         }
-        result = _strip_descriptions(schema)
-        assert "description" not in result["properties"]["name"]
-        assert "description" not in result["properties"]["age"]
+        expected = {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "age": {"type": "integer"},
+            },
+        }
+        assert _strip_descriptions(schema) == expected
 
     def test_strips_through_items(self):
         """Items key should be recursively processed."""
@@ -282,9 +266,16 @@ class TestStripDescriptionsEdgeCases:
                 },
             },
         }
-        result = _strip_descriptions(schema)
-        assert "description" not in result["items"]
-        assert "description" not in result["items"]["properties"]["id"]
+        expected = {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer"},
+                },
+            },
+        }
+        assert _strip_descriptions(schema) == expected
 
     def test_handles_empty_dict(self):
         assert _strip_descriptions({}) == {}
@@ -382,8 +373,8 @@ class TestNamespaceBoostsEdgeCases:
 class TestPipelineEnabledWithRankerAssembler:
     """Test the full enabled pipeline path with ranker and assembler wired."""
 
-    @pytest.mark.asyncio
-    async def test_enabled_with_ranker_assembler(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_enabled_with_ranker_assembler(self, seed_session):
         """When ranker+assembler are provided, pipeline should rank and tier."""
         config = RetrievalConfig(
             enabled=True,
@@ -412,15 +403,14 @@ class TestPipelineEnabledWithRankerAssembler:
         )
 
         # Disclose second tool
-        pipeline.session_manager.get_or_create_session("s1")
-        pipeline.session_manager.add_tools("s1", ["exa__search"])
+        seed_session(pipeline, "s1", ["exa__search"])
 
         tools = await pipeline.get_tools_for_list("s1")
         assert len(tools) == 2
         # First tool should be full tier (has complete description)
         assert tools[0].description is not None
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_enabled_no_ranker_returns_raw_tools(self):
         """Without ranker+assembler, enabled path returns raw Tool objects."""
         config = RetrievalConfig(
@@ -1,192 +1,139 @@
 """Integration tests for retrieval pipeline in MCPProxyServer."""
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from functools import lru_cache
+from types import SimpleNamespace
+from unittest.mock import ANY, AsyncMock, Mock
 from mcp import types
-from src.multimcp.mcp_proxy import MCPProxyServer
+from src.multimcp.mcp_proxy import ToolMapping
 from src.multimcp.retrieval.pipeline import RetrievalPipeline
 from src.multimcp.retrieval.base import PassthroughRetriever
 from src.multimcp.retrieval.logging import NullLogger
 from src.multimcp.retrieval.session import SessionStateManager
 from src.multimcp.retrieval.models import RetrievalConfig
 
+# Share one event loop across the module instead of one per test.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
 
+
+# Stateless collaborators, shared by every pipeline built in this module.
+_RETRIEVER = PassthroughRetriever()
+_LOGGER = NullLogger()
+
+# Shared input; pydantic validates dict fields into a fresh dict per Tool.
+_EMPTY_SCHEMA = {"type": "object", "properties": {}}
+
+
+# Tools are read-only here, so each distinct one is validated once and shared.
+@lru_cache(maxsize=None)
 def _make_tool(name: str) -> types.Tool:
     return types.Tool(
         name=name,
         description="test",
-        inputSchema={"type": "object", "properties": {}},
+        inputSchema=_EMPTY_SCHEMA,
     )
 
 
-class TestProxyPipelineIntegration:
-    """Test MCPProxyServer integration with retrieval pipeline."""
+_OK_RESULT = types.CallToolResult(
+    content=[types.TextContent(type="text", text="ok")],
+    isError=False,
+)
 
-    def _make_proxy(self, pipeline=None):
-        """Create a minimal MCPProxyServer bypassing __init__ for unit testing."""
-        proxy = MCPProxyServer.__new__(MCPProxyServer)
-        proxy.tool_to_server = {}
-        proxy.prompt_to_server = {}
-        proxy.resource_to_server = {}
-        proxy._resource_objects = {}
-        proxy.client_manager = MagicMock()
-        proxy.trigger_manager = MagicMock()
-        proxy.trigger_manager.check_and_enable = AsyncMock(return_value=[])
-        proxy.audit_logger = MagicMock()
-        proxy.logger = MagicMock()
-        proxy._register_lock = MagicMock()
-        proxy._register_lock.__aenter__ = AsyncMock()
-        proxy._register_lock.__aexit__ = AsyncMock()
-        proxy.retrieval_pipeline = pipeline
-        # Phase 8: session tracking attributes (required by _get_session_id)
-        proxy._server_session = MagicMock() if pipeline is not None else None
-        proxy._session_ids = {}
-        proxy._last_tool_list_hash = {}
-        return proxy
-
-    @pytest.mark.asyncio
-    async def test_list_tools_without_pipeline(self):
-        """Without pipeline (None), _list_tools returns all tools including cached."""
-        proxy = self._make_proxy(pipeline=None)
-        from src.multimcp.mcp_proxy import ToolMapping
-        proxy.tool_to_server["github__get_me"] = ToolMapping(
-            server_name="github",
-            client=MagicMock(),
-            tool=_make_tool("github__get_me"),
-        )
-        result = await proxy._list_tools(None)
-        assert len(result.root.tools) == 1
 
-    @pytest.mark.asyncio
-    async def test_list_tools_with_disabled_pipeline(self):
-        """Disabled pipeline returns all tools (same as no pipeline)."""
-        config = RetrievalConfig(enabled=False)
-        pipeline = RetrievalPipeline(
-            retriever=PassthroughRetriever(),
-            session_manager=SessionStateManager(config),
-            logger=NullLogger(),
-            config=config,
-            tool_registry={},
-        )
-        proxy = self._make_proxy(pipeline=pipeline)
-        from src.multimcp.mcp_proxy import ToolMapping
-        proxy.tool_to_server["github__get_me"] = ToolMapping(
-            server_name="github",
-            client=MagicMock(),
-            tool=_make_tool("github__get_me"),
-        )
-        # Point pipeline's registry to proxy's dict (as done in multi_mcp.py)
-        pipeline.tool_registry = proxy.tool_to_server
-        result = await proxy._list_tools(None)
-        assert len(result.root.tools) == 1
-
-    @pytest.mark.asyncio
-    async def test_list_tools_with_enabled_pipeline_bounded(self):
-        """Enabled pipeline returns bounded tool set for fresh session.
-
-        Phase 2: active set computed by fallback ladder, not anchor seeding.
-        Small registry (2 tools) returns all available tools directly.
-        """
-        config = RetrievalConfig(
-            enabled=True,
-            anchor_tools=["github__get_me"],
-            rollout_stage="ga",
-        )
-        pipeline = RetrievalPipeline(
-            retriever=PassthroughRetriever(),
-            session_manager=SessionStateManager(config),
-            logger=NullLogger(),
-            config=config,
-            tool_registry={},
-        )
-        proxy = self._make_proxy(pipeline=pipeline)
-        from src.multimcp.mcp_proxy import ToolMapping
+class _FakeClient:
+    """Backend client stand-in whose only used method always succeeds."""
+
+    async def call_tool(self, name, arguments=None):
+        return _OK_RESULT
+
+
+def _make_proxy(proxy_factory, pipeline=None, with_tool=False):
+    """Create a minimal MCPProxyServer bypassing __init__ for unit testing.
+
+    with_tool registers a connected github__get_me whose backend call succeeds.
+    """
+    proxy = proxy_factory()
+    proxy.retrieval_pipeline = pipeline
+    # Phase 8: session tracking attributes (required by _get_session_id)
+    proxy._server_session = Mock() if pipeline is not None else None
+
+    if with_tool:
         proxy.tool_to_server["github__get_me"] = ToolMapping(
             server_name="github",
-            client=MagicMock(),
+            client=_FakeClient(),
             tool=_make_tool("github__get_me"),
         )
-        proxy.tool_to_server["exa__search"] = ToolMapping(
-            server_name="exa",
-            client=MagicMock(),
-            tool=_make_tool("exa__search"),
-        )
-        pipeline.tool_registry = proxy.tool_to_server
+    return proxy
+
+
+class TestProxyPipelineIntegration:
+    """Test MCPProxyServer integration with retrieval pipeline."""
+
+    @pytest.mark.parametrize("config,tool_keys", [
+        # Without pipeline (None), _list_tools returns all tools including cached
+        (None, ["github__get_me"]),
+        # Disabled pipeline returns all tools (same as no pipeline)
+        (RetrievalConfig(enabled=False), ["github__get_me"]),
+        # Phase 2: active set computed by fallback ladder, not anchor seeding;
+        # a small registry (2 tools) returns all available tools directly
+        (
+            RetrievalConfig(enabled=True, anchor_tools=["github__get_me"], rollout_stage="ga"),
+            ["github__get_me", "exa__search"],
+        ),
+    ], ids=["without_pipeline", "disabled_pipeline", "enabled_pipeline_bounded"])
+    async def test_list_tools(self, proxy_factory, config, tool_keys):
+        pipeline = None
+        if config is not None:
+            pipeline = RetrievalPipeline(
+                retriever=_RETRIEVER,
+                session_manager=SessionStateManager(config),
+                logger=_LOGGER,
+                config=config,
+                tool_registry={},
+            )
+        proxy = _make_proxy(proxy_factory, pipeline=pipeline)
+        for key in tool_keys:
+            proxy.tool_to_server[key] = ToolMapping(
+                server_name=key.split("__", 1)[0],
+                client=Mock(),
+                tool=_make_tool(key),
+            )
+        if pipeline is not None:
+            # Point pipeline's registry to proxy's dict (as done in multi_mcp.py)
+            pipeline.tool_registry = proxy.tool_to_server
         result = await proxy._list_tools(None)
-        # Phase 2: small registry (2 tools) → all tools returned
         non_routing = [t for t in result.root.tools if t.name != "request_tool"]
         assert len(non_routing) <= 20  # core invariant
-        assert len(non_routing) >= 1   # at least one tool
+        assert sorted(t.name for t in non_routing) == sorted(tool_keys)
 
-    @pytest.mark.asyncio
-    async def test_pipeline_attribute_exists_after_init(self):
+    async def test_pipeline_attribute_exists_after_init(self, proxy_factory):
         """MCPProxyServer must have retrieval_pipeline attribute."""
-        proxy = self._make_proxy()
+        proxy = _make_proxy(proxy_factory)
         assert hasattr(proxy, "retrieval_pipeline")
 
-    @pytest.mark.asyncio
-    async def test_pipeline_none_by_default_in_make_proxy(self):
+    async def test_pipeline_none_by_default_in_make_proxy(self, proxy_factory):
         """Our test helper sets pipeline=None by default."""
-        proxy = self._make_proxy()
+        proxy = _make_proxy(proxy_factory)
         assert proxy.retrieval_pipeline is None
 
 
 class TestCallToolPipelineNotification:
     """Test that _call_tool notifies pipeline after successful calls."""
 
-    def _make_proxy_with_tool(self, pipeline=None):
-        proxy = MCPProxyServer.__new__(MCPProxyServer)
-        proxy.tool_to_server = {}
-        proxy.prompt_to_server = {}
-        proxy.resource_to_server = {}
-        proxy._resource_objects = {}
-        proxy.client_manager = MagicMock()
-        proxy.trigger_manager = MagicMock()
-        proxy.trigger_manager.check_and_enable = AsyncMock(return_value=[])
-        proxy.audit_logger = MagicMock()
-        proxy.logger = MagicMock()
-        proxy._register_lock = MagicMock()
-        proxy._register_lock.__aenter__ = AsyncMock()
-        proxy._register_lock.__aexit__ = AsyncMock()
-        proxy.retrieval_pipeline = pipeline
-        # Phase 8: session tracking attributes required by _get_session_id
-        proxy._server_session = MagicMock() if pipeline is not None else None
-        proxy._session_ids = {}
-        proxy._last_tool_list_hash = {}
-
-        # Add a connected tool
-        from src.multimcp.mcp_proxy import ToolMapping
-        mock_client = MagicMock()
-        mock_result = MagicMock()
-        mock_result.content = [types.TextContent(type="text", text="ok")]
-        mock_result.isError = False
-        mock_client.call_tool = AsyncMock(return_value=mock_result)
-        proxy.tool_to_server["github__get_me"] = ToolMapping(
-            server_name="github",
-            client=mock_client,
-            tool=_make_tool("github__get_me"),
-        )
-        return proxy
-
-    @pytest.mark.asyncio
-    async def test_call_tool_notifies_pipeline(self):
+    async def test_call_tool_notifies_pipeline(self, proxy_factory):
         """on_tool_called should be invoked after a successful tool call."""
-        from unittest.mock import call, ANY
         config = RetrievalConfig(enabled=True)
         pipeline = RetrievalPipeline(
-            retriever=PassthroughRetriever(),
+            retriever=_RETRIEVER,
             session_manager=SessionStateManager(config),
-            logger=NullLogger(),
+            logger=_LOGGER,
             config=config,
             tool_registry={},
         )
         # Spy on on_tool_called
         pipeline.on_tool_called = AsyncMock(return_value=False)
 
-        proxy = self._make_proxy_with_tool(pipeline=pipeline)
-        req = MagicMock()
-        req.params = MagicMock()
-        req.params.name = "github__get_me"
-        req.params.arguments = {"foo": "bar"}
+        proxy = _make_proxy(proxy_factory, pipeline=pipeline, with_tool=True)
+        req = SimpleNamespace(params=SimpleNamespace(name="github__get_me", arguments={"foo": "bar"}))
 
         await proxy._call_tool(req)
         # Session ID is now a real UUID (not "default") — use ANY for matching
@@ -198,37 +145,29 @@ class TestCallToolPipelineNotification:
         assert actual_session_id != "default"
         assert len(actual_session_id) == 32
 
-    @pytest.mark.asyncio
-    async def test_call_tool_without_pipeline_still_works(self):
+    async def test_call_tool_without_pipeline_still_works(self, proxy_factory):
         """Tool calls work fine without any pipeline configured."""
-        proxy = self._make_proxy_with_tool(pipeline=None)
-        req = MagicMock()
-        req.params = MagicMock()
-        req.params.name = "github__get_me"
-        req.params.arguments = {}
+        proxy = _make_proxy(proxy_factory, pipeline=None, with_tool=True)
+        req = SimpleNamespace(params=SimpleNamespace(name="github__get_me", arguments={}))
 
         result = await proxy._call_tool(req)
         # Should succeed without errors
         assert result is not None
 
-    @pytest.mark.asyncio
-    async def test_pipeline_error_doesnt_break_tool_call(self):
+    async def test_pipeline_error_doesnt_break_tool_call(self, proxy_factory):
         """If pipeline.on_tool_called raises, tool call still succeeds."""
         config = RetrievalConfig(enabled=True)
         pipeline = RetrievalPipeline(
-            retriever=PassthroughRetriever(),
+            retriever=_RETRIEVER,
             session_manager=SessionStateManager(config),
-            logger=NullLogger(),
+            logger=_LOGGER,
             config=config,
             tool_registry={},
         )
         pipeline.on_tool_called = AsyncMock(side_effect=RuntimeError("pipeline broke"))
 
-        proxy = self._make_proxy_with_tool(pipeline=pipeline)
-        req = MagicMock()
-        req.params = MagicMock()
-        req.params.name = "github__get_me"
-        req.params.arguments = {}
+        proxy = _make_proxy(proxy_factory, pipeline=pipeline, with_tool=True)
+        req = SimpleNamespace(params=SimpleNamespace(name="github__get_me", arguments={}))
 
         # Should not raise — pipeline errors are caught
         result = await proxy._call_tool(req)
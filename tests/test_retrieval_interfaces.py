@@ -11,17 +11,13 @@ class TestToolRetrieverABC:
         with pytest.raises(TypeError):
             ToolRetriever()
 
-    @pytest.mark.asyncio
     async def test_passthrough_returns_all_candidates(self):
         retriever = PassthroughRetriever()
         candidates = [MagicMock() for _ in range(5)]
         ctx = RetrievalContext(session_id="test")
         results = await retriever.retrieve(ctx, candidates)
-        assert len(results) == 5
-        assert all(r.score == 1.0 for r in results)
-        assert all(r.tier == "full" for r in results)
+        assert [(r.score, r.tier) for r in results] == [(1.0, "full")] * 5
 
-    @pytest.mark.asyncio
     async def test_passthrough_preserves_references(self):
         """Each ScoredTool must hold a reference to the original ToolMapping."""
         retriever = PassthroughRetriever()
@@ -30,14 +26,12 @@ class TestToolRetrieverABC:
         results = await retriever.retrieve(ctx, [mock_mapping])
         assert results[0].tool_mapping is mock_mapping
 
-    @pytest.mark.asyncio
     async def test_passthrough_empty_candidates(self):
         retriever = PassthroughRetriever()
         ctx = RetrievalContext(session_id="test")
         results = await retriever.retrieve(ctx, [])
         assert results == []
 
-    @pytest.mark.asyncio
     async def test_passthrough_assigns_sequential_keys(self):
         retriever = PassthroughRetriever()
         candidates = [MagicMock() for _ in range(3)]
@@ -52,19 +46,16 @@ class TestRetrievalLoggerABC:
         with pytest.raises(TypeError):
             RetrievalLogger()
 
-    @pytest.mark.asyncio
     async def test_null_logger_log_retrieval_noop(self):
         logger = NullLogger()
         ctx = RetrievalContext(session_id="test")
         await logger.log_retrieval(ctx, [], 0.0)
 
-    @pytest.mark.asyncio
     async def test_null_logger_log_miss_noop(self):
         logger = NullLogger()
         ctx = RetrievalContext(session_id="test")
         await logger.log_retrieval_miss("tool", ctx)
 
-    @pytest.mark.asyncio
     async def test_null_logger_log_sequence_noop(self):
         logger = NullLogger()
         await logger.log_tool_sequence("s1", "a", "b")
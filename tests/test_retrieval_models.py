@@ -1,15 +1,20 @@
 """Tests for retrieval pipeline data models."""
 import pytest
+from dataclasses import FrozenInstanceError, asdict
+from types import SimpleNamespace
 from src.multimcp.retrieval.models import RetrievalConfig, RetrievalContext, ScoredTool
 
 
 class TestRetrievalContext:
     def test_minimal_creation(self):
         ctx = RetrievalContext(session_id="test-1")
-        assert ctx.session_id == "test-1"
-        assert ctx.query == ""
-        assert ctx.tool_call_history == []
-        assert ctx.server_hint is None
+        assert asdict(ctx) == {
+            "session_id": "test-1",
+            "query": "",
+            "tool_call_history": [],
+            "server_hint": None,
+            "query_mode": "env",
+        }
 
     def test_full_creation(self):
         ctx = RetrievalContext(
@@ -18,8 +23,13 @@ class TestRetrievalContext:
             tool_call_history=["github__get_me"],
             server_hint="github",
         )
-        assert ctx.query == "search repos"
-        assert ctx.server_hint == "github"
+        assert asdict(ctx) == {
+            "session_id": "s1",
+            "query": "search repos",
+            "tool_call_history": ["github__get_me"],
+            "server_hint": "github",
+            "query_mode": "env",
+        }
 
     def test_tool_call_history_is_mutable(self):
         ctx = RetrievalContext(session_id="s1")
@@ -37,18 +47,16 @@ class TestRetrievalContext:
 class TestScoredTool:
     def test_holds_reference_not_copy(self):
         """ScoredTool must hold a reference to ToolMapping, not a copy."""
-        from unittest.mock import MagicMock
-        mapping = MagicMock()
+        mapping = SimpleNamespace(server_name="github", tool=None, client=None)
         st = ScoredTool(tool_key="github__get_me", tool_mapping=mapping)
         assert st.tool_mapping is mapping
         assert st.score == 1.0
         assert st.tier == "full"
 
     def test_summary_tier(self):
-        from unittest.mock import MagicMock
         st = ScoredTool(
             tool_key="exa__search",
-            tool_mapping=MagicMock(),
+            tool_mapping=SimpleNamespace(server_name="exa", tool=None, client=None),
             score=0.7,
             tier="summary",
         )
@@ -59,11 +67,14 @@ class TestScoredTool:
 class TestRetrievalConfig:
     def test_defaults_disabled(self):
         config = RetrievalConfig()
-        assert config.enabled is False
-        # Phase 2: top_k default changed from 10 to 15 (source plan line 496)
-        assert config.top_k == 15
-        assert config.full_description_count == 3
-        assert config.anchor_tools == []
+        expected = {
+            "enabled": False,
+            # Phase 2: top_k default changed from 10 to 15 (source plan line 496)
+            "top_k": 15,
+            "full_description_count": 3,
+            "anchor_tools": (),
+        }
+        assert expected.items() <= asdict(config).items()
 
     def test_custom_values(self):
         config = RetrievalConfig(
@@ -72,14 +83,18 @@ class TestRetrievalConfig:
             full_description_count=2,
             anchor_tools=["github__get_me"],
         )
-        assert config.enabled is True
-        assert config.top_k == 5
-        assert config.full_description_count == 2
-        assert config.anchor_tools == ["github__get_me"]
+        expected = {
+            "enabled": True,
+            "top_k": 5,
+            "full_description_count": 2,
+            "anchor_tools": ("github__get_me",),
+        }
+        assert expected.items() <= asdict(config).items()
 
-    def test_separate_instances_dont_share_anchor_lists(self):
-        """Each config must have its own anchor_tools list."""
-        c1 = RetrievalConfig()
-        c2 = RetrievalConfig()
-        c1.anchor_tools.append("only_in_c1")
-        assert c1.anchor_tools != c2.anchor_tools
+    def test_config_is_immutable(self):
+        """Configs are frozen; anchor lists are stored as tuples."""
+        config = RetrievalConfig(anchor_tools=["github__get_me"])
+        assert config.anchor_tools == ("github__get_me",)
+        with pytest.raises(FrozenInstanceError):
+            config.enabled = True
+        assert hash(config) == hash(RetrievalConfig(anchor_tools=("github__get_me",)))
@@ -4,13 +4,16 @@ from src.multimcp.retrieval.session import SessionStateManager
 from src.multimcp.retrieval.models import RetrievalConfig
 
 
+# Config is only read by the manager, so one instance serves every test.
+_CONFIG = RetrievalConfig(
+    enabled=True,
+    anchor_tools=["github__get_me"],
+)
+
+
 class TestSessionStateManager:
     def setup_method(self):
-        self.config = RetrievalConfig(
-            enabled=True,
-            anchor_tools=["github__get_me"],
-        )
-        self.mgr = SessionStateManager(self.config)
+        self.mgr = SessionStateManager(_CONFIG)
 
     def test_new_session_has_anchors(self):
         tools = self.mgr.get_or_create_session("s1")
@@ -82,21 +85,23 @@ class TestSessionStateManager:
         assert "tool_a" in self.mgr.get_active_tools("s1")
         assert "tool_a" not in self.mgr.get_active_tools("s2")
 
-    def test_get_or_create_returns_copy(self):
+    def test_get_or_create_returns_immutable_snapshot(self):
         """Callers must not be able to mutate internal state via returned set."""
         self.mgr.get_or_create_session("s1")
         returned = self.mgr.get_or_create_session("s1")
-        returned.add("injected_tool")
-        actual = self.mgr.get_active_tools("s1")
-        assert "injected_tool" not in actual
+        assert isinstance(returned, frozenset)
+        with pytest.raises(AttributeError):
+            returned.add("injected_tool")
+        assert "injected_tool" not in self.mgr.get_active_tools("s1")
 
-    def test_get_active_tools_returns_copy(self):
+    def test_get_active_tools_returns_immutable_snapshot(self):
         """Callers must not be able to mutate internal state via returned set."""
         self.mgr.get_or_create_session("s1")
         returned = self.mgr.get_active_tools("s1")
-        returned.add("injected_tool")
-        actual = self.mgr.get_active_tools("s1")
-        assert "injected_tool" not in actual
+        assert isinstance(returned, frozenset)
+        with pytest.raises(AttributeError):
+            returned.add("injected_tool")
+        assert "injected_tool" not in self.mgr.get_active_tools("s1")
 
     def test_no_anchors_config(self):
         """Session with no anchor tools starts empty."""
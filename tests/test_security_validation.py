@@ -1,57 +1,44 @@
 """Tests for security validation: env vars, command allowlist, SSRF protection."""
 import os
+import re
+import urllib.parse
 import pytest
 import unittest.mock as mock
-from src.multimcp.mcp_client import _filter_env, _validate_command, _validate_url, PROTECTED_ENV_VARS
+from src.multimcp.mcp_client import (
+    _HTTP_URL_RE,
+    _filter_env,
+    _get_allowed_commands,
+    _validate_command,
+    _validate_url,
+    DEFAULT_ALLOWED_COMMANDS,
+    PROTECTED_ENV_VARS,
+)
 
 
 class TestEnvVarProtection:
     """Verify PROTECTED_ENV_VARS blocks all dangerous environment variables."""
 
-    def test_blocks_node_options(self):
-        """NODE_OPTIONS allows --require to execute arbitrary code in Node.js."""
-        env = {"NODE_OPTIONS": "--require /tmp/evil.js", "SAFE_VAR": "ok"}
-        filtered = _filter_env(env)
-        assert "NODE_OPTIONS" not in filtered
-        assert "SAFE_VAR" in filtered
-
-    def test_blocks_node_path(self):
-        """NODE_PATH redirects module resolution."""
-        env = {"NODE_PATH": "/tmp/evil_modules"}
-        filtered = _filter_env(env)
-        assert "NODE_PATH" not in filtered
-
-    def test_blocks_bash_env(self):
-        """BASH_ENV is executed on non-interactive bash startup."""
-        env = {"BASH_ENV": "/tmp/evil.sh"}
-        filtered = _filter_env(env)
-        assert "BASH_ENV" not in filtered
-
-    def test_blocks_env(self):
-        """ENV is executed on sh startup."""
-        env = {"ENV": "/tmp/evil.sh"}
-        filtered = _filter_env(env)
-        assert "ENV" not in filtered
-
-    def test_blocks_dyld_insert_libraries(self):
-        """DYLD_INSERT_LIBRARIES is macOS equivalent of LD_PRELOAD."""
-        env = {"DYLD_INSERT_LIBRARIES": "/tmp/evil.dylib"}
-        filtered = _filter_env(env)
-        assert "DYLD_INSERT_LIBRARIES" not in filtered
-
-    def test_blocks_http_proxy(self):
-        """http_proxy can redirect all HTTP traffic through attacker proxy."""
-        env = {"http_proxy": "http://evil.com:8080", "https_proxy": "http://evil.com:8080"}
-        filtered = _filter_env(env)
-        assert "http_proxy" not in filtered
-        assert "https_proxy" not in filtered
-
-    def test_blocks_existing_protected_vars(self):
-        """Verify all originally-protected vars are still blocked."""
-        for var in ["PATH", "LD_PRELOAD", "LD_LIBRARY_PATH", "HOME", "USER", "PYTHONPATH", "PYTHONHOME"]:
-            env = {var: "/malicious"}
-            filtered = _filter_env(env)
-            assert var not in filtered, f"{var} should be blocked"
+    @pytest.mark.parametrize("var,val", [
+        ("NODE_OPTIONS", "--require /tmp/evil.js"),  # --require runs arbitrary code in Node.js
+        ("NODE_PATH", "/tmp/evil_modules"),          # redirects module resolution
+        ("BASH_ENV", "/tmp/evil.sh"),                # executed on non-interactive bash startup
+        ("ENV", "/tmp/evil.sh"),                     # executed on sh startup
+        ("DYLD_INSERT_LIBRARIES", "/tmp/evil.dylib"),  # macOS equivalent of LD_PRELOAD
+        ("http_proxy", "http://evil.com:8080"),      # reroutes HTTP through an attacker proxy
+        ("https_proxy", "http://evil.com:8080"),
+        # Originally-protected vars must still be blocked
+        ("PATH", "/malicious"),
+        ("LD_PRELOAD", "/malicious"),
+        ("LD_LIBRARY_PATH", "/malicious"),
+        ("HOME", "/malicious"),
+        ("USER", "/malicious"),
+        ("PYTHONPATH", "/malicious"),
+        ("PYTHONHOME", "/malicious"),
+    ])
+    def test_blocks_protected_var(self, var, val):
+        """Dangerous vars are dropped; neighbouring safe vars pass through."""
+        filtered = _filter_env({var: val, "SAFE_VAR": "ok"})
+        assert filtered == {"SAFE_VAR": "ok"}
 
     def test_allows_safe_vars(self):
         """Safe application vars should pass through."""
@@ -73,8 +60,9 @@ class TestCommandValidationSecurity:
 
     def test_rejects_unknown_command(self):
         """Commands not in allowlist should be rejected."""
-        with pytest.raises(ValueError, match="not in allowed"):
+        with pytest.raises(ValueError) as exc_info:
             _validate_command("malicious_binary")
+        assert "not in allowed" in str(exc_info.value)
 
     def test_allows_full_path_to_known_command(self):
         """Full paths to known commands should pass — basename is in allowlist."""
@@ -97,11 +85,10 @@ class TestCommandValidationSecurity:
 
     def test_rejects_full_path_to_unknown_nonexistent_command(self):
         """Full paths to unknown basenames that don't exist on disk are rejected."""
-        with pytest.raises(ValueError, match="not in allowed commands"):
-            _validate_command("/tmp/evil_binary")
-
-        with pytest.raises(ValueError, match="not in allowed commands"):
-            _validate_command("/nonexistent/path/to/malware")
+        for command in ("/tmp/evil_binary", "/nonexistent/path/to/malware"):
+            with pytest.raises(ValueError) as exc_info:
+                _validate_command(command)
+            assert "not in allowed commands" in str(exc_info.value)
 
     def test_discover_stdio_calls_validate_command(self):
         """Verify _validate_command is invoked in the _discover_stdio code path.
@@ -136,37 +123,38 @@ class TestCommandValidationSecurity:
         _validate_command("/bin/sh")
         _validate_command("/usr/bin/env bash"  .split()[0])  # just 'bash'
 
-    def test_full_path_executable_file_allowed(self):
+    def test_full_path_executable_file_allowed(self, tmp_path):
         """Full path to an executable file the user configured should pass,
         even if its basename isn't in the standard allowlist."""
-        import tempfile
-        import stat
-        with tempfile.NamedTemporaryFile(suffix="_server.sh", delete=False) as f:
-            f.write(b"#!/bin/bash\necho hello")
-            f.flush()
-            os.chmod(f.name, stat.S_IRWXU)
-            try:
-                _validate_command(f.name)  # Should pass — exists and is executable
-            finally:
-                os.unlink(f.name)
-
-    def test_full_path_nonexecutable_file_rejected(self):
+        script = tmp_path / "my_server.sh"
+        script.write_bytes(b"#!/bin/bash\necho hello")
+        script.chmod(0o700)
+        _validate_command(str(script))  # Should pass — exists and is executable
+
+    def test_full_path_nonexecutable_file_rejected(self, tmp_path):
         """Full path to a non-executable file should be rejected."""
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix="_notexec", delete=False) as f:
-            f.write(b"not executable")
-            f.flush()
-            os.chmod(f.name, 0o644)  # Not executable
-            try:
-                with pytest.raises(ValueError):
-                    _validate_command(f.name)
-            finally:
-                os.unlink(f.name)
+        script = tmp_path / "server_notexec"
+        script.write_bytes(b"not executable")
+        script.chmod(0o644)  # Not executable
+        with pytest.raises(ValueError):
+            _validate_command(str(script))
+
+    def test_exec_bit_for_another_user_rejected(self, tmp_path):
+        """An exec bit that doesn't apply to this process (e.g. 0o701 owned by
+        someone else) must not count; os.access decides, not the raw mode bits."""
+        script = tmp_path / "others_server"
+        script.write_bytes(b"#!/bin/sh\n")
+        script.chmod(0o701)
+        with mock.patch("src.multimcp.mcp_client.os.access", return_value=False) as access:
+            with pytest.raises(ValueError):
+                _validate_command(str(script))
+        access.assert_called_once_with(str(script), os.X_OK)
 
     def test_error_message_includes_env_var_hint(self):
         """Error message should tell user how to extend the allowlist."""
-        with pytest.raises(ValueError, match="MULTI_MCP_ALLOWED_COMMANDS"):
+        with pytest.raises(ValueError) as exc_info:
             _validate_command("custom_tool")
+        assert "MULTI_MCP_ALLOWED_COMMANDS" in str(exc_info.value)
 
     def test_env_var_overrides_allowlist(self):
         """MULTI_MCP_ALLOWED_COMMANDS env var replaces (not extends) the default list."""
@@ -180,27 +168,52 @@ class TestCommandValidationSecurity:
         finally:
             del os.environ["MULTI_MCP_ALLOWED_COMMANDS"]
 
+    def test_allowlist_parsed_once_per_env_value(self, monkeypatch):
+        """The parsed allowlist is reused until MULTI_MCP_ALLOWED_COMMANDS changes."""
+        monkeypatch.setenv("MULTI_MCP_ALLOWED_COMMANDS", "custom_tool")
+        first = _get_allowed_commands()
+        assert _get_allowed_commands() is first
+        monkeypatch.setenv("MULTI_MCP_ALLOWED_COMMANDS", "other_tool")
+        assert _get_allowed_commands() == {"other_tool"}
+        monkeypatch.delenv("MULTI_MCP_ALLOWED_COMMANDS")
+        assert _get_allowed_commands() == DEFAULT_ALLOWED_COMMANDS
 
-import pytest
-import asyncio
-from unittest.mock import patch, AsyncMock
+
+from unittest.mock import AsyncMock
 
 
+# asyncio_mode = "auto" collects these; one loop is shared per class.
+@pytest.mark.asyncio(loop_scope="class")
 class TestURLValidation:
     """Verify _validate_url scheme/hostname/DNS validation."""
 
-    @pytest.mark.asyncio
     async def test_allows_public_ip(self):
         """Public IPs should pass validation."""
-        with patch("asyncio.get_running_loop") as mock_loop:
-            mock_loop.return_value.getaddrinfo = AsyncMock(
-                return_value=[(None, None, None, None, ("8.8.8.8", 0))]
-            )
-            # Should not raise
-            await _validate_url("http://example.com:8080/api")
-            mock_loop.return_value.getaddrinfo.assert_awaited_once()
-
-    @pytest.mark.asyncio
+        resolver = AsyncMock(return_value=[(None, None, None, None, ("8.8.8.8", 0))])
+        # Should not raise
+        await _validate_url("http://example.com:8080/api", resolver=resolver)
+        resolver.assert_awaited_once()
+
+    async def test_rejects_host_rebound_to_link_local(self):
+        """Each validation re-resolves, so a host re-pointed at metadata is caught."""
+        resolver = AsyncMock(side_effect=[
+            [(None, None, None, None, ("8.8.8.8", 0))],
+            [(None, None, None, None, ("169.254.169.254", 0))],
+        ])
+        await _validate_url("http://example.com/a", resolver=resolver)
+        with pytest.raises(ValueError, match="link-local"):
+            await _validate_url("http://example.com/b", resolver=resolver)
+        assert resolver.await_count == 2
+
+    @pytest.mark.parametrize("ip", ["169.254.169.254", "fe80::1"])
+    async def test_rejects_link_local(self, ip):
+        """Link-local targets (cloud metadata, IPv6 fe80::/10) are SSRF-blocked."""
+        resolver = AsyncMock(return_value=[(None, None, None, None, (ip, 0))])
+        with pytest.raises(ValueError) as exc_info:
+            await _validate_url("http://metadata.internal/latest", resolver=resolver)
+        msg = str(exc_info.value)
+        assert "private/internal" in msg and "link-local" in msg
+
     async def test_rejects_non_http_scheme(self):
         """Must reject non-http(s) schemes."""
         with pytest.raises(ValueError):
@@ -208,33 +221,103 @@ class TestURLValidation:
         with pytest.raises(ValueError):
             await _validate_url("file:///etc/passwd")
 
-    @pytest.mark.asyncio
     async def test_accepts_private_ip_127(self):
         """127.0.0.1 must be accepted — private-IP blocking removed."""
-        with patch("asyncio.get_running_loop") as mock_loop:
-            mock_loop.return_value.getaddrinfo = AsyncMock(
-                return_value=[(None, None, None, None, ("127.0.0.1", 0))]
-            )
-            # Should not raise
-            await _validate_url("http://127.0.0.1:9080/sse")
-            mock_loop.return_value.getaddrinfo.assert_awaited_once()
-
-    @pytest.mark.asyncio
+        resolver = AsyncMock(return_value=[(None, None, None, None, ("127.0.0.1", 0))])
+        # Should not raise
+        await _validate_url("http://127.0.0.1:9080/sse", resolver=resolver)
+        resolver.assert_awaited_once()
+
     async def test_accepts_localhost(self):
         """localhost must be accepted — private-IP blocking removed."""
-        with patch("asyncio.get_running_loop") as mock_loop:
-            mock_loop.return_value.getaddrinfo = AsyncMock(
-                return_value=[(None, None, None, None, ("127.0.0.1", 0))]
-            )
-            # Should not raise
-            await _validate_url("http://localhost:8080/mcp")
-            mock_loop.return_value.getaddrinfo.assert_awaited_once()
-
-
+        resolver = AsyncMock(return_value=[(None, None, None, None, ("127.0.0.1", 0))])
+        # Should not raise
+        await _validate_url("http://localhost:8080/mcp", resolver=resolver)
+        resolver.assert_awaited_once()
+
+
+_LINK_LOCAL_HOSTS = {"169.254.169.254", "fe80::1"}
+
+
+async def _fake_resolve(hostname):
+    """Resolve link-local literals to themselves and every other name to a public IP."""
+    ip = hostname if hostname in _LINK_LOCAL_HOSTS else "8.8.8.8"
+    return [(None, None, None, None, (ip, 0))]
+
+
+async def _outcome(url):
+    """Run _validate_url and return (resolved hostnames, error message or None)."""
+    resolver = AsyncMock(side_effect=_fake_resolve)
+    try:
+        await _validate_url(url, resolver=resolver)
+        error = None
+    except ValueError as e:
+        error = str(e)
+    return [c.args[0] for c in resolver.await_args_list], error
+
+
+class TestURLFastPathParity:
+    """The _HTTP_URL_RE fast path must agree with the urllib.parse fallback."""
+
+    URLS = [
+        "http://example.com/",
+        "https://example.com:8443/mcp?x=1#frag",
+        "HTTP://EXAMPLE.COM/Path",
+        "http://Example.COM:8080",
+        "http://example.com:/",
+        "http://example.com:abc/",
+        "http://example.com:80:90/",
+        "http://a@169.254.169.254/",
+        "http://169.254.169.254@example.com/",
+        "http://[fe80::1]/",
+        "http://[fe80::1]:8080/mcp",
+        "http://example.com\\@169.254.169.254/",
+        "http://169.254.169.254\\example.com/",
+        "http://exa mple.com/",
+        "http://example.com\t/",
+        " http://example.com/",
+        "http://example.com\n",
+        "http://ex%41mple.com/",
+        "http://169.254.169.254:80/latest",
+        "http://evil\uff03.com/",
+        "http://:8080/api",
+        "http:///path",
+        "ftp://example.com/",
+    ]
+
+    @pytest.mark.parametrize("url", URLS)
+    def test_fast_path_hostname_matches_urlparse(self, url):
+        """Whenever the regex matches, its hostname is exactly urlparse's."""
+        match = _HTTP_URL_RE.match(url)
+        if match is not None:
+            assert match.group(2).lower() == (urllib.parse.urlparse(url).hostname or "")
+
+    @pytest.mark.parametrize("url", URLS)
+    async def test_same_hostname_and_verdict_as_fallback(self, url):
+        """Both paths resolve the same hostname and accept/reject identically."""
+        fast = await _outcome(url)
+        with mock.patch("src.multimcp.mcp_client._HTTP_URL_RE", re.compile(r"(?!)")):
+            slow = await _outcome(url)
+        assert fast == slow
+
+    @pytest.mark.parametrize("url", [
+        "http://a@169.254.169.254/",
+        "http://user:pw@169.254.169.254:80/",
+        "http://[fe80::1]/",
+        "http://[FE80::1]:8080/",
+        "http://example.com\\@169.254.169.254/",
+    ])
+    async def test_fallback_still_rejects_link_local(self, url):
+        """URLs the regex hands off to urlparse are still SSRF-checked."""
+        assert _HTTP_URL_RE.match(url) is None
+        with pytest.raises(ValueError, match="link-local"):
+            await _validate_url(url, resolver=AsyncMock(side_effect=_fake_resolve))
+
+
+@pytest.mark.asyncio(loop_scope="class")
 class TestSSRFEdgeCases:
     """Edge cases for URL validation (scheme and hostname checks)."""
 
-    @pytest.mark.asyncio
     async def test_rejects_empty_hostname(self):
         """Empty hostname must raise ValueError before DNS resolution."""
         with pytest.raises(ValueError):
@@ -10,6 +10,8 @@ Covers:
 6. Auto-quarantine fires toggle_tool, tool disappears from tool_to_server
 """
 import asyncio
+from typing import Optional
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch, call
 
@@ -18,12 +20,25 @@ from src.multimcp.mcp_client import MCPClientManager
 from src.multimcp.mcp_proxy import MCPProxyServer, ToolMapping
 
 
+class _FakeClient:
+    """Backend client stand-in; call_tool returns or raises call_tool_impl."""
+
+    def __init__(self):
+        self.call_tool_impl = None
+
+    async def call_tool(self, name, arguments=None):
+        impl = self.call_tool_impl
+        if isinstance(impl, BaseException):
+            raise impl
+        return impl
+
+
 def _proxy_with_mock_client(
     server: str = "srv", tool: str = "tool", connected: bool = True
-) -> tuple[MCPProxyServer, AsyncMock]:
-    """Build a proxy with one tool mapped to a mock client."""
+) -> tuple[MCPProxyServer, Optional[_FakeClient]]:
+    """Build a proxy with one tool mapped to a fake client."""
     mgr = MCPClientManager()
-    mock_client = AsyncMock() if connected else None
+    mock_client = _FakeClient() if connected else None
     if connected:
         mgr.clients[server] = mock_client
     mgr.tool_filters[server] = None
@@ -120,7 +135,7 @@ async def test_trigger_path_exception_does_not_propagate():
         params=types.CallToolRequestParams(name="srv__tool", arguments={}),
     )
 
-    mock_client.call_tool.return_value = MagicMock(
+    mock_client.call_tool_impl = MagicMock(
         content=[MagicMock(text="42")], isError=False
     )
 
@@ -144,7 +159,7 @@ async def test_circuit_breaker_quarantines_after_threshold():
     proxy.quarantine_threshold = 3
 
     # Make call_tool raise a transport exception each time
-    mock_client.call_tool = AsyncMock(side_effect=ConnectionError("subprocess died"))
+    mock_client.call_tool_impl = ConnectionError("subprocess died")
 
     req = types.CallToolRequest(
         method="tools/call",
@@ -166,6 +181,37 @@ async def test_circuit_breaker_quarantines_after_threshold():
     assert result.root.isError  # error still returned to caller
 
 
+@pytest.mark.asyncio
+async def test_quarantine_does_not_wait_for_list_changed():
+    """The quarantining call returns before the list_changed notification is sent."""
+    proxy, mock_client = _proxy_with_mock_client("srv", "crashing_tool")
+    proxy.quarantine_threshold = 1
+    mock_client.call_tool_impl = ConnectionError("subprocess died")
+
+    sent = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _slow_send():
+        await release.wait()
+        sent.set()
+
+    proxy._server_session = MagicMock()
+    proxy._server_session.send_tool_list_changed = _slow_send
+
+    req = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name="srv__crashing_tool", arguments={}),
+    )
+    result = await proxy._call_tool(req)
+
+    assert result.root.isError
+    assert "srv__crashing_tool" not in proxy.tool_to_server
+    assert not sent.is_set()
+
+    release.set()
+    await asyncio.wait_for(sent.wait(), timeout=1.0)
+
+
 @pytest.mark.asyncio
 async def test_circuit_breaker_resets_on_success():
     """A successful call resets the failure counter — transient failures
@@ -180,15 +226,15 @@ async def test_circuit_breaker_resets_on_success():
     )
 
     # Two failures
-    mock_client.call_tool = AsyncMock(side_effect=ConnectionError("died"))
+    mock_client.call_tool_impl = ConnectionError("died")
     await proxy._call_tool(req)
     await proxy._call_tool(req)
     assert proxy._tool_failure_counts.get("srv__flaky_tool", 0) == 2
 
     # Success — resets the counter
-    mock_client.call_tool = AsyncMock(return_value=types.CallToolResult(
+    mock_client.call_tool_impl = types.CallToolResult(
         content=[types.TextContent(type="text", text="ok")], isError=False
-    ))
+    )
     await proxy._call_tool(req)
     assert proxy._tool_failure_counts.get("srv__flaky_tool", 0) == 0, (
         "Counter must reset to 0 on success"
@@ -198,6 +244,119 @@ async def test_circuit_breaker_resets_on_success():
     assert "srv__flaky_tool" in proxy.tool_to_server
 
 
+@pytest.mark.asyncio
+async def test_circuit_breaker_resets_after_failure_window():
+    """Failures older than failure_window_s are forgotten — sporadic errors
+    spread over a long time never add up to a quarantine.
+    """
+    proxy, mock_client = _proxy_with_mock_client("srv", "rare_tool")
+    proxy.quarantine_threshold = 3
+    mock_client.call_tool_impl = ConnectionError("died")
+
+    req = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name="srv__rare_tool", arguments={}),
+    )
+
+    await proxy._call_tool(req)
+    await proxy._call_tool(req)
+    assert proxy._tool_failure_counts["srv__rare_tool"] == 2
+
+    # Age the last failure past the window instead of sleeping
+    proxy._tool_last_failure["srv__rare_tool"] -= proxy.failure_window_s + 1
+
+    await proxy._call_tool(req)
+    assert proxy._tool_failure_counts["srv__rare_tool"] == 1, (
+        "A failure after the window must start a new count"
+    )
+    assert "srv__rare_tool" in proxy.tool_to_server
+
+
+@pytest.mark.asyncio
+async def test_breaker_tolerates_missing_last_failure_map():
+    """Proxies built without __init__ may lack _tool_last_failure; neither the
+    success reset nor the quarantine path may raise AttributeError."""
+    proxy, mock_client = _proxy_with_mock_client("srv", "flaky")
+    del proxy._tool_last_failure
+    req = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name="srv__flaky", arguments={}),
+    )
+
+    proxy._tool_failure_counts["srv__flaky"] = 1
+    mock_client.call_tool_impl = types.CallToolResult(content=[])
+    assert not (await proxy._call_tool(req)).root.isError
+    assert "srv__flaky" not in proxy._tool_failure_counts
+
+    proxy._tool_failure_counts["srv__flaky"] = proxy.quarantine_threshold - 1
+    mock_client.call_tool_impl = ConnectionError("down")
+    assert (await proxy._call_tool(req)).root.isError
+    assert "srv__flaky" not in proxy.tool_to_server
+
+
+@pytest.mark.asyncio
+async def test_call_tool_timeout_triggers_cb():
+    """A backend call that hangs past call_timeout_s fails fast and counts
+    as a transport failure for the circuit breaker.
+    """
+    proxy, mock_client = _proxy_with_mock_client("srv", "hung_tool")
+    proxy.quarantine_threshold = 3
+    proxy.call_timeout_s = 0.01
+
+    async def _hang_forever(name, arguments=None):
+        await asyncio.sleep(9999)
+
+    mock_client.call_tool = _hang_forever
+
+    req = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name="srv__hung_tool", arguments={}),
+    )
+
+    result = await proxy._call_tool(req)
+    assert result.root.isError
+    assert "timed out" in result.root.content[0].text
+    assert proxy._tool_failure_counts["srv__hung_tool"] == 1
+
+
+@pytest.mark.asyncio
+async def test_backend_timeout_error_not_reported_as_proxy_deadline():
+    """A TimeoutError raised by the backend keeps its own message."""
+    proxy, mock_client = _proxy_with_mock_client("srv", "slow_tool")
+    mock_client.call_tool = AsyncMock(side_effect=TimeoutError("upstream read timeout"))
+
+    req = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name="srv__slow_tool", arguments={}),
+    )
+
+    result = await proxy._call_tool(req)
+    text = result.root.content[0].text
+    assert "upstream read timeout" in text
+    assert "timed out after" not in text
+
+
+@pytest.mark.asyncio
+async def test_call_timeout_none_waits_for_slow_call():
+    """call_timeout_s=None disables the proxy deadline."""
+    proxy, mock_client = _proxy_with_mock_client("srv", "long_tool")
+    proxy.call_timeout_s = None
+
+    async def _slow(name, arguments=None):
+        await asyncio.sleep(0.02)
+        return types.CallToolResult(content=[])
+
+    mock_client.call_tool = _slow
+
+    req = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name="srv__long_tool", arguments={}),
+    )
+
+    result = await proxy._call_tool(req)
+    assert not result.root.isError
+
+
 @pytest.mark.asyncio
 async def test_circuit_breaker_does_not_trigger_on_is_error_response():
     """isError=True tool responses must NOT trigger the circuit breaker.
@@ -210,10 +369,10 @@ async def test_circuit_breaker_does_not_trigger_on_is_error_response():
     proxy.quarantine_threshold = 3
 
     # Tool consistently returns isError=True (caller's bad arguments scenario)
-    mock_client.call_tool = AsyncMock(return_value=types.CallToolResult(
+    mock_client.call_tool_impl = types.CallToolResult(
         content=[types.TextContent(type="text", text="Invalid argument: x must be positive")],
         isError=True,
-    ))
+    )
 
     req = types.CallToolRequest(
         method="tools/call",
@@ -252,7 +411,7 @@ async def test_circuit_breaker_independent_per_tool():
         params=types.CallToolRequestParams(name="srv__bad_tool", arguments={}),
     )
 
-    mock_client.call_tool = AsyncMock(side_effect=RuntimeError("crash"))
+    mock_client.call_tool_impl = RuntimeError("crash")
 
     # Fail bad_tool 3 times → quarantine
     for _ in range(3):
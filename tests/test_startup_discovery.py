@@ -1,24 +1,34 @@
 import pytest
 import asyncio
 from contextlib import asynccontextmanager
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 from src.multimcp.mcp_client import MCPClientManager
 from src.multimcp.yaml_config import MultiMCPConfig, ServerConfig
 
 
-def _make_mock_session(tools=None):
-    """Build a mock ClientSession that works as an async context manager."""
-    if tools is None:
-        tools = []
-    mock_session = AsyncMock()
-    mock_session.initialize = AsyncMock(return_value=MagicMock(
-        capabilities=MagicMock(tools=True, prompts=False, resources=False)
-    ))
-    mock_session.list_tools = AsyncMock(return_value=MagicMock(tools=tools))
-    # Make the session itself usable as an async context manager
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=False)
-    return mock_session
+# Every session advertises tools only; one shared initialize result serves all tests.
+_CAPS = SimpleNamespace(tools=True, prompts=False, resources=False)
+_INIT_RESULT = SimpleNamespace(capabilities=_CAPS)
+
+
+class _Session:
+    """ClientSession stand-in with constant initialize/list_tools results."""
+
+    def __init__(self, tools=None):
+        self._tools = SimpleNamespace(tools=tools or [])
+
+    async def initialize(self):
+        return _INIT_RESULT
+
+    async def list_tools(self):
+        return self._tools
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
 
 
 def _make_mock_transport():
@@ -33,8 +43,18 @@ def _make_mock_transport():
     return _ctx, mock_read, mock_write
 
 
+@pytest.fixture
+def transport_session():
+    """A stdio transport stand-in and a session advertising no tools.
+
+    Tests set session._tools.tools to the tool list they need.
+    """
+    transport_ctx, _, _ = _make_mock_transport()
+    return transport_ctx, _Session()
+
+
 @pytest.mark.asyncio
-async def test_discover_all_returns_tool_dict():
+async def test_discover_all_returns_tool_dict(transport_session):
     """discover_all connects, fetches tools, returns {server: [tools]}."""
     manager = MCPClientManager()
 
@@ -42,8 +62,8 @@ async def test_discover_all_returns_tool_dict():
     mock_tool.name = "search_repositories"
     mock_tool.description = "Search repos"
 
-    mock_session = _make_mock_session(tools=[mock_tool])
-    transport_ctx, _, _ = _make_mock_transport()
+    transport_ctx, mock_session = transport_session
+    mock_session._tools.tools = [mock_tool]
 
     config = MultiMCPConfig(servers={
         "github": ServerConfig(command="npx", always_on=False)
@@ -58,12 +78,12 @@ async def test_discover_all_returns_tool_dict():
 
 
 @pytest.mark.asyncio
-async def test_discover_all_disconnects_lazy_servers():
+async def test_discover_all_disconnects_lazy_servers(transport_session):
     """After discovery, lazy servers are NOT kept in clients dict."""
     manager = MCPClientManager()
 
-    mock_session = _make_mock_session(tools=[])
-    transport_ctx, _, _ = _make_mock_transport()
+    transport_ctx, mock_session = transport_session
+    mock_session._tools.tools = []
 
     config = MultiMCPConfig(servers={
         "tavily": ServerConfig(command="npx", always_on=False)
@@ -77,12 +97,12 @@ async def test_discover_all_disconnects_lazy_servers():
 
 
 @pytest.mark.asyncio
-async def test_discover_all_keeps_always_on_connected():
+async def test_discover_all_keeps_always_on_connected(transport_session):
     """After discovery, always_on servers remain in clients dict."""
     manager = MCPClientManager()
 
-    mock_session = _make_mock_session(tools=[])
-    transport_ctx, _, _ = _make_mock_transport()
+    transport_ctx, mock_session = transport_session
+    mock_session._tools.tools = []
 
     config = MultiMCPConfig(servers={
         "github": ServerConfig(command="npx", always_on=True)
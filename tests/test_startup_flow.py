@@ -1,7 +1,7 @@
 import pytest
 import tempfile
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 from src.multimcp.yaml_config import MultiMCPConfig, ServerConfig, ToolEntry, save_config
 from src.multimcp.mcp_client import MCPClientManager
 
@@ -9,6 +9,7 @@ from src.multimcp.mcp_client import MCPClientManager
 @pytest.mark.asyncio
 async def test_bootstrap_applies_tool_filters_from_yaml(tmp_path):
     """Tools marked enabled=False in YAML are excluded from client_manager.tool_filters."""
+    import json
     from src.multimcp.multi_mcp import MultiMCP
 
     yaml_path = tmp_path / "servers.yaml"
@@ -25,11 +26,12 @@ async def test_bootstrap_applies_tool_filters_from_yaml(tmp_path):
     })
     save_config(config, yaml_path)
 
-    server = MultiMCP(transport="stdio", config="./examples/config/mcp.json")
-
-    # Patch discover_all so we don't actually connect
-    server.client_manager.discover_all = AsyncMock(return_value={})
-
+    # JSON config lists only servers already in the YAML, so no discovery runs
+    json_path = tmp_path / "mcp.json"
+    json_path.write_text(json.dumps(
+        {"mcpServers": {"github": {"command": "/fake/run-github.sh"}}}
+    ))
+    server = MultiMCP(transport="stdio", config=str(json_path))
     await server._bootstrap_from_yaml(yaml_path)
 
     # Only enabled tools should be in the allow list
@@ -39,22 +41,17 @@ async def test_bootstrap_applies_tool_filters_from_yaml(tmp_path):
     assert "delete_repository" not in allow_list
 
 
-@pytest.mark.asyncio
-async def test_bootstrap_sets_always_on_and_idle_timeout(tmp_path):
+def test_bootstrap_sets_always_on_and_idle_timeout():
     """always_on=True servers added to always_on_servers, idle_timeout set correctly."""
     from src.multimcp.multi_mcp import MultiMCP
 
-    yaml_path = tmp_path / "servers.yaml"
     config = MultiMCPConfig(servers={
         "github": ServerConfig(command="/fake/run-github.sh", always_on=True, idle_timeout_minutes=10),
         "exa": ServerConfig(url="https://mcp.exa.ai", always_on=False, idle_timeout_minutes=3),
     })
-    save_config(config, yaml_path)
 
     server = MultiMCP(transport="stdio", config="./examples/config/mcp.json")
-    server.client_manager.discover_all = AsyncMock(return_value={})
-
-    await server._bootstrap_from_yaml(yaml_path)
+    server._bootstrap_from_config(config)
 
     assert "github" in server.client_manager.always_on_servers
     assert "exa" not in server.client_manager.always_on_servers
@@ -1,6 +1,5 @@
 """Tests for TieredAssembler two-tier description compression."""
 
-import json
 import pytest
 from unittest.mock import MagicMock
 from mcp import types
@@ -8,13 +7,16 @@ from src.multimcp.retrieval.assembler import TieredAssembler
 from src.multimcp.retrieval.models import RetrievalConfig, ScoredTool
 
 
+def _default_props() -> dict:
+    """Properties for tools that don't pass their own; a fresh dict per call."""
+    return {"query": {"type": "string", "description": "The search query to execute"}}
+
+
 def _make_scored(
     name: str, desc: str, score: float, properties: dict = None
 ) -> ScoredTool:
     if properties is None:
-        properties = {
-            "query": {"type": "string", "description": "The search query to execute"}
-        }
+        properties = _default_props()
     tool = types.Tool(
         name=name,
         description=desc,
@@ -133,8 +135,9 @@ class TestTieredAssembler:
         ]
         result = self.assembler.assemble(tools, self.config)
         # Compare summary version of 'full' tool against its original full-description version
-        original_full_size = len(json.dumps(tools[2].tool_mapping.tool.model_dump()))
-        summary_size = len(json.dumps(result[2].model_dump()))
+        # model_dump_json serializes in pydantic-core, with no intermediate dict
+        original_full_size = len(tools[2].tool_mapping.tool.model_dump_json())
+        summary_size = len(result[2].model_dump_json())
         # Summary should be smaller than the original (descriptions stripped + truncated)
         assert summary_size < original_full_size
 
@@ -168,3 +171,80 @@ class TestTieredAssembler:
         if "properties" in items:
             for pval in items["properties"].values():
                 assert "description" not in pval
+
+    def test_property_named_description_is_kept(self):
+        """Only description annotations are stripped, not a property named 'description'."""
+        props = {"description": {"type": "string", "description": "Issue body"}}
+        tools = [
+            _make_scored("top1", "S", 0.9),
+            _make_scored("top2", "S", 0.8),
+            _make_scored("issue", "Create an issue", 0.5, properties=props),
+        ]
+        result = self.assembler.assemble(tools, self.config)
+        assert result[2].inputSchema["properties"] == {"description": {"type": "string"}}
+
+    def test_output_schemas_share_no_containers_with_originals(self):
+        """Editing an assembled schema, in either tier, never reaches the registry's Tool."""
+        props = {"mode": {"type": "string", "enum": ["a", "b"], "description": "Mode"}}
+        tools = [
+            _make_scored("full", "S", 0.9, properties=props),
+            _make_scored("top2", "S", 0.8),
+            _make_scored("summary", "S", 0.5, properties=props),
+        ]
+        result = self.assembler.assemble(tools, self.config)
+        for out in (result[0], result[2]):
+            out.inputSchema["properties"]["mode"]["enum"].append("c")
+        for scored in (tools[0], tools[2]):
+            mode = scored.tool_mapping.tool.inputSchema["properties"]["mode"]
+            assert mode["enum"] == ["a", "b"]
+
+    def test_very_deep_schema_is_stripped(self):
+        """Copying and stripping are iterative, so very deep nesting is handled."""
+        node = {"type": "string", "description": "leaf"}
+        for _ in range(2000):
+            node = {"type": "object", "description": "d", "properties": {"child": node}}
+        tools = [
+            _make_scored("top1", "S", 0.9),
+            _make_scored("top2", "S", 0.8),
+            _make_scored("deep", "Deep", 0.5, properties=node["properties"]),
+        ]
+        schema = self.assembler.assemble(tools, self.config)[2].inputSchema
+        for _ in range(2000):
+            assert "description" not in schema
+            schema = schema["properties"]["child"]
+        assert schema == {"type": "string"}
+
+    def test_summary_reused_until_tool_replaced(self):
+        """A summary is built once per registry Tool; a replacement Tool rebuilds it."""
+        tools = [
+            _make_scored("top1", "S", 0.9),
+            _make_scored("top2", "S", 0.8),
+            _make_scored("summary", "First version.", 0.5),
+        ]
+        first = self.assembler.assemble(tools, self.config)[2]
+        assert self.assembler.assemble(tools, self.config)[2] is first
+
+        tools[2] = _make_scored("summary", "Second version.", 0.5)
+        second = self.assembler.assemble(tools, self.config)[2]
+        assert second.description == "Second version."
+
+    def test_summaries_share_no_property_schemas(self):
+        """Editing one summary Tool's property never changes another summary Tool."""
+        tools = [
+            _make_scored("top1", "S", 0.9),
+            _make_scored("top2", "S", 0.8),
+            _make_scored("a", "A", 0.5, properties={"q": {"type": "string", "description": "x"}}),
+            _make_scored("b", "B", 0.4, properties={"q": {"type": "string", "description": "y"}}),
+        ]
+        result = self.assembler.assemble(tools, self.config)
+        result[2].inputSchema["properties"]["q"]["type"] = "integer"
+        assert result[3].inputSchema["properties"]["q"] == {"type": "string"}
+        other = TieredAssembler().assemble(tools, self.config)
+        assert other[2].inputSchema["properties"]["q"] == {"type": "string"}
+
+    def test_assemble_leaves_input_properties_untouched(self):
+        """Neither tier may edit the registry tools' own property schemas."""
+        tools = [_make_scored(f"t{i}", "S", 1.0 - i / 10) for i in range(4)]
+        self.assembler.assemble(tools, self.config)
+        for scored in tools:
+            assert scored.tool_mapping.tool.inputSchema["properties"] == _default_props()
@@ -9,7 +9,8 @@ Tests for Transport Consistency (Task 6e):
 import pytest
 import asyncio
 from contextlib import asynccontextmanager, AsyncExitStack
-from unittest.mock import AsyncMock, MagicMock, patch, call
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.multimcp.mcp_client import MCPClientManager
 from src.multimcp.yaml_config import ServerConfig
@@ -19,49 +20,69 @@ from src.multimcp.yaml_config import ServerConfig
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _make_mock_streamable():
-    """Return an asynccontextmanager that yields (read, write, session)."""
-    mock_read = AsyncMock()
-    mock_write = AsyncMock()
-    mock_session_transport = MagicMock()
+# Constant session results, shared by every call. Sessions advertise no
+# tools, so discovery skips list_tools.
+_INIT_RESULT = SimpleNamespace(capabilities=SimpleNamespace(tools=False))
+_EMPTY_TOOLS_RESULT = SimpleNamespace(tools=())
 
-    @asynccontextmanager
-    async def _ctx(*args, **kwargs):
-        yield mock_read, mock_write, mock_session_transport
+# One config per transport type; _discover_http only reads them
+_CONFIGS = {
+    t: ServerConfig(command="node", type=t)
+    for t in ("stdio", "sse", "http", "streamablehttp")
+}
 
-    return _ctx, mock_read, mock_write
 
+@asynccontextmanager
+async def _streamable_ctx(*args, **kwargs):
+    """streamable_http_client stand-in yielding (read, write, get_session_id)."""
+    yield None, None, None
 
-def _make_mock_sse():
-    """Return an asynccontextmanager that yields (read, write)."""
-    mock_read = AsyncMock()
-    mock_write = AsyncMock()
 
-    @asynccontextmanager
-    async def _ctx(*args, **kwargs):
-        yield mock_read, mock_write
+@asynccontextmanager
+async def _sse_ctx(*args, **kwargs):
+    """sse_client stand-in yielding (read, write)."""
+    yield None, None
 
-    return _ctx, mock_read, mock_write
 
+class _Session:
+    """ClientSession stand-in with constant results; works as an async context manager."""
 
-def _make_mock_client_session(has_tools=False):
-    """Build a mock ClientSession that works as an async context manager."""
-    mock_sess = AsyncMock()
-    capabilities = MagicMock()
-    capabilities.tools = has_tools
-    mock_sess.initialize = AsyncMock(return_value=MagicMock(capabilities=capabilities))
-    mock_sess.list_tools = AsyncMock(return_value=MagicMock(tools=[]))
-    mock_sess.__aenter__ = AsyncMock(return_value=mock_sess)
-    mock_sess.__aexit__ = AsyncMock(return_value=False)
-    return mock_sess
+    async def initialize(self):
+        return _INIT_RESULT
 
+    async def list_tools(self):
+        return _EMPTY_TOOLS_RESULT
 
-def _make_mock_client_session_cls(has_tools=False):
-    """Return a mock class whose instances work as async context managers."""
-    mock_sess = _make_mock_client_session(has_tools)
-    mock_cls = MagicMock()
-    mock_cls.return_value = mock_sess
-    return mock_cls, mock_sess
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def _refusing(*args, **kwargs):
+    """Transport stand-in whose connection attempt fails immediately."""
+    raise ConnectionError("connection refused")
+
+
+@pytest.fixture(scope="module")
+def client_session():
+    """One stateless session shared by the module; ClientSession is patched to return it."""
+    return _Session()
+
+
+@pytest.fixture
+def transport_patches(monkeypatch, client_session):
+    """Return apply(streamable, sse) installing both transports plus the shared session."""
+
+    def _apply(streamable, sse):
+        monkeypatch.setattr("src.multimcp.mcp_client.streamable_http_client", streamable)
+        monkeypatch.setattr("src.multimcp.mcp_client.sse_client", sse)
+        monkeypatch.setattr(
+            "src.multimcp.mcp_client.ClientSession", lambda *args, **kwargs: client_session
+        )
+
+    return _apply
 
 
 # ---------------------------------------------------------------------------
@@ -72,206 +93,160 @@ class TestAutoDetectTransport:
     """Tests for auto-detect transport logic (no explicit type or type='stdio')."""
 
     @pytest.mark.asyncio
-    async def test_discover_tries_streamable_http_first(self):
+    async def test_discover_tries_streamable_http_first(self, transport_patches):
         """Auto-detect mode: streamable_http_client is called; sse_client is NOT called."""
         manager = MCPClientManager()
-        server_config = ServerConfig(command="node", type="stdio")
-
-        streamable_ctx, _, _ = _make_mock_streamable()
-        mock_cls, _ = _make_mock_client_session_cls(has_tools=False)
+        server_config = _CONFIGS["stdio"]
 
-        with patch("src.multimcp.mcp_client.streamable_http_client", streamable_ctx) as mock_sh, \
-             patch("src.multimcp.mcp_client.sse_client") as mock_sse, \
-             patch("src.multimcp.mcp_client.ClientSession", mock_cls):
-            await manager._discover_http("srv", "http://example.com", server_config)
+        mock_sse = MagicMock()
+        transport_patches(_streamable_ctx, mock_sse)
+        await manager._discover_http("srv", "http://example.com", server_config)
 
         # streamable_http_client was called (the context manager itself was entered)
         # We verify by checking sse_client was NOT called — only streamable HTTP path ran
         mock_sse.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_discover_falls_back_to_sse_on_streamable_failure(self):
+    async def test_discover_falls_back_to_sse_on_streamable_failure(self, transport_patches):
         """Auto-detect mode: if streamable_http_client raises, sse_client is used."""
         manager = MCPClientManager()
-        server_config = ServerConfig(command="node", type="stdio")
+        server_config = _CONFIGS["stdio"]
 
-        sse_ctx, _, _ = _make_mock_sse()
-        mock_cls, _ = _make_mock_client_session_cls(has_tools=False)
-
-        with patch("src.multimcp.mcp_client.streamable_http_client",
-                   side_effect=Exception("connection refused")), \
-             patch("src.multimcp.mcp_client.sse_client", sse_ctx) as mock_sse_factory, \
-             patch("src.multimcp.mcp_client.ClientSession", mock_cls):
-            result = await manager._discover_http("srv", "http://example.com", server_config)
+        transport_patches(_refusing, _sse_ctx)
+        result = await manager._discover_http("srv", "http://example.com", server_config)
 
         # SSE fallback was invoked — result is an empty list (no tools)
         assert result == []
 
     @pytest.mark.asyncio
-    async def test_connect_url_server_tries_streamable_first(self):
+    async def test_connect_url_server_tries_streamable_first(self, transport_patches):
         """_negotiate_http_transport with transport_type=None attempts Streamable HTTP."""
         manager = MCPClientManager()
 
-        streamable_ctx, _, _ = _make_mock_streamable()
-        mock_cls, mock_sess = _make_mock_client_session_cls()
-
+        mock_sse = MagicMock()
+        transport_patches(_streamable_ctx, mock_sse)
         async with AsyncExitStack() as server_stack:
-            with patch("src.multimcp.mcp_client.streamable_http_client", streamable_ctx), \
-                 patch("src.multimcp.mcp_client.sse_client") as mock_sse, \
-                 patch("src.multimcp.mcp_client.ClientSession", mock_cls):
-                client = await manager._negotiate_http_transport(
-                    "srv", "http://example.com", server_stack, None
-                )
+            await manager._negotiate_http_transport(
+                "srv", "http://example.com", server_stack, None
+            )
 
         # sse_client must NOT have been called — streamable HTTP succeeded
         mock_sse.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_connect_url_server_falls_back_to_sse(self):
+    async def test_connect_url_server_falls_back_to_sse(self, transport_patches, client_session):
         """_negotiate_http_transport falls back to SSE when Streamable HTTP fails."""
         manager = MCPClientManager()
 
-        sse_ctx, _, _ = _make_mock_sse()
-        mock_cls, mock_sess = _make_mock_client_session_cls()
-
+        transport_patches(_refusing, _sse_ctx)
         async with AsyncExitStack() as server_stack:
-            with patch("src.multimcp.mcp_client.streamable_http_client",
-                       side_effect=Exception("refused")), \
-                 patch("src.multimcp.mcp_client.sse_client", sse_ctx), \
-                 patch("src.multimcp.mcp_client.ClientSession", mock_cls):
-                client = await manager._negotiate_http_transport(
-                    "srv", "http://example.com", server_stack, None
-                )
+            client = await manager._negotiate_http_transport(
+                "srv", "http://example.com", server_stack, None
+            )
 
         # The returned client should be the mock session
-        assert client is mock_sess
-
-
-# ---------------------------------------------------------------------------
-# TestExplicitTransportType
-# ---------------------------------------------------------------------------
-
-class TestExplicitTransportType:
-    """Tests that explicit type= in ServerConfig is respected."""
+        assert client is client_session
 
     @pytest.mark.asyncio
-    async def test_sse_type_skips_streamable_http_in_discover(self):
-        """type='sse': sse_client is used directly; streamable_http_client NOT called."""
+    async def test_sse_fallback_is_remembered_per_url(self, transport_patches):
+        """After an SSE fallback, the next connect to that URL skips the Streamable HTTP probe."""
         manager = MCPClientManager()
-        server_config = ServerConfig(command="node", type="sse")
 
-        sse_ctx, _, _ = _make_mock_sse()
-        mock_cls, _ = _make_mock_client_session_cls(has_tools=False)
+        mock_sh = MagicMock(side_effect=ConnectionError("refused"))
+        transport_patches(mock_sh, _sse_ctx)
+        for _ in range(2):
+            async with AsyncExitStack() as server_stack:
+                await manager._negotiate_http_transport(
+                    "srv", "http://example.com", server_stack, None
+                )
 
-        with patch("src.multimcp.mcp_client.streamable_http_client") as mock_sh, \
-             patch("src.multimcp.mcp_client.sse_client", sse_ctx), \
-             patch("src.multimcp.mcp_client.ClientSession", mock_cls):
-            result = await manager._discover_http("srv", "http://example.com", server_config)
-
-        mock_sh.assert_not_called()
-        assert isinstance(result, list)
+        assert mock_sh.call_count == 1
 
     @pytest.mark.asyncio
-    async def test_http_type_skips_streamable_http_in_discover(self):
-        """type='http': sse_client is used directly; streamable_http_client NOT called."""
+    async def test_remembered_sse_failure_reprobes(self, transport_patches, client_session):
+        """If the remembered SSE connect fails, Streamable HTTP is probed again."""
         manager = MCPClientManager()
-        server_config = ServerConfig(command="node", type="http")
+        manager._sse_only_urls.add("http://example.com")
 
-        sse_ctx, _, _ = _make_mock_sse()
-        mock_cls, _ = _make_mock_client_session_cls(has_tools=False)
+        transport_patches(_streamable_ctx, _refusing)
+        async with AsyncExitStack() as server_stack:
+            client = await manager._negotiate_http_transport(
+                "srv", "http://example.com", server_stack, None
+            )
 
-        with patch("src.multimcp.mcp_client.streamable_http_client") as mock_sh, \
-             patch("src.multimcp.mcp_client.sse_client", sse_ctx), \
-             patch("src.multimcp.mcp_client.ClientSession", mock_cls):
-            result = await manager._discover_http("srv", "http://example.com", server_config)
+        assert client is client_session
+        assert "http://example.com" not in manager._sse_only_urls
 
-        mock_sh.assert_not_called()
-        assert isinstance(result, list)
+
+# ---------------------------------------------------------------------------
+# TestExplicitTransportType
+# ---------------------------------------------------------------------------
+
+class TestExplicitTransportType:
+    """Tests that explicit type= in ServerConfig is respected."""
 
     @pytest.mark.asyncio
-    async def test_streamablehttp_type_skips_sse_in_discover(self):
-        """type='streamablehttp': streamable_http_client used; sse_client NOT called."""
+    @pytest.mark.parametrize(
+        "transport_type,sh_ok,sse_ok,sh_called,sse_called",
+        [
+            ("sse", True, True, False, True),
+            ("http", True, True, False, True),
+            ("streamablehttp", True, True, True, False),
+            # Failures return [] with no fallback to the other transport
+            ("streamablehttp", False, True, True, False),
+            ("sse", True, False, False, True),
+        ],
+        ids=["sse", "http", "streamablehttp", "streamablehttp_fails", "sse_fails"],
+    )
+    async def test_explicit_type_uses_only_its_transport_in_discover(
+        self, transport_patches, transport_type, sh_ok, sse_ok, sh_called, sse_called
+    ):
+        """An explicit type= connects with that transport alone, success or failure."""
         manager = MCPClientManager()
-        server_config = ServerConfig(command="node", type="streamablehttp")
-
-        streamable_ctx, _, _ = _make_mock_streamable()
-        mock_cls, _ = _make_mock_client_session_cls(has_tools=False)
+        server_config = _CONFIGS[transport_type]
 
-        with patch("src.multimcp.mcp_client.streamable_http_client", streamable_ctx), \
-             patch("src.multimcp.mcp_client.sse_client") as mock_sse, \
-             patch("src.multimcp.mcp_client.ClientSession", mock_cls):
-            result = await manager._discover_http("srv", "http://example.com", server_config)
+        refused = ConnectionError("refused")
+        mock_sh = MagicMock(wraps=_streamable_ctx) if sh_ok else MagicMock(side_effect=refused)
+        mock_sse = MagicMock(wraps=_sse_ctx) if sse_ok else MagicMock(side_effect=refused)
+        transport_patches(mock_sh, mock_sse)
+        result = await manager._discover_http("srv", "http://example.com", server_config)
 
-        mock_sse.assert_not_called()
-        assert isinstance(result, list)
+        assert mock_sh.called is sh_called
+        assert mock_sse.called is sse_called
+        assert result == []
 
     @pytest.mark.asyncio
-    async def test_sse_type_in_connect_url_server_skips_streamable(self):
+    async def test_sse_type_in_connect_url_server_skips_streamable(
+        self, transport_patches, client_session
+    ):
         """type='sse' in _negotiate_http_transport: streamable_http_client NOT called."""
         manager = MCPClientManager()
 
-        sse_ctx, _, _ = _make_mock_sse()
-        mock_cls, mock_sess = _make_mock_client_session_cls()
-
+        mock_sh = MagicMock()
+        transport_patches(mock_sh, _sse_ctx)
         async with AsyncExitStack() as server_stack:
-            with patch("src.multimcp.mcp_client.streamable_http_client") as mock_sh, \
-                 patch("src.multimcp.mcp_client.sse_client", sse_ctx), \
-                 patch("src.multimcp.mcp_client.ClientSession", mock_cls):
-                client = await manager._negotiate_http_transport(
-                    "srv", "http://example.com", server_stack, "sse"
-                )
+            client = await manager._negotiate_http_transport(
+                "srv", "http://example.com", server_stack, "sse"
+            )
 
         mock_sh.assert_not_called()
-        assert client is mock_sess
+        assert client is client_session
 
     @pytest.mark.asyncio
-    async def test_none_transport_type_tries_streamable_first(self):
+    async def test_none_transport_type_tries_streamable_first(self, transport_patches):
         """transport_type=None in _negotiate_http_transport: streamable_http_client attempted."""
         manager = MCPClientManager()
 
-        streamable_ctx, _, _ = _make_mock_streamable()
-        mock_cls, mock_sess = _make_mock_client_session_cls()
-
+        mock_sse = MagicMock()
+        transport_patches(_streamable_ctx, mock_sse)
         async with AsyncExitStack() as server_stack:
-            with patch("src.multimcp.mcp_client.streamable_http_client", streamable_ctx), \
-                 patch("src.multimcp.mcp_client.sse_client") as mock_sse, \
-                 patch("src.multimcp.mcp_client.ClientSession", mock_cls):
-                client = await manager._negotiate_http_transport(
-                    "srv", "http://example.com", server_stack, None
-                )
+            await manager._negotiate_http_transport(
+                "srv", "http://example.com", server_stack, None
+            )
 
         # SSE was NOT needed — streamable succeeded
         mock_sse.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_streamablehttp_type_returns_empty_on_failure(self):
-        """type='streamablehttp' failure returns empty list (no SSE fallback)."""
-        manager = MCPClientManager()
-        server_config = ServerConfig(command="node", type="streamablehttp")
-
-        with patch("src.multimcp.mcp_client.streamable_http_client",
-                   side_effect=Exception("server unavailable")), \
-             patch("src.multimcp.mcp_client.sse_client") as mock_sse:
-            result = await manager._discover_http("srv", "http://example.com", server_config)
-
-        # No SSE fallback for explicit streamablehttp type
-        mock_sse.assert_not_called()
-        assert result == []
-
-    @pytest.mark.asyncio
-    async def test_sse_type_returns_empty_on_failure(self):
-        """type='sse' failure returns empty list (no streamable fallback)."""
-        manager = MCPClientManager()
-        server_config = ServerConfig(command="node", type="sse")
-
-        with patch("src.multimcp.mcp_client.streamable_http_client") as mock_sh, \
-             patch("src.multimcp.mcp_client.sse_client",
-                   side_effect=Exception("server unavailable")):
-            result = await manager._discover_http("srv", "http://example.com", server_config)
-
-        mock_sh.assert_not_called()
-        assert result == []
-
 
 # ---------------------------------------------------------------------------
 # TestWatchdogTransport
@@ -349,25 +324,22 @@ class TestWatchdogTransport:
         mock_conn.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_watchdog_transport_consistent_with_direct_connect(self):
+    async def test_watchdog_transport_consistent_with_direct_connect(
+        self, transport_patches, client_session
+    ):
         """_negotiate_http_transport is used in both watchdog and lazy connect — same transport logic."""
         manager = MCPClientManager()
 
-        sse_ctx, _, _ = _make_mock_sse()
-        streamable_ctx, _, _ = _make_mock_streamable()
-        mock_cls, mock_sess = _make_mock_client_session_cls()
-
         # Both the watchdog path and the lazy-connect path call _negotiate_http_transport,
         # which itself respects transport_type. Verify the logic is identical by calling
         # _negotiate_http_transport directly and confirming streamable HTTP is tried first.
+        mock_sse_fn = MagicMock()
+        transport_patches(_streamable_ctx, mock_sse_fn)
         async with AsyncExitStack() as stack:
-            with patch("src.multimcp.mcp_client.streamable_http_client", streamable_ctx), \
-                 patch("src.multimcp.mcp_client.sse_client") as mock_sse_fn, \
-                 patch("src.multimcp.mcp_client.ClientSession", mock_cls):
-                client = await manager._negotiate_http_transport(
-                    "srv", "http://example.com", stack
-                )
+            client = await manager._negotiate_http_transport(
+                "srv", "http://example.com", stack
+            )
 
         # Streamable HTTP was tried; SSE was not needed
         mock_sse_fn.assert_not_called()
-        assert client is mock_sess
+        assert client is client_session
@@ -1,5 +1,4 @@
 import pytest
-import yaml
 from pathlib import Path
 from src.multimcp.yaml_config import ToolEntry, ServerConfig, MultiMCPConfig, load_config, save_config
 
@@ -49,17 +48,66 @@ def test_save_and_reload_config(tmp_path):
     assert reloaded.servers["exa"].tools["web_search_exa"].enabled is True
     assert reloaded.servers["exa"].tools["web_search_exa"].description == "Search the web"
 
+def test_reload_unchanged_file_gives_independent_configs(tmp_path):
+    """Reusing the cached parse must not hand out shared model objects or nested dicts."""
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        "servers:\n"
+        "  exa:\n"
+        "    url: https://mcp.exa.ai/mcp\n"
+        "    tools:\n"
+        "      search:\n"
+        "        input_schema:\n"
+        "          type: object\n"
+        "          properties:\n"
+        "            query: {type: string}\n"
+    )
+    first = load_config(path)
+    first.servers["exa"].always_on = True
+    first.servers["exa"].tools["search"].input_schema["properties"]["limit"] = {"type": "integer"}
+    first.servers["exa"].tools["search"].input_schema["properties"]["query"]["type"] = "number"
+
+    second = load_config(path)
+    assert second.servers["exa"].always_on is False
+    assert second.servers["exa"].tools["search"].input_schema["properties"] == {
+        "query": {"type": "string"}
+    }
+    third = load_config(path)
+    assert third.servers["exa"].tools["search"].input_schema["properties"] == {
+        "query": {"type": "string"}
+    }
+
+def test_reload_sees_rewritten_file(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("servers:\n  exa:\n    always_on: false\n")
+    assert load_config(path).servers["exa"].always_on is False
+    path.write_text("servers:\n  exa:\n    always_on: true\n")
+    assert load_config(path).servers["exa"].always_on is True
+
+def test_call_timeout_null_means_no_deadline(tmp_path):
+    path = tmp_path / "config.yaml"
+    assert MultiMCPConfig().call_timeout_s == 300.0
+    path.write_text("call_timeout_s: null\n")
+    assert load_config(path).call_timeout_s is None
+    path.write_text("call_timeout_s: 900\n")
+    assert load_config(path).call_timeout_s == 900.0
+
 def test_load_missing_file_returns_empty_config():
     config = load_config(Path("/tmp/does_not_exist_multi_mcp.yaml"))
     assert config.servers == {}
 
+def test_load_empty_file_returns_empty_config(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.touch()
+    assert load_config(path) == MultiMCPConfig()
+
 
 def test_save_config_raises_on_write_error(tmp_path):
     """save_config must raise OSError (not swallow it) when file cannot be written.
 
     Callers should catch OSError to avoid crashing startup on disk/perms failures.
     """
-    from unittest.mock import patch, mock_open
+    from unittest.mock import patch
     import builtins
 
     config = MultiMCPConfig()
@@ -79,7 +127,6 @@ def test_save_config_raises_on_write_error(tmp_path):
 def test_save_config_logs_and_raises_on_mkdir_error(tmp_path):
     """save_config must raise OSError when the parent directory cannot be created."""
     from unittest.mock import patch
-    from pathlib import Path
 
     config = MultiMCPConfig()
     # Use a path under a non-existent root that can't be created
@@ -88,3 +135,91 @@ def test_save_config_logs_and_raises_on_mkdir_error(tmp_path):
     with patch("pathlib.Path.mkdir", side_effect=OSError("permission denied")):
         with pytest.raises(OSError, match="permission denied"):
             save_config(config, path)
+
+
+
+def test_save_config_recreates_removed_directory(tmp_path):
+    """The created-dir cache must not break saves after the directory is deleted."""
+    import shutil
+
+    path = tmp_path / "cfg" / "config.yaml"
+    save_config(MultiMCPConfig(), path)
+    shutil.rmtree(path.parent)
+    save_config(MultiMCPConfig(), path)
+    assert path.exists()
+
+
+def test_save_config_replaces_file_atomically(tmp_path):
+    """save_config swaps in a complete file and keeps the old file's mode."""
+    import os
+    import stat
+
+    path = tmp_path / "config.yaml"
+    save_config(MultiMCPConfig(), path)
+    os.chmod(path, 0o640)
+    before = path.stat().st_ino
+    save_config(MultiMCPConfig(servers={"exa": ServerConfig(url="https://mcp.exa.ai/mcp")}), path)
+    assert path.stat().st_ino != before
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ["config.yaml"]  # no temp file left
+    assert "exa" in load_config(path).servers
+
+
+def test_save_config_through_symlink_updates_target(tmp_path):
+    """A symlinked config stays a symlink; the file it points to gets the new content."""
+    real = tmp_path / "real" / "servers.yaml"
+    real.parent.mkdir()
+    save_config(MultiMCPConfig(), real)
+    link = tmp_path / "servers.yaml"
+    link.symlink_to(real)
+
+    save_config(MultiMCPConfig(servers={"exa": ServerConfig(url="https://mcp.exa.ai/mcp")}), link)
+
+    assert link.is_symlink()
+    assert "exa" in load_config(real).servers
+    assert sorted(p.name for p in real.parent.iterdir()) == ["servers.yaml"]
+
+
+def test_save_config_keeps_hardlinks(tmp_path):
+    """A hard-linked config is rewritten in place, so every link sees the update."""
+    import os
+
+    path = tmp_path / "config.yaml"
+    save_config(MultiMCPConfig(), path)
+    other = tmp_path / "linked.yaml"
+    os.link(path, other)
+
+    save_config(MultiMCPConfig(servers={"exa": ServerConfig(url="https://mcp.exa.ai/mcp")}), path)
+
+    assert path.stat().st_ino == other.stat().st_ino
+    assert "exa" in load_config(other).servers
+
+
+def test_concurrent_saves_leave_one_complete_file(tmp_path):
+    """Concurrent writers use distinct temp files; the result is one writer's full config."""
+    import threading
+
+    path = tmp_path / "config.yaml"
+    configs = [
+        MultiMCPConfig(servers={f"srv{i}": ServerConfig(url=f"https://example.com/{i}")})
+        for i in range(8)
+    ]
+    barrier = threading.Barrier(len(configs))
+    errors = []
+
+    def _save(config):
+        barrier.wait()
+        try:
+            save_config(config, path)
+        except Exception as e:  # surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=_save, args=(c,)) for c in configs]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert [p.name for p in tmp_path.iterdir()] == ["config.yaml"]
+    assert len(load_config(path).servers) == 1